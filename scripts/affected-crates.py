@@ -4,89 +4,191 @@ Given a list of changed files (one per line on stdin, or as positional args),
 output the workspace package names that need testing: the directly changed
 packages plus all packages that transitively depend on them.
 
-Uses `cargo metadata` to obtain the workspace package list and the full
-dependency resolve graph.  Cargo.lock is always present in this repo, so
-`cargo metadata` does not fetch anything; it just reads local files.
+Uses the workspace graph from `cargo metadata` (package list plus dependency
+resolve), cached by workspace_graph.py under the hash of the manifests and
+Cargo.lock: cargo runs only when one of those changed since the last call, and
+otherwise the answer is a lookup in the precomputed reverse-dependency closure.
+Each file belongs to the package with the longest enclosing manifest
+directory, found through a path-component trie rather than by testing every
+package against every file.
+
+`--format json` reports, for each package, whether it is affected directly
+(it owns a changed file) or transitively (it depends on a package that does),
+so CI can shard test jobs by it. `--format matrix --shards N` does the
+sharding: it splits the affected packages into N groups balanced by their test
+time in earlier nextest runs (`--durations`, longest-processing-time-first)
+and prints `{"include": [...]}` for a workflow's `strategy.matrix`. An empty
+affected set prints an empty `include`; guard the sharded job on it.
 
 Usage:
     git diff --name-only origin/main...HEAD | python3 scripts/affected-crates.py
     python3 scripts/affected-crates.py crates/foo/src/lib.rs crates/bar/Cargo.toml
+    python3 scripts/affected-crates.py --format json < changed.txt
+    python3 scripts/affected-crates.py --format matrix --shards 4 --durations junit.xml < changed.txt
 """
 from __future__ import annotations
 
+import argparse
+import heapq
 import json
-import pathlib
-import subprocess
 import sys
+import xml.etree.ElementTree as ET
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import workspace_graph  # noqa: E402
+
+
+def affected_packages(graph: workspace_graph.WorkspaceGraph, changed_files: list[str]) -> list[dict]:
+    """One record per package to test, sorted by package id.
+
+    `reason` is "direct" for a package owning a changed file and "transitive"
+    for one that only depends on such a package; `files` lists the changed
+    files a package owns, `via` the changed packages it depends on.
+    """
+    owners = graph.owners(changed_files)
+    files_by_id: dict[str, list[str]] = {}
+    for path, pkg_id in owners.items():
+        files_by_id.setdefault(pkg_id, []).append(path)
+
+    # Collect all workspace packages that transitively depend on changed ones,
+    # remembering which changed package pulled each one in
+    via_by_id: dict[str, set[str]] = {}
+    for changed_id in files_by_id:
+        for rdep_id in graph.dependents[changed_id]:
+            via_by_id.setdefault(rdep_id, set()).add(changed_id)
+
+    names = graph.names
+    return [
+        {
+            "name": names[pkg_id],
+            "reason": "direct" if pkg_id in files_by_id else "transitive",
+            "files": sorted(files_by_id.get(pkg_id, ())),
+            "via": sorted(names[v] for v in via_by_id.get(pkg_id, ())),
+        }
+        for pkg_id in sorted(files_by_id.keys() | via_by_id.keys())
+    ]
+
+
+def _crate_of(binary_id: str) -> str:
+    # A nextest binary id is `<crate>` for the lib tests and `<crate>::<target>`
+    # (`koina::integration`, `aletheia::bin/aletheia`) otherwise.
+    return binary_id.split("::", 1)[0]
+
+
+def load_durations(paths: list[Path]) -> dict[str, float]:
+    """Seconds of test execution per crate, averaged over the given runs.
+
+    Each file is one nextest run, either its `--message-format libtest-json`
+    stream (a JSON object per line; `name` is `<binary-id>$<test>`) or the
+    JUnit XML the `ci` profile writes to target/nextest/ci/junit.xml. A crate
+    is averaged over the runs that executed it, so a run that tested only a
+    few crates does not drag the others toward zero.
+    """
+    totals: dict[str, list[float]] = {}
+    for path in paths:
+        run: dict[str, float] = {}
+        text = path.read_text(encoding="utf-8")
+        if text.lstrip().startswith("<"):
+            for case in ET.fromstring(text).iter("testcase"):
+                crate = _crate_of(case.get("classname", ""))
+                run[crate] = run.get(crate, 0.0) + float(case.get("time") or 0.0)
+        else:
+            for line in text.splitlines():
+                if not line.strip():
+                    continue
+                event = json.loads(line)
+                if event.get("type") != "test" or "exec_time" not in event:
+                    continue
+                crate = _crate_of(event["name"].split("$", 1)[0])
+                run[crate] = run.get(crate, 0.0) + float(event["exec_time"])
+        for crate, seconds in run.items():
+            totals.setdefault(crate, []).append(seconds)
+    return {crate: sum(runs) / len(runs) for crate, runs in totals.items()}
+
+
+def plan_shards(names: list[str], durations: dict[str, float], shards: int) -> list[dict]:
+    """Split `names` into at most `shards` groups of near-equal estimated time.
+
+    Longest-processing-time-first: take the crates slowest first and give each
+    to the currently lightest shard, which lands within 4/3 of the optimal
+    makespan. A crate with no recorded duration is estimated at the mean of
+    those that have one, so a new crate is neither free nor the heaviest.
+
+    WHY empty shards are dropped rather than emitted: a matrix leg with no
+    `-p` would run nextest over the whole workspace.
+    """
+    known = [durations[name] for name in names if name in durations]
+    default = sum(known) / len(known) if known else 1.0
+    estimate = {name: durations.get(name, default) for name in names}
+    loads: list[tuple[float, int]] = [(0.0, index) for index in range(max(shards, 1))]
+    members: list[list[str]] = [[] for _ in loads]
+    for name in sorted(names, key=lambda name: (-estimate[name], name)):
+        load, index = heapq.heappop(loads)
+        members[index].append(name)
+        heapq.heappush(loads, (load + estimate[name], index))
+
+    plan = []
+    for group in members:
+        if not group:
+            continue
+        group.sort()
+        plan.append(
+            {
+                "shard": len(plan) + 1,
+                "packages": group,
+                "nextest_args": " ".join(f"-p {name}" for name in group),
+                "estimated_seconds": round(sum(estimate[name] for name in group), 3),
+            }
+        )
+    return plan
 
 
-def cargo_metadata() -> dict:
-    result = subprocess.run(
-        ["cargo", "metadata", "--format-version", "1"],
-        capture_output=True,
-        text=True,
-        check=True,
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
     )
-    return json.loads(result.stdout)
-
+    parser.add_argument("files", nargs="*", help="changed files (default: read from stdin)")
+    parser.add_argument(
+        "--format",
+        choices=("text", "json", "matrix"),
+        default="text",
+        help=(
+            "text: one package name per line; json: why each package is affected; "
+            "matrix: a GitHub Actions matrix of --shards balanced test shards"
+        ),
+    )
+    parser.add_argument(
+        "--shards", type=int, default=1, help="number of shards for --format matrix (default: 1)"
+    )
+    parser.add_argument(
+        "--durations",
+        type=Path,
+        action="append",
+        default=[],
+        help="a nextest libtest-json or JUnit report from an earlier run; repeatable",
+    )
+    args = parser.parse_args()
+    if args.shards < 1:
+        parser.error("--shards must be at least 1")
+    changed_files: list[str] = args.files if args.files else sys.stdin.read().split()
 
-def main() -> None:
-    changed_files: list[str] = sys.argv[1:] if sys.argv[1:] else sys.stdin.read().split()
+    packages = affected_packages(workspace_graph.load(), changed_files) if changed_files else []
 
-    if not changed_files:
+    if args.format == "json":
+        print(json.dumps({"packages": packages}, indent=2))
         return
 
-    meta = cargo_metadata()
-    workspace_root = pathlib.Path(meta["workspace_root"])
-    workspace_member_ids: set[str] = set(meta["workspace_members"])
-
-    # Build maps: manifest_dir → package_id, package_id → package_name
-    pkg_by_manifest_dir: dict[str, str] = {}
-    pkg_name_by_id: dict[str, str] = {}
-    for pkg in meta["packages"]:
-        manifest_dir = str(pathlib.Path(pkg["manifest_path"]).parent)
-        pkg_by_manifest_dir[manifest_dir] = pkg["id"]
-        pkg_name_by_id[pkg["id"]] = pkg["name"]
-
-    # Resolve changed files to workspace package IDs
-    changed_ids: set[str] = set()
-    for f in changed_files:
-        fpath = pathlib.Path(f)
-        if not fpath.is_absolute():
-            fpath = workspace_root / fpath
-        fpath_str = str(fpath.resolve()) if fpath.exists() else str(fpath)
-        for manifest_dir, pkg_id in pkg_by_manifest_dir.items():
-            if fpath_str.startswith(manifest_dir + "/") or fpath_str == manifest_dir:
-                changed_ids.add(pkg_id)
-
-    if not changed_ids:
+    if args.format == "matrix":
+        names = [package["name"] for package in packages]
+        plan = plan_shards(names, load_durations(args.durations), args.shards)
+        print(json.dumps({"include": plan}, separators=(",", ":")))
         return
 
-    # Build reverse dependency map (workspace packages only)
-    # rev_deps[A] = {B, C} means B and C depend on A
-    rev_deps: dict[str, set[str]] = {mid: set() for mid in workspace_member_ids}
-    for node in meta["resolve"]["nodes"]:
-        if node["id"] not in workspace_member_ids:
-            continue
-        for dep in node["deps"]:
-            dep_id = dep["pkg"]
-            if dep_id in rev_deps:
-                rev_deps[dep_id].add(node["id"])
-
-    # BFS: collect all workspace packages that transitively depend on changed ones
-    affected: set[str] = changed_ids & workspace_member_ids
-    queue: list[str] = list(affected)
-    while queue:
-        pkg_id = queue.pop()
-        for rdep_id in rev_deps.get(pkg_id, set()):
-            if rdep_id not in affected:
-                affected.add(rdep_id)
-                queue.append(rdep_id)
-
     # Print one package name per line, sorted for stable output
-    for pkg_id in sorted(affected):
-        if pkg_id in pkg_name_by_id:
-            print(pkg_name_by_id[pkg_id])
+    for package in packages:
+        print(package["name"])
 
 
 if __name__ == "__main__":
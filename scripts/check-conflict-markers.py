@@ -3,11 +3,16 @@
 
 from __future__ import annotations
 
+import mmap
 import re
-import subprocess
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import tracked_files  # noqa: E402
+
 # WHY this check exists: an abandoned merge left `crates/krites/CLAUDE.md` carrying
 # `<<<<<<< HEAD` / `||||||| <sha>` / `>>>>>>> <branch>` in the working tree and all three stages in
 # the index, with no MERGE_HEAD to signal a merge was in progress. HEAD's copy was clean, so nothing
@@ -21,12 +26,25 @@ from pathlib import Path
 REPO_ROOT = Path(__file__).resolve().parent.parent
 
 # A marker only counts at the start of a line, which is where git writes it.
-MARKERS = (
-    re.compile(r"^<{7}(?: |$)"),
-    re.compile(r"^={7}$"),
-    re.compile(r"^>{7}(?: |$)"),
-    re.compile(r"^\|{7}(?: |$)"),
+#
+# WHY one bytes pattern spelling out every line boundary: this check used to decode each file and
+# test `str.splitlines()` lines one at a time, and what counts as a line must not change with the
+# speed-up. splitlines() also breaks on \r, \v, \f, \x1c-\x1e, U+0085, U+2028 and U+2029, so a
+# marker after any of them was -- and still is -- a line-start marker. Under
+# `decode("utf-8", "replace")` those three code points come only from the exact UTF-8 sequences
+# below, so matching the raw bytes finds exactly the lines the decoded text had.
+LINE_BREAK = re.compile(rb"\r\n|[\n\r\x0b\x0c\x1c-\x1e]|\xc2\x85|\xe2\x80[\xa8\xa9]")
+_LINE_START = rb"(?:\A|(?<=[\n\r\x0b\x0c\x1c-\x1e])|(?<=\xc2\x85)|(?<=\xe2\x80[\xa8\xa9]))"
+_LINE_END = rb"(?=[\n\r\x0b\x0c\x1c-\x1e]|\xc2\x85|\xe2\x80[\xa8\xa9]|\Z)"
+MARKER = re.compile(
+    _LINE_START
+    + rb"(?:<{7}(?: |" + _LINE_END + rb")|={7}" + _LINE_END
+    + rb"|>{7}(?: |" + _LINE_END + rb")|\|{7}(?: |" + _LINE_END + rb"))"
 )
+# WHY a substring probe before MARKER: the pattern cannot start with a literal, so `re` tries it at
+# every byte -- about a second over the tree -- while `find` for the four runs is a C memory scan
+# that rules out all but a handful of files in a tenth of that.
+MARKER_RUNS = (b"<" * 7, b"=" * 7, b">" * 7, b"|" * 7)
 
 # Paths permitted to contain marker-shaped lines, with the reason. Keep this empty unless a file
 # genuinely documents conflict resolution.
@@ -35,24 +53,39 @@ ALLOWLIST: dict[str, str] = {}
 BINARY_HINT = b"\x00"
 
 
-def tracked_files() -> list[str]:
-    out = subprocess.run(
-        ["git", "ls-files", "-z"], cwd=REPO_ROOT, capture_output=True, check=True
-    )
-    return [p for p in out.stdout.decode("utf-8", "replace").split("\0") if p]
-
-
-def unmerged_paths() -> list[str]:
-    """Index entries at stage 1/2/3 — a conflict that was never resolved."""
-    out = subprocess.run(
-        ["git", "ls-files", "-u", "--format=%(path)"],
-        cwd=REPO_ROOT,
-        capture_output=True,
-        check=False,
-    )
-    if out.returncode != 0:
-        return []
-    return sorted({p for p in out.stdout.decode("utf-8", "replace").splitlines() if p})
+def first_marker(data: bytes | mmap.mmap) -> tuple[int, str] | None:
+    """The 1-based line number and text of the first marker line in `data`, if any."""
+    if not any(data.find(run) != -1 for run in MARKER_RUNS):
+        return None
+    m = MARKER.search(data)
+    if m is None:
+        return None
+    lineno = 1 + sum(1 for _ in LINE_BREAK.finditer(data, 0, m.start()))
+    end = LINE_BREAK.search(data, m.start())
+    line = data[m.start() : end.start() if end is not None else len(data)]
+    return lineno, line.decode("utf-8", "replace")[:60]
+
+
+def scan_file(rel: str) -> str | None:
+    """The failure line for `rel`, or None when it is clean, binary or unreadable.
+
+    WHY mmap: the file is never copied into this process. The binary probe touches one page, and a
+    clean text file -- nearly every file -- is read once, by the substring probe, straight from the
+    page cache.
+    """
+    try:
+        with open(REPO_ROOT / rel, "rb") as fh, mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            if mm.find(BINARY_HINT, 0, 8192) != -1:
+                return None
+            hit = first_marker(mm)
+    except ValueError:
+        return None  # an empty file cannot be mapped, and holds no marker
+    except OSError:
+        return None
+    if hit is None:
+        return None
+    lineno, line = hit
+    return f"{rel}:{lineno}: conflict marker: {line}"
 
 
 def main() -> int:
@@ -60,24 +93,15 @@ def main() -> int:
 
     # An unmerged index entry is a defect on its own: it means a merge was abandoned, and the next
     # `git add -A` commits whatever the working tree holds — markers included.
-    for path in unmerged_paths():
+    index = tracked_files.load(REPO_ROOT)
+    for path in index.unmerged():
         failures.append(f"{path}: unresolved index entry (stage 1/2/3) — a merge was abandoned here")
 
-    for rel in tracked_files():
-        if rel in ALLOWLIST:
-            continue
-        full = REPO_ROOT / rel
-        try:
-            raw = full.read_bytes()
-        except OSError:
-            continue
-        if BINARY_HINT in raw[:8192]:
-            continue
-        text = raw.decode("utf-8", "replace")
-        for lineno, line in enumerate(text.splitlines(), 1):
-            if any(m.match(line) for m in MARKERS):
-                failures.append(f"{rel}:{lineno}: conflict marker: {line[:60]}")
-                break
+    # WHY a thread pool: on a cold checkout -- CI's, every time -- the cost is waiting on the disk,
+    # and the threads keep several files' reads in flight. `map` keeps the report in tracked order.
+    tracked = index.paths()
+    with ThreadPoolExecutor() as pool:
+        failures += [f for f in pool.map(scan_file, [r for r in tracked if r not in ALLOWLIST]) if f]
 
     if failures:
         print("conflict-marker check FAILED:", file=sys.stderr)
@@ -90,7 +114,7 @@ def main() -> int:
         )
         return 1
 
-    print(f"conflict-marker check passed: {len(tracked_files())} tracked files, no markers, index clean")
+    print(f"conflict-marker check passed: {len(tracked)} tracked files, no markers, index clean")
     return 0
 
 
@@ -37,6 +37,10 @@ from pathlib import Path
 
 import yaml
 
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import tracked_files  # noqa: E402
+
 LOGGER = logging.getLogger("check-dependabot")
 
 REPO = "forkwright/aletheia"
@@ -171,14 +175,8 @@ def cargo_roots(repo_root: Path) -> list[str]:
     A tracked `Cargo.lock` marks one: cargo writes a lockfile only at a workspace root,
     so anything with its own lock is invisible to a scan rooted at `/`.
     """
-    result = subprocess.run(
-        ["git", "ls-files", "*Cargo.lock"],
-        capture_output=True, text=True, check=False, cwd=repo_root,
-    )
-    if result.returncode != 0:
-        raise SystemExit(f"git ls-files failed: {result.stderr.strip()}")
     roots = []
-    for line in result.stdout.splitlines():
+    for line in tracked_files.load(repo_root).paths("*Cargo.lock"):
         parent = str(Path(line).parent)
         roots.append("/" if parent == "." else f"/{parent}")
     return sorted(set(roots))
@@ -33,10 +33,13 @@ from __future__ import annotations
 import json
 import logging
 import re
-import subprocess
 import sys
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import rust_source_index  # noqa: E402
+
 LOGGER = logging.getLogger("check-domain-id-suppressions")
 
 REPO_ROOT = Path(__file__).resolve().parents[1]
@@ -54,26 +57,20 @@ def tracked_rust_files(repo_root: Path) -> list[Path]:
     the tree would otherwise be counted, and the number would move for reasons that have
     nothing to do with the code.
     """
-    result = subprocess.run(
-        ["git", "ls-files", "*.rs"],
-        capture_output=True, text=True, check=False, cwd=repo_root,
-    )
-    if result.returncode != 0:
-        raise SystemExit(f"git ls-files failed: {result.stderr.strip()}")
-    return [repo_root / line for line in result.stdout.splitlines() if line]
+    return [repo_root / rel for rel in rust_source_index.load(repo_root).paths()]
 
 
 def counts(repo_root: Path) -> dict[str, int]:
     """{path: number of suppressions} for every file carrying at least one."""
     found: dict[str, int] = {}
-    for path in tracked_rust_files(repo_root):
+    for entry in rust_source_index.load(repo_root).files():
         try:
-            text = path.read_text(encoding="utf-8")
-        except (OSError, UnicodeError):
+            text = entry.text
+        except UnicodeError:
             continue
         n = len(SUPPRESSION.findall(text))
         if n:
-            found[path.relative_to(repo_root).as_posix()] = n
+            found[entry.path] = n
     return found
 
 
@@ -31,10 +31,14 @@ from __future__ import annotations
 
 import logging
 import re
-import subprocess
 import sys
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import gh_issues  # noqa: E402
+import rust_source_index  # noqa: E402
+
 LOGGER = logging.getLogger("check-egress-send-sites")
 
 # Crates whose outbound requests are reachable from model input or carry fleet
@@ -111,7 +115,7 @@ def send_sites(repo_root: Path) -> dict[str, list[int]]:
             raise SystemExit(f"scanned root is missing: {root}")
         for path in sorted(base.rglob("*.rs")):
             try:
-                text = path.read_text(encoding="utf-8")
+                text = rust_source_index.read_text(path, repo_root)
             except (OSError, UnicodeError) as error:
                 raise SystemExit(f"cannot read {path}: {error}") from error
             lines = [
@@ -124,27 +128,39 @@ def send_sites(repo_root: Path) -> dict[str, list[int]]:
     return found
 
 
-def open_issue(number: int) -> bool:
-    """True when the issue is open on GitHub, or when GitHub cannot be reached.
+def open_issues(numbers: list[int]) -> dict[int, bool]:
+    """number -> True when the issue is open on GitHub, or when GitHub cannot say.
+
+    All numbers are asked in one batched query (gh_issues.py), answered from
+    its cache when that is a few minutes old.
 
     WHY it fails OPEN on an unreachable API: this check's job is to refuse a NEW
     unrouted send site. Turning a network hiccup into a red build would make the
     check the thing people route around, and the tracked entries are already a
-    known, recorded state rather than a new one.
+    known, recorded state rather than a new one. That is also why an outage
+    does not fall back to an older cached answer: a weeks-old CLOSED would turn
+    the same hiccup red.
     """
-    probe = subprocess.run(
-        ["gh", "issue", "view", str(number), "--repo", "forkwright/aletheia", "--json", "state"],
-        capture_output=True,
-        check=False,
-    )
-    if probe.returncode != 0:
-        LOGGER.warning(
-            "check-egress-send-sites: cannot reach GitHub to confirm #%d is open; "
-            "treating it as open",
-            number,
-        )
-        return True
-    return b'"OPEN"' in probe.stdout
+    if not numbers:
+        return {}
+    try:
+        issues = gh_issues.fetch(numbers)
+    except gh_issues.GhError as error:
+        LOGGER.warning("check-egress-send-sites: %s", error)
+        issues = {}
+    found: dict[int, bool] = {}
+    for number in numbers:
+        issue = issues.get(number)
+        if issue is None:
+            LOGGER.warning(
+                "check-egress-send-sites: cannot confirm with GitHub that #%d is open; "
+                "treating it as open",
+                number,
+            )
+            found[number] = True
+        else:
+            found[number] = issue.get("state") == "OPEN"
+    return found
 
 
 def main() -> int:
@@ -185,8 +201,9 @@ def main() -> int:
         for path in stale:
             LOGGER.error("  %s", path)
 
+    still_open = open_issues(sorted({number for path, number in TRACKED.items() if path in found}))
     for path, number in sorted(TRACKED.items()):
-        if path in found and not open_issue(number):
+        if path in found and not still_open[number]:
             failures = True
             LOGGER.error("")
             LOGGER.error(
@@ -26,23 +26,44 @@ from __future__ import annotations
 
 import subprocess
 import sys
+from pathlib import Path
+from typing import NamedTuple
 
+sys.path.insert(0, str(Path(__file__).resolve().parent))
 
-def shadowed_paths() -> list[str]:
-    """Return tracked paths that an ignore rule would exclude.
+import tracked_files  # noqa: E402
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+
+class Match(NamedTuple):
+    source: str
+    line: str
+    pattern: str
+    path: str
+
+    @property
+    def rule(self) -> str:
+        return f"{self.source}:{self.line}:{self.pattern}"
+
+
+def ignore_matches(repo_root: Path = REPO_ROOT) -> list[Match]:
+    """Return every tracked path an ignore rule excludes, with the rule.
 
     `--no-index` is the whole point: without it git suppresses the answer for
     tracked files, which is exactly the blindness being tested for.
+
+    WHY one `-v --stdin` process for detection and attribution alike: the
+    report used to ask `check-ignore -v` per shadowed path, so a broad rule
+    landing cost a subprocess per file it swallowed -- thousands, for a
+    `data/`-shaped rule -- exactly when the gate fails.
     """
-    tracked = subprocess.run(
-        ["git", "ls-files", "-z"],
-        capture_output=True,
-        check=True,
-    ).stdout
+    tracked = "".join(f"{path}\0" for path in tracked_files.load(repo_root).paths())
 
     probe = subprocess.run(
-        ["git", "check-ignore", "--no-index", "--stdin", "-z"],
-        input=tracked,
+        ["git", "check-ignore", "-v", "--no-index", "--stdin", "-z"],
+        input=tracked.encode("utf-8", "surrogateescape"),
+        cwd=repo_root,
         capture_output=True,
         check=False,
     )
@@ -51,12 +72,26 @@ def shadowed_paths() -> list[str]:
         sys.stderr.write(probe.stderr.decode("utf-8", "replace"))
         raise SystemExit(f"git check-ignore failed with {probe.returncode}")
 
-    return [p for p in probe.stdout.decode("utf-8", "replace").split("\0") if p]
+    # -v -z prints four NUL-terminated fields per match: source, line number,
+    # pattern, path.
+    fields = probe.stdout.decode("utf-8", "replace").split("\0")[:-1]
+    matches = [Match(*fields[i : i + 4]) for i in range(0, len(fields) - 3, 4)]
+    # -v also names paths whose last matching rule is a negation; those are
+    # re-included, not ignored.
+    return [match for match in matches if not match.pattern.startswith("!")]
+
+
+def by_rule(matches: list[Match]) -> dict[str, list[str]]:
+    """rule -> the paths it shadows, each rule where its first path falls in the index."""
+    grouped: dict[str, list[str]] = {}
+    for match in matches:
+        grouped.setdefault(match.rule, []).append(match.path)
+    return grouped
 
 
 def main() -> int:
-    shadowed = shadowed_paths()
-    if not shadowed:
+    matches = ignore_matches()
+    if not matches:
         print("check-gitignore-shadow: no tracked file is matched by an ignore rule")
         return 0
 
@@ -70,13 +105,11 @@ def main() -> int:
         "silently:",
         file=sys.stderr,
     )
-    for path in shadowed:
-        rule = subprocess.run(
-            ["git", "check-ignore", "-v", "--no-index", path],
-            capture_output=True,
-            check=False,
-        ).stdout.decode("utf-8", "replace").strip()
-        print(f"  {rule or path}", file=sys.stderr)
+    for rule, paths in by_rule(matches).items():
+        count = f"{len(paths)} file{'s' if len(paths) != 1 else ''}"
+        print(f"  {rule}  ({count})", file=sys.stderr)
+        for path in paths:
+            print(f"    {path}", file=sys.stderr)
     print(
         "\nAdd a negation for the path, or drop the rule if the file is meant to "
         "be tracked.",
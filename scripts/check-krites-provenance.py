@@ -6,13 +6,19 @@ per-file MPL Exhibit A notices."""
 from __future__ import annotations
 
 import argparse
+import hashlib
+import json
+import os
 import pathlib
 import subprocess
 import sys
 import tomllib
+from concurrent.futures import ProcessPoolExecutor
 
 sys.path.insert(0, str(pathlib.Path(__file__).resolve().parent))
 
+import gate_cache  # noqa: E402
+import krites_provenance_lib  # noqa: E402
 from krites_provenance_lib import (  # noqa: E402
     ALLOWED_TRANSITIONS,
     KRITES_SRC,
@@ -31,6 +37,16 @@ from krites_provenance_lib import (  # noqa: E402
     render_notice,
     verbatim_pct,
 )
+from rust_source_index import git_blob_sha  # noqa: E402
+
+# WHY a cache: a recomputed verbatim_pct depends only on the two files' bytes and
+# on the code that measures them, and the common PR touches neither
+# crates/krites nor the snapshot. Entries are keyed by the two git blob SHAs, in
+# a file named for the measuring code (see verbatim_algorithm_version).
+RECOMPUTE_CACHE_NAME = "krites-verbatim-pct"
+# Algorithm versions whose results survive a save: linked worktrees share the
+# cache, and one on an older krites_provenance_lib.py must not evict the rest.
+RECOMPUTE_CACHE_KEEP = 4
 
 
 def fail(message: str) -> None:
@@ -248,7 +264,59 @@ def check_soak_expiry(rows: list[dict], commit_count: int | None) -> list[str]:
     return errors
 
 
-def check_verbatim_recompute(rows: list[dict]) -> list[str]:
+def verbatim_algorithm_version() -> str:
+    """Digest of krites_provenance_lib.py, which defines every step of verbatim_pct
+    (notice stripping, line normalisation, the floor, the matcher). WHY the whole
+    file rather than a hand-bumped number: a change to any of those that forgot
+    the bump would serve figures the current code no longer produces."""
+    return hashlib.sha256(pathlib.Path(krites_provenance_lib.__file__).read_bytes()).hexdigest()[:16]
+
+
+def _decode(data: bytes) -> str:
+    """`data` as Path.read_text(errors="replace") would have returned it, newline
+    translation included, from bytes already read to key the cache."""
+    return data.decode("utf-8", errors="replace").replace("\r\n", "\n").replace("\r", "\n")
+
+
+class _RecomputeCache:
+    """verbatim_pct results keyed by "<local blob> <upstream blob>"."""
+
+    def __init__(self) -> None:
+        self.entries: dict[str, float] = {}
+        self.seen: dict[str, float] = {}
+        cache = gate_cache.cache_dir(REPO_ROOT, RECOMPUTE_CACHE_NAME)
+        self.path = cache / f"{verbatim_algorithm_version()}.json" if cache is not None else None
+        if self.path is not None:
+            try:
+                stored = json.loads(self.path.read_bytes())
+                if isinstance(stored, dict):
+                    self.entries = stored
+            except (OSError, ValueError):
+                pass
+
+    def get(self, key: str) -> float | None:
+        value = self.seen.get(key, self.entries.get(key))
+        if not isinstance(value, float):
+            return None
+        self.seen[key] = value
+        return value
+
+    def put(self, key: str, value: float) -> None:
+        self.seen[key] = value
+
+    def save(self) -> None:
+        """Keep exactly this run's pairs: the ledger as it stands is what the next
+        run will recompute. Other versions are kept up to RECOMPUTE_CACHE_KEEP."""
+        if self.path is None or self.seen == self.entries:
+            return
+        try:
+            gate_cache.write_atomic(self.path, json.dumps(self.seen, sort_keys=True).encode())
+        except OSError:
+            return  # an unwritable cache costs the next run a recompute, never this one its answer
+        gate_cache.prune(self.path.parent, RECOMPUTE_CACHE_KEEP)
+
+
+def check_verbatim_recompute(rows: list[dict], jobs: int = 1) -> list[str]:
     """P6: when the offline upstream snapshot (crates/krites/upstream-snapshot/
     cozo-core-src/, vendored by wave0/drift-metric) is present, recompute
     every derived/dual row's verbatim_pct from it and fail if the stored
@@ -276,7 +344,11 @@ def check_verbatim_recompute(rows: list[dict]) -> list[str]:
     against THAT path exactly like a derived/dual row is recomputed against
     upstream_path. Only a row with replaced_upstream_path == 'none' — a
     genuinely fresh addition with nothing to compare against — is still
-    exempt, because there is nothing to recompute."""
+    exempt, because there is nothing to recompute.
+
+    A pair measured before (same blob SHAs, same verbatim_algorithm_version)
+    reuses that result; the rest are measured `jobs` at a time on a process
+    pool. Errors come out in row order either way."""
     if not UPSTREAM_SNAPSHOT_DIR.is_dir():
         # WHY this fails rather than skips: the skip existed so this check could
         # land before wave0/drift-metric vendored the snapshot, and that ordering
@@ -293,7 +365,11 @@ def check_verbatim_recompute(rows: list[dict]) -> list[str]:
             "PROVENANCE.toml and NOTICE.md. Restore it (git checkout -- "
             "crates/krites/upstream-snapshot) rather than running without it."
         ]
-    errors = []
+    cache = _RecomputeCache()
+    upstream_files: dict[pathlib.Path, tuple[str, bytes]] = {}
+    # Each entry is an error already known, or (row, compare_to, cache key).
+    planned: list[str | tuple[dict, str, str]] = []
+    misses: dict[str, tuple[bytes, bytes]] = {}
     for row in rows:
         status = row["status"]
         if status in ("derived", "dual"):
@@ -306,14 +382,40 @@ def check_verbatim_recompute(rows: list[dict]) -> list[str]:
             continue
         snapshot_path = UPSTREAM_SNAPSHOT_DIR / compare_to
         if not snapshot_path.is_file():
-            errors.append(
+            planned.append(
                 f"{row['path']}: upstream-snapshot/ is present but has no {compare_to} "
                 "— snapshot is incomplete relative to PROVENANCE.toml"
             )
             continue
-        local_text = (KRITES_SRC / row["path"]).read_text(errors="replace")
-        upstream_text = snapshot_path.read_text(errors="replace")
-        recomputed = verbatim_pct(local_text, upstream_text)
+        if snapshot_path not in upstream_files:
+            upstream = snapshot_path.read_bytes()
+            upstream_files[snapshot_path] = (git_blob_sha(upstream), upstream)
+        upstream_blob, upstream = upstream_files[snapshot_path]
+        local = (KRITES_SRC / row["path"]).read_bytes()
+        key = f"{git_blob_sha(local)} {upstream_blob}"
+        if cache.get(key) is None:
+            misses[key] = (local, upstream)
+        planned.append((row, compare_to, key))
+
+    if misses:
+        texts = {key: (_decode(local), _decode(upstream)) for key, (local, upstream) in misses.items()}
+        if jobs > 1 and len(texts) > 1:
+            with ProcessPoolExecutor(max_workers=min(jobs, len(texts))) as pool:
+                futures = {key: pool.submit(verbatim_pct, *pair) for key, pair in texts.items()}
+                for key, future in futures.items():
+                    cache.put(key, future.result())
+        else:
+            for key, pair in texts.items():
+                cache.put(key, verbatim_pct(*pair))
+    cache.save()
+
+    errors = []
+    for entry in planned:
+        if isinstance(entry, str):
+            errors.append(entry)
+            continue
+        row, compare_to, key = entry
+        recomputed = cache.get(key)
         if recomputed != row["verbatim_pct"]:
             errors.append(
                 f"{row['path']}: stored verbatim_pct {row['verbatim_pct']} does not match offline "
@@ -501,7 +603,15 @@ def main() -> int:
     parser = argparse.ArgumentParser()
     parser.add_argument("--base-ref", default="origin/main")
     parser.add_argument("--main-ref", default="origin/main")
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="processes to recompute uncached verbatim_pct figures with (default: CPU count)",
+    )
     args = parser.parse_args()
+    if args.jobs < 1:
+        parser.error("--jobs must be at least 1")
 
     if not LEDGER_PATH.exists():
         fail(f"missing {LEDGER_PATH}")
@@ -525,7 +635,7 @@ def main() -> int:
     errors += check_no_derived_growth(rows, base_rows)
     errors += check_status_sequence(rows, base_rows)
     errors += check_soak_expiry(rows, git_commit_count(args.main_ref))
-    errors += check_verbatim_recompute(rows)
+    errors += check_verbatim_recompute(rows, args.jobs)
     errors += check_no_unjustified_exemption(rows)
     errors += check_method_recorded(rows)
     errors += check_consulted_siblings(rows)
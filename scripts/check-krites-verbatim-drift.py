@@ -63,6 +63,8 @@ Run standalone:
     uv run scripts/check-krites-verbatim-drift.py                 # full report
     uv run scripts/check-krites-verbatim-drift.py --calibrate      # calibration run
     uv run scripts/check-krites-verbatim-drift.py --file <path>    # single file
+    uv run scripts/check-krites-verbatim-drift.py --exact          # cross-check the index
+    uv run scripts/check-krites-verbatim-drift.py --changed-since origin/main  # incremental
 
 Exits 0 except with --strict, which fails only on the condition above.
 """
@@ -70,12 +72,22 @@ Exits 0 except with --strict, which fails only on the condition above.
 from __future__ import annotations
 
 import argparse
+import hashlib
+import inspect
 import logging
+import marshal
+import mmap
 import re
+import struct
+import subprocess
 import sys
 import tomllib
-from dataclasses import dataclass
-from pathlib import Path
+from array import array
+from collections import Counter
+from collections.abc import Sequence
+from dataclasses import astuple, dataclass
+from functools import lru_cache
+from pathlib import Path, PurePosixPath
 
 sys.path.insert(0, str(Path(__file__).resolve().parent))
 
@@ -86,6 +98,12 @@ sys.path.insert(0, str(Path(__file__).resolve().parent))
 # imports only the standard library, so `dependencies = []` above still holds.
 from krites_provenance_lib import strip_generated_notice  # noqa: E402
 
+# The gate cache's location, phase timing and git's blob hash (stdlib-only, like the
+# library above).
+import gate_cache  # noqa: E402
+import gate_profile  # noqa: E402
+from rust_source_index import git_blob_sha  # noqa: E402
+
 LOGGER = logging.getLogger("check-krites-verbatim-drift")
 
 REPO_ROOT = Path(__file__).resolve().parents[1]
@@ -95,6 +113,37 @@ UPSTREAM_SRC = REPO_ROOT / "crates" / "krites" / "upstream-snapshot" / "cozo-cor
 SHINGLE_SIZE = 8
 MIN_IDENTIFIER_TOKENS_PER_LINE = 3
 
+# Rolling-hash constants for `shingles`: the 64-bit FNV prime as the (odd)
+# polynomial base, arithmetic mod 2**64.
+_ROLLING_BASE = 0x100000001B3
+_MASK64 = (1 << 64) - 1
+
+# INVARIANT: a shingle is a 64-bit hash, so two distinct windows can collide
+# and move a score. With about 10**6 shingles across both corpora the expected
+# number of colliding pairs is ~10**12 / 2**64, i.e. effectively nil, and
+# test-krites-verbatim-drift.py re-derives every paired score and the
+# calibration set's global max from the exact token windows and asserts they
+# agree to within this tolerance. A scale where collisions start to matter
+# fails there, not silently in a score.
+JACCARD_HASH_TOLERANCE = 1e-9
+
+# WHY a cache for the upstream side only: the pinned snapshot changes once per
+# re-vendor, yet re-tokenizing and re-shingling it was a third of every run.
+# krites/src is what a PR edits, so it is always measured fresh. The format
+# key carries the interpreter's minor version, because the header is marshal
+# and marshal's byte format is only stable within one, and the byte order the
+# hashes were written in.
+UPSTREAM_CACHE_NAME = "krites-upstream-shingles"
+UPSTREAM_CACHE_FORMAT = (2, sys.byteorder, *sys.version_info[:2])
+# Snapshot keys kept on a rewrite: linked worktrees share the cache, and one on
+# another upstream pin must not evict this one's corpus on every run.
+UPSTREAM_CACHE_KEEP = 3
+# Per-file Scores for --changed-since, one entry file per upstream cache key.
+SCORE_CACHE_NAME = "krites-drift-scores"
+# Upstream keys whose scores survive a save: the current one, plus a few for
+# linked worktrees (which share the cache) still on an older snapshot or script.
+SCORE_CACHE_KEEP = 4
+
 # WHY: derived by running --calibrate against the pinned snapshot (see
 # crates/krites/upstream-snapshot/NOTICE.md for the pinned upstream commit,
 # 481af058ab, re-vendored from the earlier v0.7.6-tag snapshot). The
@@ -226,19 +275,60 @@ def tokenize(text: str) -> list[str]:
     return tokens
 
 
-def shingles(tokens: list[str]) -> frozenset[tuple[str, ...]]:
-    if len(tokens) < SHINGLE_SIZE:
-        return frozenset()
-    return frozenset(
-        tuple(tokens[i : i + SHINGLE_SIZE]) for i in range(len(tokens) - SHINGLE_SIZE + 1)
-    )
+@lru_cache(maxsize=None)
+def _token_hash(token: str) -> int:
+    # WHY blake2b and not hash(): str hashes are salted per process, and these
+    # values are persisted in the upstream cache. 61 bits keeps every product
+    # in the rolling step below well-mixed once reduced mod 2**64.
+    return int.from_bytes(hashlib.blake2b(token.encode(), digest_size=8).digest(), "little") >> 3
+
 
+def shingles(tokens: list[str]) -> array:
+    """Sorted, de-duplicated 64-bit hashes of every SHINGLE_SIZE-token window.
 
-def jaccard(a: frozenset, b: frozenset) -> float:
+    WHY hashes rather than the windows themselves: a frozenset of 8-tuples of
+    str cost ~200 bytes a shingle and hashed eight strings per comparison; a
+    uint64 costs eight bytes and compares as one integer. The polynomial hash
+    rolls, so each window costs one multiply-add rather than a tuple build.
+    Collisions are checked, not assumed away -- see JACCARD_HASH_TOLERANCE.
+    """
+    if len(tokens) < SHINGLE_SIZE:
+        return array("Q")
+    drop = pow(_ROLLING_BASE, SHINGLE_SIZE, 1 << 64)
+    hashes = [_token_hash(token) for token in tokens]
+    window = 0
+    found: set[int] = set()
+    for i, value in enumerate(hashes):
+        window = (window * _ROLLING_BASE + value) & _MASK64
+        if i >= SHINGLE_SIZE:
+            window = (window - hashes[i - SHINGLE_SIZE] * drop) & _MASK64
+        if i >= SHINGLE_SIZE - 1:
+            found.add(window)
+    return array("Q", sorted(found))
+
+
+def shared_count(a: Sequence[int], b: Sequence[int]) -> int:
+    """Size of the intersection of two sorted, de-duplicated hash sequences."""
+    i = j = shared = 0
+    len_a, len_b = len(a), len(b)
+    while i < len_a and j < len_b:
+        x, y = a[i], b[j]
+        if x < y:
+            i += 1
+        elif x > y:
+            j += 1
+        else:
+            shared += 1
+            i += 1
+            j += 1
+    return shared
+
+
+def jaccard(a: Sequence[int], b: Sequence[int]) -> float:
     if not a and not b:
         return 0.0
-    inter = len(a & b)
-    union = len(a | b)
+    inter = shared_count(a, b)
+    union = len(a) + len(b) - inter
     return inter / union if union else 0.0
 
 
@@ -252,20 +342,36 @@ class FileShingles:
     relpath: str
     path: Path
     token_count: int
-    shingle_set: frozenset
+    # Sorted unique shingle hashes: an array('Q'), or a memoryview onto the
+    # mapped upstream cache. Both are read-only here.
+    shingle_set: Sequence[int]
+
+
+def _corpus_paths(root: Path) -> list[Path]:
+    return [
+        path
+        for path in sorted(root.rglob("*"))
+        if path.is_file() and path.suffix in (".rs", ".pest")
+    ]
+
+
+def _file_shingles(root: Path, path: Path, data: bytes | None = None) -> FileShingles:
+    """Shingle `path`, from `data` when the caller has already read its bytes."""
+    if data is None:
+        text = path.read_text(encoding="utf-8", errors="replace")
+    else:
+        # The newline translation read_text's text mode would have applied.
+        text = data.decode("utf-8", errors="replace").replace("\r\n", "\n").replace("\r", "\n")
+    tokens = tokenize(text)
+    relpath = str(path.relative_to(root))
+    return FileShingles(relpath, path, len(tokens), shingles(tokens))
 
 
 def _load_corpus(root: Path) -> dict[str, FileShingles]:
     corpus: dict[str, FileShingles] = {}
-    for path in sorted(root.rglob("*")):
-        if not path.is_file():
-            continue
-        if path.suffix not in (".rs", ".pest"):
-            continue
-        text = path.read_text(encoding="utf-8", errors="replace")
-        tokens = tokenize(text)
-        relpath = str(path.relative_to(root))
-        corpus[relpath] = FileShingles(relpath, path, len(tokens), shingles(tokens))
+    for path in _corpus_paths(root):
+        fs = _file_shingles(root, path)
+        corpus[fs.relpath] = fs
     return corpus
 
 
@@ -273,11 +379,98 @@ def load_krites_corpus() -> dict[str, FileShingles]:
     return _load_corpus(KRITES_SRC)
 
 
+def _upstream_cache_key(root: Path) -> str:
+    """Digest of everything the upstream shingles are derived from.
+
+    WHY the snapshot's content rather than its pinned commit id: NOTICE.md
+    records the pin, but nothing ties the files on disk to it -- a re-vendor
+    that forgot to update a restated ref would be served the old snapshot's
+    shingles. Hashing the 2.2 MB the corpus is built from costs milliseconds.
+    The tokenizer's parameters and the source that defines it are part of the
+    key for the same reason: a filter change must miss, never reuse.
+    """
+    digest = hashlib.sha256()
+    digest.update(
+        repr((UPSTREAM_CACHE_FORMAT, SHINGLE_SIZE, MIN_IDENTIFIER_TOKENS_PER_LINE)).encode()
+    )
+    for source in (Path(__file__), Path(inspect.getfile(strip_generated_notice))):
+        digest.update(hashlib.sha256(source.read_bytes()).digest())
+    for path in _corpus_paths(root):
+        digest.update(str(path.relative_to(root)).encode() + b"\0")
+        digest.update(hashlib.sha256(path.read_bytes()).digest())
+    return digest.hexdigest()
+
+
+def _dump_corpus(corpus: dict[str, FileShingles]) -> bytes:
+    """Serialise a corpus as a marshal header plus one flat uint64 array.
+
+    Layout: 8-byte little-endian header length, the header (a marshal list of
+    (relpath, token_count, shingle_count) in corpus order), zero padding to an
+    8-byte boundary, then every file's sorted hashes back to back.
+    """
+    header = marshal.dumps([(fs.relpath, fs.token_count, len(fs.shingle_set)) for fs in corpus.values()])
+    prefix = struct.pack("<Q", len(header)) + header
+    body = b"".join(array("Q", fs.shingle_set).tobytes() for fs in corpus.values())
+    return prefix + bytes(-len(prefix) % 8) + body
+
+
+def _map_corpus(entry: Path, root: Path) -> dict[str, FileShingles]:
+    """Load a `_dump_corpus` file, the hashes served straight from a memory map.
+
+    WHY mmap: nothing is copied or parsed per shingle. Each file's hashes are a
+    memoryview slice of the mapping, and concurrent gate runs share its pages.
+    Raises ValueError on a truncated or malformed entry.
+    """
+    with entry.open("rb") as fh:
+        mapped = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+    (header_len,) = struct.unpack_from("<Q", mapped)
+    header = marshal.loads(mapped[8 : 8 + header_len])
+    start = 8 + header_len
+    start += -start % 8
+    hashes = memoryview(mapped)[start:]
+    if len(hashes) % 8:
+        raise ValueError("upstream cache body is not whole uint64s")
+    hashes = hashes.cast("Q")
+    if sum(count for _, _, count in header) != len(hashes):
+        raise ValueError("upstream cache header does not match its body")
+    corpus: dict[str, FileShingles] = {}
+    offset = 0
+    for relpath, token_count, count in header:
+        shingle_set = hashes[offset : offset + count]
+        corpus[relpath] = FileShingles(relpath, root / relpath, token_count, shingle_set)
+        offset += count
+    return corpus
+
+
+def _cached_corpus(root: Path) -> dict[str, FileShingles]:
+    """`_load_corpus(root)`, served from the gate cache when the key matches.
+
+    A missing, unreadable or corrupt entry is recomputed and rewritten; the
+    cache can make a run faster but never changes what it reports.
+    """
+    cache = gate_cache.cache_dir(REPO_ROOT, UPSTREAM_CACHE_NAME)
+    if cache is None:
+        return _load_corpus(root)
+    entry = cache / f"{_upstream_cache_key(root)}.shingles"
+    try:
+        return _map_corpus(entry, root)
+    except (OSError, EOFError, ValueError, TypeError, struct.error):
+        pass
+    corpus = _load_corpus(root)
+    try:
+        gate_cache.write_atomic(entry, _dump_corpus(corpus))
+    except OSError:
+        return corpus  # an unwritable cache costs the next run a re-shingle, never this one its answer
+    gate_cache.prune(cache, UPSTREAM_CACHE_KEEP)
+    return corpus
+
+
 def load_upstream_corpus() -> dict[str, FileShingles]:
     if not UPSTREAM_SRC.is_dir():
         LOGGER.error("upstream snapshot missing at %s", UPSTREAM_SRC)
         raise SystemExit(2)
-    return _load_corpus(UPSTREAM_SRC)
+    with gate_profile.span("load_upstream_corpus"):
+        return _cached_corpus(UPSTREAM_SRC)
 
 
 # ---------------------------------------------------------------------------
@@ -296,13 +489,64 @@ class Score:
     paired: bool  # True if best_match is the same-relative-path upstream file
 
 
-def global_best_match(fs: FileShingles, upstream: dict[str, FileShingles]) -> Score:
+class ShingleIndex:
+    """Inverted index over the upstream corpus: shingle -> files containing it.
+
+    WHY an exact index rather than MinHash/LSH: a global best match is only
+    useful here if it is THE best match. Calibration reads the known-original
+    set's global max -- 0.0881 today -- and LSH banding tuned to recall pairs
+    that dissimilar proposes nearly every file, while banding tuned to prune
+    misses them. Posting lists give the shared-shingle count for every upstream
+    file that shares anything with one walk over the query's shingles; files
+    sharing none score 0.0 and are never visited, exactly as the exhaustive
+    scan skips them.
+    """
+
+    def __init__(self, upstream: dict[str, FileShingles]) -> None:
+        self.upstream = upstream
+        self._relpaths = list(upstream)
+        postings: dict[int, list[int]] = {}
+        for position, up in enumerate(upstream.values()):
+            for shingle in up.shingle_set:
+                postings.setdefault(shingle, []).append(position)
+        self._postings = postings
+
+    def shared_counts(self, shingle_set: Sequence[int]) -> dict[str, int]:
+        """Shared-shingle count per upstream file, in corpus order, zeros omitted."""
+        counts: Counter[int] = Counter()
+        postings = self._postings
+        for shingle in shingle_set:
+            hit = postings.get(shingle)
+            if hit:
+                counts.update(hit)
+        return {self._relpaths[position]: counts[position] for position in sorted(counts)}
+
+
+def global_best_match(
+    fs: FileShingles,
+    upstream: dict[str, FileShingles],
+    index: ShingleIndex | None = None,
+) -> Score:
+    """Best Jaccard match for `fs` across the whole upstream corpus.
+
+    With an `index`, only files sharing a shingle are scored; without one,
+    every upstream file is intersected in turn. Both visit candidates in
+    corpus order and keep the first strict maximum, so they agree exactly --
+    `--exact` runs both and fails on any difference.
+    """
+    if index is not None:
+        return _indexed_best_match(fs, index)
     best_path: str | None = None
     best_score = 0.0
     best_shared = 0
     best_upstream_count = 0
+    # WHY a set probe rather than shared_count's merge: the merge steps both
+    # sequences in Python, which is right for one pair but, repeated across the
+    # whole corpus, costs more than hashing the query once and letting C walk
+    # each candidate.
+    query = set(fs.shingle_set)
     for up_relpath, up in upstream.items():
-        shared = len(fs.shingle_set & up.shingle_set)
+        shared = len(query.intersection(up.shingle_set))
         # WHY: shared == 0 implies jaccard == 0 unconditionally — whether
         # up.shingle_set is empty (jaccard's not-a-and-not-b special case,
         # or a zero-numerator division) or non-empty (zero-numerator
@@ -314,7 +558,7 @@ def global_best_match(fs: FileShingles, upstream: dict[str, FileShingles]) -> Sc
         # recompute the same 0.0 the guard exists to shortcut.
         if shared == 0:
             continue
-        score = jaccard(fs.shingle_set, up.shingle_set)
+        score = shared / (len(fs.shingle_set) + len(up.shingle_set) - shared)
         if score > best_score:
             best_score = score
             best_path = up_relpath
@@ -331,15 +575,150 @@ def global_best_match(fs: FileShingles, upstream: dict[str, FileShingles]) -> Sc
     )
 
 
+def _indexed_best_match(fs: FileShingles, index: ShingleIndex) -> Score:
+    best_path: str | None = None
+    best_score = 0.0
+    best_shared = 0
+    best_upstream_count = 0
+    file_count = len(fs.shingle_set)
+    for up_relpath, shared in index.shared_counts(fs.shingle_set).items():
+        up_count = len(index.upstream[up_relpath].shingle_set)
+        # Same integers as jaccard()'s len(a & b) / len(a | b), so the same float.
+        score = shared / (file_count + up_count - shared)
+        if score > best_score:
+            best_score = score
+            best_path = up_relpath
+            best_shared = shared
+            best_upstream_count = up_count
+    return Score(
+        relpath=fs.relpath,
+        best_match=best_path,
+        jaccard=best_score,
+        shared_shingles=best_shared,
+        file_shingles=file_count,
+        match_shingles=best_upstream_count,
+        paired=(best_path == fs.relpath),
+    )
+
+
+class _BestMatcher:
+    """`global_best_match` bound to one upstream corpus, as each mode uses it.
+
+    Indexed by default. Under `--exact` every file is also scored by the
+    exhaustive scan, and the run stops if the index ever disagrees with it.
+    """
+
+    def __init__(self, upstream: dict[str, FileShingles], exact: bool) -> None:
+        self.upstream = upstream
+        self.exact = exact
+        # Built on first use: an incremental run may have nothing to look up.
+        self.index: ShingleIndex | None = None
+
+    def __call__(self, fs: FileShingles) -> Score:
+        if self.index is None:
+            self.index = ShingleIndex(self.upstream)
+        score = global_best_match(fs, self.upstream, self.index)
+        if self.exact:
+            reference = global_best_match(fs, self.upstream)
+            if reference != score:
+                LOGGER.error(
+                    "shingle index disagrees with the exhaustive scan for %s: %s != %s",
+                    fs.relpath, score, reference,
+                )
+                raise SystemExit(2)
+        return score
+
+
+class _ScoreCache:
+    """Per-file Scores from earlier runs, keyed by (relpath, git blob SHA).
+
+    WHY the relpath is part of the key and not only the blob: a file is scored
+    against its same-path upstream counterpart when one exists, so identical
+    content at two paths can score differently. The entry file itself is named
+    by the upstream cache key, which already covers the snapshot, the metric
+    parameters and this script's source, so any of those changing starts an
+    empty cache rather than serving a Score the current metric would not give.
+    """
+
+    def __init__(self, upstream_key: str) -> None:
+        self.entries: dict[tuple[str, str], tuple] = {}
+        self.seen: dict[tuple[str, str], tuple] = {}
+        cache = gate_cache.cache_dir(REPO_ROOT, SCORE_CACHE_NAME)
+        self.path = cache / f"{upstream_key}.marshal" if cache is not None else None
+        if self.path is not None:
+            try:
+                stored = marshal.loads(self.path.read_bytes())
+                if isinstance(stored, dict):
+                    self.entries = stored
+            except (OSError, EOFError, ValueError, TypeError):
+                pass
+
+    def get(self, relpath: str, blob: str) -> Score | None:
+        fields = self.entries.get((relpath, blob))
+        if fields is None:
+            return None
+        try:
+            score = Score(*fields)
+        except TypeError:
+            return None
+        self.seen[(relpath, blob)] = fields
+        return score
+
+    def put(self, relpath: str, blob: str, score: Score) -> None:
+        self.seen[(relpath, blob)] = astuple(score)
+
+    def save(self) -> None:
+        """Keep exactly this run's entries: the tree as it stands is what the
+        next incremental run will compare against. Other upstream keys are
+        kept up to SCORE_CACHE_KEEP, newest first, for worktrees still on them."""
+        if self.path is None or self.seen == self.entries:
+            return
+        try:
+            gate_cache.write_atomic(self.path, marshal.dumps(self.seen))
+        except OSError:
+            return  # an unwritable cache costs the next run a re-score, never this one its answer
+        gate_cache.prune(self.path.parent, SCORE_CACHE_KEEP)
+
+
+def _git_lines(*args: str) -> list[str]:
+    proc = subprocess.run(
+        ["git", *args], cwd=REPO_ROOT, capture_output=True, text=True, check=False
+    )
+    if proc.returncode != 0:
+        LOGGER.error("git %s failed: %s", " ".join(args), proc.stderr.strip())
+        raise SystemExit(2)
+    return [line for line in proc.stdout.split("\0") if line]
+
+
+def _unchanged_since(ref: str) -> dict[str, str]:
+    """krites/src files whose working-tree content is still their blob at `ref`.
+
+    Maps each such file (relative to KRITES_SRC, as Score.relpath is) to that
+    blob's SHA, read from the ref's tree rather than by hashing the file. A
+    file edited, staged, added or deleted since `ref` is absent, so it is
+    always re-scored; an untracked file was never in the ref's tree.
+    """
+    prefix = KRITES_SRC.relative_to(REPO_ROOT).as_posix()
+    changed = set(_git_lines("diff", "--name-only", "-z", ref, "--", prefix))
+    unchanged: dict[str, str] = {}
+    for entry in _git_lines("ls-tree", "-r", "-z", "--full-tree", ref, "--", prefix):
+        meta, path = entry.split("\t", 1)
+        _mode, kind, blob = meta.split()
+        if kind == "blob" and path not in changed:
+            unchanged[str(PurePosixPath(path).relative_to(prefix))] = blob
+    return unchanged
+
+
 def paired_score(fs: FileShingles, upstream: dict[str, FileShingles]) -> Score | None:
     up = upstream.get(fs.relpath)
     if up is None:
         return None
-    shared = len(fs.shingle_set & up.shingle_set)
+    shared = shared_count(fs.shingle_set, up.shingle_set)
+    union = len(fs.shingle_set) + len(up.shingle_set) - shared
     return Score(
         relpath=fs.relpath,
         best_match=fs.relpath,
-        jaccard=jaccard(fs.shingle_set, up.shingle_set),
+        jaccard=shared / union if union else 0.0,
         shared_shingles=shared,
         file_shingles=len(fs.shingle_set),
         match_shingles=len(up.shingle_set),
@@ -352,9 +731,10 @@ def paired_score(fs: FileShingles, upstream: dict[str, FileShingles]) -> Score |
 # ---------------------------------------------------------------------------
 
 
-def run_calibration() -> int:
+def run_calibration(exact: bool = False) -> int:
     krites = load_krites_corpus()
     upstream = load_upstream_corpus()
+    best_match = _BestMatcher(upstream, exact)
 
     print("=== Calibration: known-original set vs FULL upstream corpus (global max) ===")
     print(f"{'file':<45} {'best-match upstream':<40} {'shared':>7} {'file_sh':>8} {'match_sh':>9} {'jaccard':>8}")
@@ -364,7 +744,7 @@ def run_calibration() -> int:
         if fs is None:
             LOGGER.error("known-original file missing from krites/src: %s", relpath)
             return 2
-        score = global_best_match(fs, upstream)
+        score = best_match(fs)
         original_scores.append(score.jaccard)
         best_label = score.best_match if score.best_match is not None else "<no-shared-shingles>"
         print(
@@ -425,6 +805,7 @@ def run_calibration() -> int:
     return 0
 
 
+@lru_cache(maxsize=1)
 def _load_ledger_rows() -> dict[str, dict]:
     """Read PROVENANCE.toml once, for the strict gate's status lookup.
 
@@ -472,14 +853,37 @@ def _asserts_no_predecessor(relpath: str) -> bool:
     return row.get("status") == "sovereign" and row.get("replaced_upstream_path", "none") == "none"
 
 
-def run_report(strict: bool) -> int:
-    krites = load_krites_corpus()
+def run_report(strict: bool, exact: bool = False, changed_since: str | None = None) -> int:
+    """Score every krites file and print the report.
+
+    With `changed_since`, a file whose content is unchanged since that ref
+    reuses the Score an earlier run cached for its blob; everything else is
+    scored fresh. Either way every file is in the report, so the rows -- and
+    therefore --strict -- are the ones a full run produces.
+    """
     upstream = load_upstream_corpus()
+    best_match = _BestMatcher(upstream, exact)
+    scores = _ScoreCache(_upstream_cache_key(UPSTREAM_SRC))
+    unchanged = _unchanged_since(changed_since) if changed_since is not None else {}
 
     rows: list[Score] = []
-    for relpath, fs in sorted(krites.items()):
-        paired = paired_score(fs, upstream)
-        rows.append(paired if paired is not None else global_best_match(fs, upstream))
+    rescored = 0
+    with gate_profile.span("score"):
+        for path in sorted(_corpus_paths(KRITES_SRC), key=lambda p: str(p.relative_to(KRITES_SRC))):
+            relpath = str(path.relative_to(KRITES_SRC))
+            blob = unchanged.get(relpath)
+            score = scores.get(relpath, blob) if blob is not None else None
+            if score is None:
+                data = path.read_bytes()
+                fs = _file_shingles(KRITES_SRC, path, data)
+                paired = paired_score(fs, upstream)
+                score = paired if paired is not None else best_match(fs)
+                scores.put(relpath, blob if blob is not None else git_blob_sha(data), score)
+                rescored += 1
+            rows.append(score)
+    scores.save()
+    if changed_since is not None:
+        LOGGER.info("re-scored %d of %d file(s) changed since %s or not cached", rescored, len(rows), changed_since)
 
     rows.sort(key=lambda r: r.jaccard, reverse=True)
 
@@ -532,6 +936,8 @@ def run_single(relpath: str) -> int:
         LOGGER.error("file not found under crates/krites/src: %s", relpath)
         return 2
     paired = paired_score(fs, upstream)
+    # One query never repays building the index: the exhaustive scan already
+    # is the exact answer, so --exact has nothing to cross-check here.
     score = paired if paired is not None else global_best_match(fs, upstream)
     print(f"file: {score.relpath}")
     print(f"best match: {score.best_match} (paired={score.paired})")
@@ -551,13 +957,24 @@ def main() -> int:
         action="store_true",
         help="exit 1 if any file exceeds the calibrated threshold (NOT for CI use — see PROMOTION CRITERIA)",
     )
+    parser.add_argument(
+        "--changed-since",
+        metavar="REF",
+        default=None,
+        help="re-score only files changed since REF, reusing cached scores for the rest",
+    )
+    parser.add_argument(
+        "--exact",
+        action="store_true",
+        help="also score every file by exhaustive scan and fail if the shingle index disagrees",
+    )
     args = parser.parse_args()
 
     if args.calibrate:
-        return run_calibration()
+        return run_calibration(exact=args.exact)
     if args.file:
         return run_single(args.file)
-    return run_report(strict=args.strict)
+    return run_report(strict=args.strict, exact=args.exact, changed_since=args.changed_since)
 
 
 if __name__ == "__main__":
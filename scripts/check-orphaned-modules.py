@@ -13,10 +13,12 @@ rots invisibly: stale code, an abandoned refactor, a file `git mv`'d without
 its `mod` declaration following.
 
 Resolution model (Rust 2018+ path rules, no `cargo`/`syn` dependency --
-stdlib only):
+stdlib only), shared with the other module-walking gates through
+`scripts/rust_module_graph.py`:
 
-- A file named `lib.rs`, `main.rs`, or `mod.rs` governs its OWN directory: a
-  `mod child;` inside it resolves to `<dir>/child.rs` or `<dir>/child/mod.rs`.
+- A crate root (`lib.rs`, `main.rs`, `bin/*.rs`) or a `mod.rs` governs its
+  OWN directory: a `mod child;` inside it resolves to `<dir>/child.rs` or
+  `<dir>/child/mod.rs`.
 - Any other file `name.rs` governs a SIBLING directory named after its own
   stem: `mod child;` inside `foo/bar.rs` resolves to `foo/bar/child.rs` or
   `foo/bar/child/mod.rs`.
@@ -26,15 +28,14 @@ stdlib only):
 - `mod child { ... }` (brace body, no semicolon) is self-contained: no file
   resolution needed, but a `mod grandchild;` genuinely nested inside that
   brace body resolves under a further subdirectory named after `child` --
-  handled here via brace-depth-aware nesting, not by ignoring the case.
+  handled via delimiter-depth-aware nesting, not by ignoring the case.
 
-String and char literals are blanked before comments are stripped, then
-comments are stripped (block, then line) -- the same "good enough, not a
-full lexer" tradeoff `scripts/check-conflict-markers.py` and `scripts/
-krites-module-dag.py` make. Literal-blanking matters here specifically: a
-`{`/`}` inside a char literal (`'{'`) or a `mod x;`-shaped string in a test
-fixture would otherwise desync the brace-depth stack this script relies on
-to resolve nested `mod` declarations, or masquerade as a real declaration.
+Declarations are read from `strip_noise` text, with comments and literal
+contents blanked. Literal-blanking matters here specifically: a `{`/`}`
+inside a char literal (`'{'`) or a `mod x;`-shaped string in a test fixture
+would otherwise desync the nesting this script relies on to resolve nested
+`mod` declarations, or masquerade as a real declaration. `#[path]` values
+are read back from the raw text at the same offsets.
 
 Usage:
     python3 scripts/check-orphaned-modules.py [--crate NAME ...]
@@ -43,143 +44,17 @@ Usage:
 from __future__ import annotations
 
 import argparse
-import re
 import sys
 import tomllib
 from dataclasses import dataclass, field
 from pathlib import Path
 
-REPO_ROOT = Path(__file__).resolve().parent.parent
-WORKSPACE_CARGO = REPO_ROOT / "Cargo.toml"
-
-ENTRY_BASENAMES = {"lib.rs", "main.rs", "mod.rs"}
-
-BLOCK_COMMENT_RE = re.compile(r"/\*.*?\*/", re.DOTALL)
-LINE_COMMENT_RE = re.compile(r"//[^\n]*")
-
-# `#[path = "..."]` first and preserved verbatim -- its string content is
-# read below by PATH_ATTR_RE and must survive this pass. Then raw/byte-raw
-# strings (`r"..."`, `br#"..."#`, hash count 0-8 covers every occurrence in
-# this repo and anything higher is not idiomatic Rust), then normal/byte
-# strings with escape-aware quote matching, then char literals --
-# `'(?:\\.|[^'\\\n])'` requires a closing quote immediately after one
-# char/escape, which is what tells a char literal (`'{'`) apart from a
-# lifetime (`'a`, no closing quote nearby).
-LITERAL_RE = re.compile(
-    r'(?P<pathattr>#\[path[ \t]*=[ \t]*"[^"]*"\])'
-    r'|b?r(?P<hashes>#{0,8})".*?"(?P=hashes)'
-    r"|b?\"(?:[^\"\\]|\\.)*\""
-    r"|'(?:\\.|[^'\\\n])'",
-    re.DOTALL,
-)
-
-
-def _blank_literal(m: re.Match[str]) -> str:
-    pathattr = m.group("pathattr")
-    return pathattr if pathattr is not None else ""
+sys.path.insert(0, str(Path(__file__).resolve().parent))
 
+import rust_module_graph  # noqa: E402
 
-def strip_comments(text: str) -> str:
-    text = LITERAL_RE.sub(_blank_literal, text)
-    text = BLOCK_COMMENT_RE.sub("", text)
-    return LINE_COMMENT_RE.sub("", text)
-
-
-# Every construct the scan needs to notice, as one alternation so `finditer`
-# jumps directly between matches (C-speed) instead of a Python-level
-# per-character loop -- this repo's src/ trees run to ~700k lines combined.
-#
-# - lbrace/rbrace: generic nesting, for virtual_path bookkeeping.
-# - attr: a `#[...]` attribute. Non-nested (`[^\]]*` stops at the first `]`)
-#   -- sufficient for every attribute this repo places before a `mod`
-#   (`cfg`, `path`, `expect`, ...); none nest a further `[`.
-# - moddecl: `mod name;` or `mod name {`. The leading negative lookbehind
-#   stops an identifier merely ending in "mod" (e.g. `custom_mod xyz;`) from
-#   false-positiving as a declaration.
-TOKEN_RE = re.compile(
-    r"(?P<lbrace>\{)"
-    r"|(?P<rbrace>\})"
-    r"|(?P<attr>#\[[^\]]*\])"
-    r"|(?<![A-Za-z0-9_])(?:pub(?:\([^)]*\))?[ \t]+)?mod[ \t]+(?P<modname>[A-Za-z_][A-Za-z0-9_]*)[ \t\n]*(?P<modterm>[;{])"
-)
-PATH_ATTR_RE = re.compile(r'^#\[path[ \t]*=[ \t]*"([^"]+)"\]$')
-
-
-@dataclass
-class ModDecl:
-    name: str
-    virtual_path: tuple[str, ...]  # ancestor inline-mod names, outermost first
-    path_attr: str | None
-
-
-def scan_mod_decls(text: str) -> list[ModDecl]:
-    """Walk comment-stripped `text`, brace-depth-aware, collecting every
-    file-backed (`;`) `mod` declaration at any nesting depth, tagged with
-    the chain of enclosing inline (`{`) mod names.
-
-    A run of `#[...]` attributes immediately preceding a `mod` -- only
-    whitespace between each, in any order -- is tracked so a `#[path]`
-    anywhere in that run (`#[cfg(test)] #[path = "..."] #[expect(...)]`) is
-    still found; any intervening non-whitespace text, or a brace, resets it
-    so it never leaks onto an unrelated declaration.
-    """
-    decls: list[ModDecl] = []
-    stack: list[str | None] = []  # None = non-mod brace; str = inline mod name
-    pending_path_attr: str | None = None
-    prev_end = 0
-
-    for m in TOKEN_RE.finditer(text):
-        if text[prev_end : m.start()].strip():
-            pending_path_attr = None  # real code intervened -- attribute chain broken
-        prev_end = m.end()
-
-        if m.group("lbrace"):
-            stack.append(None)
-            pending_path_attr = None
-        elif m.group("rbrace"):
-            if stack:
-                stack.pop()
-            pending_path_attr = None
-        elif m.group("attr"):
-            attr_m = PATH_ATTR_RE.match(m.group("attr"))
-            if attr_m is not None:
-                pending_path_attr = attr_m.group(1)
-        else:
-            name, terminator = m.group("modname"), m.group("modterm")
-            virtual_path = tuple(s for s in stack if s is not None)
-            if terminator == ";":
-                decls.append(ModDecl(name=name, virtual_path=virtual_path, path_attr=pending_path_attr))
-            else:  # "{": inline body -- push and keep scanning inside it
-                stack.append(name)
-            pending_path_attr = None
-
-    return decls
-
-
-def module_dir(rs_file: Path) -> Path:
-    """The directory a `mod child;` inside `rs_file` resolves relative to
-    (before any virtual-path nesting from enclosing inline mods)."""
-    if rs_file.name in ENTRY_BASENAMES:
-        return rs_file.parent
-    return rs_file.parent / rs_file.stem
-
-
-def resolve_mod(decl: ModDecl, from_file: Path) -> Path | None:
-    if decl.path_attr is not None:
-        target = (from_file.parent / decl.path_attr).resolve()
-        return target if target.is_file() else None
-
-    base = module_dir(from_file)
-    for seg in decl.virtual_path:
-        base = base / seg
-
-    candidate_flat = base / f"{decl.name}.rs"
-    candidate_dir = base / decl.name / "mod.rs"
-    if candidate_flat.is_file():
-        return candidate_flat
-    if candidate_dir.is_file():
-        return candidate_dir
-    return None
+REPO_ROOT = Path(__file__).resolve().parent.parent
+WORKSPACE_CARGO = REPO_ROOT / "Cargo.toml"
 
 
 @dataclass
@@ -215,29 +90,28 @@ def walk_crate(name: str, crate_dir: Path, repo_root: Path = REPO_ROOT) -> Crate
 
     result.all_files = {p.resolve() for p in src_dir.rglob("*.rs")}
 
-    stack = [p.resolve() for p in entry_points(src_dir)]
-    result.reached.update(stack)
-    seen: set[Path] = set(stack)
-    queue = list(stack)
+    graph = rust_module_graph.load(REPO_ROOT)
+    roots = [p.resolve() for p in entry_points(src_dir)]
+    result.reached.update(roots)
+    seen: set[Path] = set(roots)
+    queue = [(p, True) for p in roots]
 
     while queue:
-        current = queue.pop()
+        current, is_root = queue.pop()
         try:
-            raw = current.read_text(encoding="utf-8", errors="replace")
+            node = graph.node(current)
         except OSError:
             continue
-        text = strip_comments(raw)
-        for decl in scan_mod_decls(text):
-            target = resolve_mod(decl, current)
+        for decl in node.mods:
+            target = graph.resolve(current, decl, is_root)
             if target is None:
                 loc = "/".join((*decl.virtual_path, decl.name))
                 result.unresolved.append(f"{current.relative_to(repo_root)}: mod {loc}; -> no target file")
                 continue
-            target = target.resolve()
             if target not in seen:
                 seen.add(target)
                 result.reached.add(target)
-                queue.append(target)
+                queue.append((target, False))
 
     return result
 
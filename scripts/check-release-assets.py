@@ -4,12 +4,15 @@
 from __future__ import annotations
 
 import argparse
-import hashlib
 import json
 import re
 import sys
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import digest_ledger  # noqa: E402
+
 SEMVER_TAG_RE = re.compile(
     r"^v(?P<version>[0-9]+\.[0-9]+\.[0-9]+"
     r"(?:-[0-9A-Za-z.-]+)?(?:\+[0-9A-Za-z.-]+)?)$"
@@ -76,7 +79,7 @@ def _check_checksum(directory: Path, checksum_path: Path) -> list[str]:
 
     subject = directory / subject_name
     try:
-        observed = hashlib.sha256(subject.read_bytes()).hexdigest()
+        observed = digest_ledger.sha256_path(subject).sha256
     except OSError as exc:
         errors.append(f"{subject_name}: failed to hash: {exc}")
         return errors
@@ -1,15 +1,26 @@
 #!/usr/bin/env python3
-"""Cryptographically verify every binary attestation in a release asset set."""
+"""Cryptographically verify every binary attestation in a release asset set.
+
+Each `gh attestation verify` checks a signature and the transparency log over
+the network, so a run is dominated by waiting. The six verifications (three
+predicate types for each of two platforms) run --jobs at a time, and their
+errors are reported in the same order at any --jobs value. --summary-json
+records how long each one took.
+"""
 
 from __future__ import annotations
 
 import argparse
+import functools
 import json
 import re
 import subprocess
 import sys
+import time
 from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from typing import NamedTuple
 
 PROVENANCE_TYPE = "https://slsa.dev/provenance/v1"
 CYCLONEDX_TYPE = "https://cyclonedx.org/bom"
@@ -25,9 +36,19 @@ SEMVER_TAG_RE = re.compile(
 SHA_RE = re.compile(r"^[0-9a-f]{40}$")
 REPO_RE = re.compile(r"^[A-Za-z0-9_.-]+/[A-Za-z0-9_.-]+$")
 
+# One per bundle: every verification in flight at once.
+DEFAULT_JOBS = 6
+
 Runner = Callable[[list[str]], subprocess.CompletedProcess[str]]
 
 
+class Verification(NamedTuple):
+    bundle: str
+    predicate_type: str
+    seconds: float
+    errors: list[str]
+
+
 def _run(command: list[str]) -> subprocess.CompletedProcess[str]:
     return subprocess.run(command, check=False, capture_output=True, text=True)
 
@@ -116,7 +137,14 @@ def check_attestations(
     repo: str,
     *,
     runner: Runner = _run,
+    jobs: int = 1,
+    verifications: list[Verification] | None = None,
 ) -> list[str]:
+    """Verify every bundle, `jobs` at a time; errors in bundle order.
+
+    `runner` is called from worker threads when `jobs` > 1. Each completed
+    verification is appended to `verifications`, in bundle order, when given.
+    """
     tag_match = SEMVER_TAG_RE.fullmatch(tag)
     if tag_match is None:
         return [f"release tag must have vX.Y.Z form, received {tag!r}"]
@@ -129,7 +157,9 @@ def check_attestations(
 
     version = tag_match.group("version")
     source_ref = f"refs/tags/{tag}"
-    errors: list[str] = []
+    # Each entry is either an SBOM load error or one verification to run, in
+    # the order their errors are reported.
+    planned: list[str | tuple[Path, str, Callable[[], list[str]]]] = []
     for artifact in PLATFORM_ARTIFACTS:
         binary = directory / f"{artifact}-{version}"
         specs = (
@@ -154,37 +184,105 @@ def check_attestations(
             if sbom_path is not None:
                 expected_predicate, load_error = _load_json(sbom_path)
                 if load_error is not None:
-                    errors.append(f"{sbom_path.name}: failed to load SBOM: {load_error}")
+                    planned.append(f"{sbom_path.name}: failed to load SBOM: {load_error}")
                     continue
-            errors.extend(
-                _verify_one(
-                    binary=binary,
-                    bundle=bundle,
-                    predicate_type=predicate_type,
-                    source_sha=source_sha,
-                    source_ref=source_ref,
-                    repo=repo,
-                    expected_predicate=expected_predicate,
-                    runner=runner,
-                )
+            verify = functools.partial(
+                _verify_one,
+                binary=binary,
+                bundle=bundle,
+                predicate_type=predicate_type,
+                source_sha=source_sha,
+                source_ref=source_ref,
+                repo=repo,
+                expected_predicate=expected_predicate,
+                runner=runner,
             )
+            planned.append((bundle, predicate_type, verify))
+
+    def timed(bundle: Path, predicate_type: str, verify: Callable[[], list[str]]) -> Verification:
+        started = time.monotonic()
+        errors = verify()
+        return Verification(bundle.name, predicate_type, time.monotonic() - started, errors)
+
+    errors: list[str] = []
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        pending = [
+            item if isinstance(item, str) else pool.submit(timed, *item) for item in planned
+        ]
+        for item in pending:
+            if isinstance(item, str):
+                errors.append(item)
+                continue
+            verification = item.result()
+            errors.extend(verification.errors)
+            if verifications is not None:
+                verifications.append(verification)
     return errors
 
 
+def summary_json(verifications: list[Verification], jobs: int, wall: float) -> str:
+    return (
+        json.dumps(
+            {
+                "jobs": jobs,
+                "wall_s": round(wall, 4),
+                "verifications": [
+                    {
+                        "bundle": v.bundle,
+                        "predicate_type": v.predicate_type,
+                        "seconds": round(v.seconds, 4),
+                        "ok": not v.errors,
+                    }
+                    for v in verifications
+                ],
+            },
+            indent=2,
+        )
+        + "\n"
+    )
+
+
 def parse_args(argv: list[str]) -> argparse.Namespace:
     parser = argparse.ArgumentParser(description=__doc__)
     parser.add_argument("--directory", type=Path, required=True)
     parser.add_argument("--tag", required=True)
     parser.add_argument("--source-sha", required=True)
     parser.add_argument("--repo", required=True)
-    return parser.parse_args(argv)
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=DEFAULT_JOBS,
+        help=f"verifications to run at once (default: {DEFAULT_JOBS}; 1 runs them one after another)",
+    )
+    parser.add_argument(
+        "--summary-json",
+        type=Path,
+        metavar="PATH",
+        help="write each verification's latency and outcome as JSON",
+    )
+    args = parser.parse_args(argv)
+    if args.jobs < 1:
+        parser.error("--jobs must be at least 1")
+    return args
 
 
 def main(argv: list[str] | None = None) -> int:
     args = parse_args(sys.argv[1:] if argv is None else argv)
+    verifications: list[Verification] = []
+    started = time.monotonic()
     errors = check_attestations(
-        args.directory.resolve(), args.tag, args.source_sha, args.repo
+        args.directory.resolve(),
+        args.tag,
+        args.source_sha,
+        args.repo,
+        jobs=args.jobs,
+        verifications=verifications,
     )
+    if args.summary_json is not None:
+        args.summary_json.write_text(
+            summary_json(verifications, args.jobs, time.monotonic() - started),
+            encoding="utf-8",
+        )
     if errors:
         for error in errors:
             print(f"release-attestations: {error}", file=sys.stderr)
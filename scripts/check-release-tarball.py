@@ -1,5 +1,13 @@
 #!/usr/bin/env python3
-"""Validate an Aletheia release tarball and its embedded package manifest."""
+"""Validate an Aletheia release tarball and its embedded package manifest.
+
+The archive is read in one forward pass over the gzip stream, and each
+member is hashed in CHUNK_SIZE pieces as it is decoded. Only a member's
+digest, size and mode are kept. The one exception is PACKAGE-MANIFEST.txt,
+whose text has to be parsed. So peak memory does not grow with the release
+binary. The standalone binary's digest comes from digest_ledger.py, which
+check-release-assets.py has usually filled for it already.
+"""
 
 from __future__ import annotations
 
@@ -13,6 +21,10 @@ from dataclasses import dataclass
 from pathlib import Path, PurePosixPath
 from typing import BinaryIO
 
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import digest_ledger  # noqa: E402
+
 FEATURES = "recall,embed-candle"
 REQUIRED_PATHS = (
     "aletheia",
@@ -35,6 +47,9 @@ TARGET_ARTIFACTS = {
     "x86_64-unknown-linux-musl": "aletheia-linux-x86_64",
     "aarch64-apple-darwin": "aletheia-macos-aarch64",
 }
+# Read size for hashing archive members.
+CHUNK_SIZE = 1 << 20
+MANIFEST = "PACKAGE-MANIFEST.txt"
 ROW_RE = re.compile(
     r"^(?P<digest>[0-9a-f]{64}) "
     r"(?P<mode>[0-7]{4}) (?P<size>[0-9]+) (?P<path>\S+)$"
@@ -48,6 +63,28 @@ class ManifestRow:
     size: int
 
 
+@dataclass(frozen=True)
+class ArchiveFile:
+    digest: str
+    mode: int
+    size: int
+    # The member's bytes, kept only for the manifest.
+    content: bytes | None = None
+
+
+def _sha256_stream(handle: BinaryIO, keep: bool = False) -> tuple[str, int, bytes | None]:
+    """Hash `handle` to EOF in CHUNK_SIZE reads: (hex digest, size, bytes if `keep`)."""
+    digest = hashlib.sha256()
+    size = 0
+    kept: list[bytes] | None = [] if keep else None
+    while chunk := handle.read(CHUNK_SIZE):
+        digest.update(chunk)
+        size += len(chunk)
+        if kept is not None:
+            kept.append(chunk)
+    return digest.hexdigest(), size, None if kept is None else b"".join(kept)
+
+
 def _contained_cli_file(value: str) -> BinaryIO:
     """Open a CLI file beneath the invocation directory, without symlink escape."""
     allowed_root = Path.cwd().resolve(strict=True)
@@ -119,13 +156,18 @@ def _parse_manifest(data: bytes) -> tuple[dict[str, str], dict[str, ManifestRow]
 
 def _read_archive(
     tarball: BinaryIO, root: str
-) -> tuple[dict[str, tuple[tarfile.TarInfo, bytes]], list[str]]:
-    files: dict[str, tuple[tarfile.TarInfo, bytes]] = {}
+) -> tuple[dict[str, ArchiveFile], list[str]]:
+    files: dict[str, ArchiveFile] = {}
     errors: list[str] = []
     try:
         with tarfile.open(fileobj=tarball, mode="r:gz") as archive:
             seen_names: set[str] = set()
-            for member in archive.getmembers():
+            # WHY iterate rather than getmembers(): getmembers() decodes the
+            # whole stream to index it, and reading each member afterwards
+            # makes gzip rewind and decode again from the start. Iterating
+            # reads each member's data right after its header, so the stream
+            # is decoded once, front to back.
+            for member in archive:
                 if member.name in seen_names:
                     errors.append(f"duplicate archive member: {member.name}")
                     continue
@@ -160,9 +202,20 @@ def _read_archive(
                         f"duplicate normalized archive member: {member.name}"
                     )
                     continue
-                files[relative] = (member, extracted.read())
-    except (OSError, tarfile.TarError) as exc:
-        errors.append(f"failed to open tarball: {exc}")
+                digest, size, content = _sha256_stream(
+                    extracted, keep=relative == MANIFEST
+                )
+                files[relative] = ArchiveFile(
+                    digest=digest,
+                    mode=stat.S_IMODE(member.mode),
+                    size=size,
+                    content=content,
+                )
+    except (OSError, EOFError, tarfile.TarError) as exc:
+        # A damaged stream used to fail inside getmembers(), before any member
+        # was judged. Report it the same way: alone, with no partial listing.
+        # EOFError is gzip's word for a truncated download.
+        return {}, [f"failed to open tarball: {exc}"]
     return files, errors
 
 
@@ -181,7 +234,7 @@ def check_tarball(
     if re.fullmatch(r"[0-9a-f]{40}", source_sha) is None:
         return ["expected source commit must be a 40-hex SHA"]
     try:
-        standalone_digest = hashlib.sha256(standalone_binary.read()).hexdigest()
+        standalone_digest = digest_ledger.sha256_file(standalone_binary).sha256
     except OSError as exc:
         return [f"failed to hash standalone binary: {exc}"]
 
@@ -192,10 +245,10 @@ def check_tarball(
         if path not in files:
             errors.append(f"missing {root}/{path}")
 
-    manifest_entry = files.get("PACKAGE-MANIFEST.txt")
-    if manifest_entry is None:
+    manifest_entry = files.get(MANIFEST)
+    if manifest_entry is None or manifest_entry.content is None:
         return errors
-    metadata, rows, manifest_errors = _parse_manifest(manifest_entry[1])
+    metadata, rows, manifest_errors = _parse_manifest(manifest_entry.content)
     errors.extend(manifest_errors)
 
     expected_metadata = {
@@ -217,7 +270,7 @@ def check_tarball(
         if not metadata.get(key):
             errors.append(f"PACKAGE-MANIFEST.txt: missing {key}")
 
-    packaged = set(files) - {"PACKAGE-MANIFEST.txt"}
+    packaged = set(files) - {MANIFEST}
     manifest_paths = set(rows)
     for path in sorted(packaged - manifest_paths):
         errors.append(f"PACKAGE-MANIFEST.txt: missing row for {path}")
@@ -225,34 +278,32 @@ def check_tarball(
         errors.append(f"PACKAGE-MANIFEST.txt: row names absent file {path}")
 
     for path in sorted(packaged & manifest_paths):
-        member, data = files[path]
+        packed = files[path]
         row = rows[path]
-        digest = hashlib.sha256(data).hexdigest()
-        mode = stat.S_IMODE(member.mode)
-        if row.digest != digest:
+        if row.digest != packed.digest:
             errors.append(
                 f"PACKAGE-MANIFEST.txt: digest mismatch for {path}: "
-                f"{row.digest} != {digest}"
+                f"{row.digest} != {packed.digest}"
             )
-        if row.mode != mode:
+        if row.mode != packed.mode:
             errors.append(
                 f"PACKAGE-MANIFEST.txt: mode mismatch for {path}: "
-                f"{row.mode:04o} != {mode:04o}"
+                f"{row.mode:04o} != {packed.mode:04o}"
             )
-        if row.size != len(data):
+        if row.size != packed.size:
             errors.append(
                 f"PACKAGE-MANIFEST.txt: size mismatch for {path}: "
-                f"{row.size} != {len(data)}"
+                f"{row.size} != {packed.size}"
             )
     binary_entry = files.get("aletheia")
     if binary_entry is not None:
-        embedded_digest = hashlib.sha256(binary_entry[1]).hexdigest()
+        embedded_digest = binary_entry.digest
         if embedded_digest != standalone_digest:
             errors.append(
                 "packaged aletheia does not equal the standalone release binary: "
                 f"{embedded_digest} != {standalone_digest}"
             )
-        binary_mode = stat.S_IMODE(binary_entry[0].mode)
+        binary_mode = binary_entry.mode
         if binary_mode != 0o755:
             errors.append(
                 f"packaged aletheia mode is {binary_mode:04o}, expected 0755"
@@ -31,10 +31,13 @@ from __future__ import annotations
 
 import logging
 import re
-import subprocess
 import sys
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import rust_source_index  # noqa: E402
+
 LOGGER = logging.getLogger("check-schema-descriptions")
 
 REPO_ROOT = Path(__file__).resolve().parents[1]
@@ -53,13 +56,7 @@ DOC_COMMENT = re.compile(r"^\s*///")
 
 
 def tracked_rust_files(repo_root: Path) -> list[Path]:
-    result = subprocess.run(
-        ["git", "ls-files", "*.rs"],
-        capture_output=True, text=True, check=False, cwd=repo_root,
-    )
-    if result.returncode != 0:
-        raise SystemExit(f"git ls-files failed: {result.stderr.strip()}")
-    return [repo_root / line for line in result.stdout.splitlines() if line]
+    return [repo_root / rel for rel in rust_source_index.load(repo_root).paths()]
 
 
 def leaking_docs(text: str) -> list[tuple[int, str]]:
@@ -108,17 +105,17 @@ def main() -> int:
     schema_items = 0
     failures: list[str] = []
 
-    for path in tracked_rust_files(REPO_ROOT):
-        try:
-            text = path.read_text(encoding="utf-8")
-        except (OSError, UnicodeError):
+    for entry in rust_source_index.load(REPO_ROOT).files():
+        if b"JsonSchema" not in entry.raw:
             continue
-        if "JsonSchema" not in text:
+        try:
+            text = entry.text
+        except UnicodeError:
             continue
         schema_items += len(DERIVE_JSON_SCHEMA.findall(text))
         for lineno, line in leaking_docs(text):
             total += 1
-            failures.append(f"  {path.relative_to(REPO_ROOT).as_posix()}:{lineno}  {line}")
+            failures.append(f"  {entry.path}:{lineno}  {line}")
 
     if failures:
         LOGGER.error(
@@ -76,13 +76,16 @@ from __future__ import annotations
 
 import argparse
 import re
-import subprocess
 import sys
 import tomllib
 from collections import Counter
 from dataclasses import dataclass
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import rust_source_index  # noqa: E402
+
 REPO_ROOT = Path(__file__).resolve().parents[1]
 BASELINE_PATH = REPO_ROOT / "scripts" / "stub-baseline.toml"
 
@@ -138,13 +141,7 @@ def is_test_file(rel: str) -> bool:
 
 
 def tracked_rs_files() -> list[str]:
-    out = subprocess.run(
-        ["git", "ls-files", "-z", "crates/*.rs"],
-        cwd=REPO_ROOT,
-        capture_output=True,
-        check=True,
-    )
-    return [p for p in out.stdout.decode("utf-8", "replace").split("\0") if p]
+    return rust_source_index.load(REPO_ROOT).paths("crates/*.rs")
 
 
 def find_attributes(text: str) -> list[tuple[int, int, str]]:
@@ -243,15 +240,10 @@ def scan_text(rel: str, text: str) -> list[Candidate]:
 
 def scan_candidates() -> list[Candidate]:
     candidates: list[Candidate] = []
-    for rel in tracked_rs_files():
-        if is_test_file(rel):
-            continue
-        path = REPO_ROOT / rel
-        try:
-            text = path.read_text(encoding="utf-8")
-        except OSError:
+    for entry in rust_source_index.load(REPO_ROOT).files("crates/*.rs"):
+        if is_test_file(entry.path):
             continue
-        candidates.extend(scan_text(rel, text))
+        candidates.extend(scan_text(entry.path, entry.text))
     return candidates
 
 
@@ -92,11 +92,16 @@ from __future__ import annotations
 
 import logging
 import re
-import subprocess
 import sys
+from collections.abc import Iterable
 from dataclasses import dataclass, field
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import rust_module_graph  # noqa: E402
+import rust_source_index  # noqa: E402
+
 LOGGER = logging.getLogger("check-unfulfilled-expects")
 
 REPO_ROOT = Path(__file__).resolve().parent.parent
@@ -129,8 +134,7 @@ MOD_HEADER_RE = re.compile(
 ATTR_START_RE = re.compile(r"^(\s*)#(!)?\[")
 CFG_ATTR_RE = re.compile(r"^\s*#!?\[cfg\((.*)\)\]\s*$")
 EXPECT_ATTR_START_RE = re.compile(r"^\s*#(!)?\[expect\(")
-MOD_DECL_RE = re.compile(r"^\s*(?:pub(?:\([^)]*\))?\s+)?mod\s+([A-Za-z_][A-Za-z0-9_]*)\s*;\s*$")
-PATH_ATTR_RE = re.compile(r'^\s*#\[path\s*=\s*"([^"]+)"\]\s*$')
+CFG_PREDICATE_RE = re.compile(r"^cfg\s*\((.*)\)$", re.DOTALL)
 LINT_NAME_RE = re.compile(r"clippy::([a-z_]+)")
 
 
@@ -539,95 +543,62 @@ def scan_file(stripped: list[str]) -> list[_Candidate]:
     return candidates
 
 
-def _find_declaring_statement(target: Path) -> tuple[list[str]] | None:
-    """One-hop: cfg predicates gating the `mod`/`#[path]` statement that
-    declares `target`, or None if no such statement was found (default:
-    unconditionally reachable -- see module docstring)."""
-    directory = target.parent
-    if target.name == "mod.rs":
-        search_dir = directory.parent
-        decl_stem = directory.name
-    else:
-        search_dir = directory
-        decl_stem = target.stem
+def _declaring_cfgs(target: Path) -> list[list[str]]:
+    """One hop: for each `mod`/`#[path]` statement that declares `target`,
+    the cfg predicates gating it. Empty if none was found (default:
+    unconditionally reachable -- see module docstring).
 
+    Declarations come from the shared module graph, so "declares" means
+    resolves there the way rustc resolves it. The files searched are the ones
+    that can declare `target` without a `#[path]` reaching across
+    directories: those beside it (beside its directory, for a `mod.rs`), and
+    the `dir.rs` that owns that directory.
+    """
+    search_dir = target.parent.parent if target.name == "mod.rs" else target.parent
     if not search_dir.is_dir():
-        return None
-
-    for f in sorted(search_dir.glob("*.rs")):
+        return []
+    graph = rust_module_graph.load()
+    resolved = target.resolve()
+    found: list[list[str]] = []
+    owner = search_dir.parent / f"{search_dir.name}.rs"
+    for f in [*sorted(search_dir.glob("*.rs")), owner]:
         try:
-            text = f.read_text(encoding="utf-8", errors="replace")
+            decls = graph.node(f).mods
         except OSError:
             continue
-        # PERF: strip_noncode is the expensive step (a per-character scan).
-        # A file that mentions neither the module name nor the exact
-        # filename anywhere cannot possibly declare `target` -- skip the
-        # scan entirely rather than stripping every unrelated peer in a
-        # directory once per file-level candidate that lives in it.
-        if decl_stem not in text and target.name not in text:
-            continue
-        stripped = strip_noncode(text).splitlines()
-        pending_path: str | None = None
-        cfg_run: list[str] = []
-        for line in stripped:
-            s = line.strip()
-            if s == "":
-                continue
-            pm = PATH_ATTR_RE.match(line)
-            if pm:
-                pending_path = pm.group(1)
-                continue
-            cm = CFG_ATTR_RE.match(line)
-            if cm:
-                cfg_run.append(cm.group(1))
-                continue
-            dm = MOD_DECL_RE.match(line)
-            if dm:
-                matches = (
-                    pending_path == target.name
-                    if pending_path is not None
-                    else dm.group(1) == decl_stem
-                )
-                if matches:
-                    return (list(cfg_run),)
-                pending_path = None
-                cfg_run = []
-                continue
-            pending_path = None
-            cfg_run = []
-    return None
+        is_root = rust_module_graph.is_crate_root(f)
+        for decl in decls:
+            if graph.resolve(f, decl, is_root) == resolved:
+                found.append(_cfg_predicates(decl.attrs))
+    return found
+
+
+def _cfg_predicates(attrs: Iterable[str]) -> list[str]:
+    """The predicates of the plain `cfg(...)` attributes among `attrs`."""
+    predicates = []
+    for attr in attrs:
+        m = CFG_PREDICATE_RE.match(strip_noncode(attr).strip())
+        if m:
+            predicates.append(m.group(1))
+    return predicates
 
 
 def file_is_test_safe(path: Path) -> bool:
-    found = _find_declaring_statement(path)
-    if found is None:
+    found = _declaring_cfgs(path)
+    if not found:
         return True  # not found -> default reachable (see docstring)
-    (cfg_predicates,) = found
-    return combined_cfg_test_safe(cfg_predicates)
-
-
-def _resolve_child_file(declaring_file: Path, mod_name: str, path_attr: str | None) -> Path | None:
-    """The file a `mod NAME;` / `#[path = "..."] mod NAME;` declaration
-    inside `declaring_file` brings into the module tree, or None if no such
-    file exists on disk."""
-    if path_attr is not None:
-        candidate = declaring_file.parent / path_attr
-        return candidate if candidate.is_file() else None
-    base = (
-        declaring_file.parent
-        if declaring_file.name == "mod.rs"
-        else declaring_file.parent / declaring_file.stem
-    )
-    for candidate in (base / f"{mod_name}.rs", base / mod_name / "mod.rs"):
-        if candidate.is_file():
-            return candidate
-    return None
+    return any(combined_cfg_test_safe(cfg_predicates) for cfg_predicates in found)
 
 
-def _gather_child_content(declaring_file: Path, span_lines: list[str], visited: set[Path]) -> str:
-    """Stripped content of every file a `mod`/`#[path]` declaration inside
-    `span_lines` brings into the module tree, gathered recursively (test
-    files here are commonly split more than one level deep).
+def _gather_child_content(
+    declaring_file: Path,
+    decls: Iterable[rust_module_graph.ModDecl],
+    is_root: bool,
+    visited: set[Path],
+) -> str:
+    """Stripped content of every file one of `decls` (inside
+    `declaring_file`) brings into the module tree, gathered recursively
+    (test files here are commonly split more than one level deep).
 
     WHY: a lint-level attribute's scope is the module it sits on PLUS every
     descendant item, regardless of which physical file that descendant's
@@ -641,32 +612,20 @@ def _gather_child_content(declaring_file: Path, span_lines: list[str], visited:
     ever "flag something that is actually fine", never "stay quiet on
     something that is actually fine").
     """
+    graph = rust_module_graph.load()
     extra: list[str] = []
-    pending_path: str | None = None
-    for line in span_lines:
-        s = line.strip()
-        if s == "":
+    for decl in decls:
+        child = graph.resolve(declaring_file, decl, is_root)
+        if child is None or child in visited:
             continue
-        pm = PATH_ATTR_RE.match(line)
-        if pm:
-            pending_path = pm.group(1)
-            continue
-        dm = MOD_DECL_RE.match(line)
-        if dm:
-            child = _resolve_child_file(declaring_file, dm.group(1), pending_path)
-            pending_path = None
-            if child is None or child in visited:
-                continue
-            visited.add(child)
-            try:
-                child_text = child.read_text(encoding="utf-8", errors="replace")
-            except OSError:
-                continue
-            child_stripped = strip_noncode(child_text).splitlines()
-            extra.append("\n".join(child_stripped))
-            extra.append(_gather_child_content(child, child_stripped, visited))
+        visited.add(child)
+        try:
+            child_text = rust_source_index.read_text(child, errors="replace")
+            child_decls = graph.node(child).mods
+        except OSError:
             continue
-        pending_path = None
+        extra.append("\n".join(strip_noncode(child_text).splitlines()))
+        extra.append(_gather_child_content(child, child_decls, False, visited))
     return "\n".join(e for e in extra if e)
 
 
@@ -676,13 +635,7 @@ def _gather_child_content(declaring_file: Path, span_lines: list[str], visited:
 
 
 def tracked_rs_files() -> list[str]:
-    out = subprocess.run(
-        ["git", "ls-files", "-z", "--", "*.rs"],
-        cwd=REPO_ROOT,
-        capture_output=True,
-        check=True,
-    )
-    return [p for p in out.stdout.decode("utf-8", "replace").split("\0") if p]
+    return rust_source_index.load(REPO_ROOT).paths()
 
 
 def check_text(path: Path, text: str, *, skip_file_cfg_check: bool = False) -> list[Violation]:
@@ -695,6 +648,8 @@ def check_text(path: Path, text: str, *, skip_file_cfg_check: bool = False) -> l
 
     stripped_lines = strip_noncode(text).splitlines()
     violations: list[Violation] = []
+    node = rust_module_graph.load().node_for_text(path, text)
+    is_root = rust_module_graph.is_crate_root(path)
 
     for cand in scan_file(stripped_lines):
         if not combined_cfg_test_safe(cand.cfg_predicates):
@@ -704,7 +659,8 @@ def check_text(path: Path, text: str, *, skip_file_cfg_check: bool = False) -> l
 
         scope_lines = stripped_lines[cand.body_start : cand.body_end + 1]
         span = "\n".join(scope_lines)
-        extra = _gather_child_content(path, scope_lines, {path})
+        decls = [d for d in node.mods if cand.body_start < d.line <= cand.body_end + 1]
+        extra = _gather_child_content(path, decls, is_root, {path.resolve()})
         if extra:
             span = span + "\n" + extra
         for lint, attr_line in sorted(cand.lints.items(), key=lambda kv: kv[1]):
@@ -716,15 +672,10 @@ def check_text(path: Path, text: str, *, skip_file_cfg_check: bool = False) -> l
 
 def main() -> int:
     violations: list[Violation] = []
-    for rel in tracked_rs_files():
-        full = REPO_ROOT / rel
-        try:
-            text = full.read_text(encoding="utf-8", errors="replace")
-        except OSError:
-            continue
-        if "expect(clippy::" not in text:
+    for entry in rust_source_index.load(REPO_ROOT).files():
+        if b"expect(clippy::" not in entry.raw:
             continue
-        violations.extend(check_text(full, text))
+        violations.extend(check_text(REPO_ROOT / entry.path, entry.lossy_text))
 
     if not violations:
         LOGGER.info("unfulfilled-expect check: clean")
@@ -3,10 +3,13 @@
 
 from __future__ import annotations
 
-import subprocess
 import sys
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import tracked_files  # noqa: E402
+
 # WHY: a manifest that declares [workspace] resolves its own dependency graph, independent of the
 # root lock. If its Cargo.lock is untracked, CI re-resolves that graph against live crates.io on
 # every run -- so a required check becomes non-deterministic against an input no one in this repo
@@ -60,27 +63,9 @@ def dependabot_cargo_directories() -> set[str] | None:
     return covered
 
 
-def tracked(path: Path) -> bool:
-    rel = path.relative_to(REPO_ROOT)
-    result = subprocess.run(
-        ["git", "ls-files", "--error-unmatch", str(rel)],
-        cwd=REPO_ROOT,
-        capture_output=True,
-        text=True,
-    )
-    return result.returncode == 0
-
-
-def workspace_manifests() -> list[Path]:
-    listing = subprocess.run(
-        ["git", "ls-files", "*Cargo.toml"],
-        cwd=REPO_ROOT,
-        capture_output=True,
-        text=True,
-        check=True,
-    )
+def workspace_manifests(index: tracked_files.TrackedFiles) -> list[Path]:
     found = []
-    for line in listing.stdout.splitlines():
+    for line in index.paths("*Cargo.toml"):
         manifest = REPO_ROOT / line
         try:
             body = manifest.read_text(encoding="utf-8")
@@ -94,14 +79,15 @@ def workspace_manifests() -> list[Path]:
 
 def main() -> int:
     failures = []
-    manifests = workspace_manifests()
+    index = tracked_files.load(REPO_ROOT)
+    manifests = workspace_manifests(index)
 
     for manifest in manifests:
         lock = manifest.parent / "Cargo.lock"
         rel = manifest.relative_to(REPO_ROOT)
         if not lock.exists():
             failures.append(f"{rel}: declares [workspace] but has no Cargo.lock beside it")
-        elif not tracked(lock):
+        elif lock.relative_to(REPO_ROOT).as_posix() not in index:
             failures.append(
                 f"{rel}: declares [workspace] but its Cargo.lock is NOT tracked by git "
                 f"-- CI will re-resolve this graph from crates.io on every run"
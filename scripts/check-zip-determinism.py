@@ -25,10 +25,13 @@ from __future__ import annotations
 
 import logging
 import re
-import subprocess
 import sys
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import rust_source_index  # noqa: E402
+
 LOGGER = logging.getLogger("check-zip-determinism")
 
 REPO_ROOT = Path(__file__).resolve().parents[1]
@@ -41,13 +44,7 @@ FIXED_TIME = "last_modified_time"
 
 
 def tracked_rust_files(repo_root: Path) -> list[Path]:
-    result = subprocess.run(
-        ["git", "ls-files", "*.rs"],
-        capture_output=True, text=True, check=False, cwd=repo_root,
-    )
-    if result.returncode != 0:
-        raise SystemExit(f"git ls-files failed: {result.stderr.strip()}")
-    return [repo_root / line for line in result.stdout.splitlines() if line]
+    return [repo_root / rel for rel in rust_source_index.load(repo_root).paths()]
 
 
 def unstamped_constructions(text: str) -> list[tuple[int, str]]:
@@ -78,16 +75,18 @@ def main() -> int:
     failures: list[str] = []
     seen = 0
 
-    for path in tracked_rust_files(REPO_ROOT):
-        try:
-            text = path.read_text(encoding="utf-8")
-        except (OSError, UnicodeError):
+    for entry in rust_source_index.load(REPO_ROOT).files():
+        # WHY the byte probe first: almost no file mentions the type, and the
+        # probe spares every other one its decode.
+        if b"SimpleFileOptions" not in entry.raw:
             continue
-        if "SimpleFileOptions" not in text:
+        try:
+            text = entry.text
+        except UnicodeError:
             continue
         seen += len(CONSTRUCTION.findall(text))
         for lineno, line in unstamped_constructions(text):
-            failures.append(f"  {path.relative_to(REPO_ROOT).as_posix()}:{lineno}  {line}")
+            failures.append(f"  {entry.path}:{lineno}  {line}")
 
     if failures:
         LOGGER.error(
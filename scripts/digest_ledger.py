@@ -0,0 +1,128 @@
+"""SHA-256 of release assets, hashed once per file and recorded on disk.
+
+A staged release directory used to be hashed from scratch by each validator
+that looked at it: check-release-assets.py read every `.sha256` subject into
+memory to check its record, and check-release-tarball.py hashed the same
+standalone binaries again. Each validator is its own process, so sharing
+the work means keeping the answer on disk.
+
+The ledger lives in gate_cache.py's directory. Its key is the file's
+identity (device and inode), not its path. An entry is trusted only while
+the file's size, mtime and ctime all match what was recorded. ctime matters
+because `touch -r` can restore an mtime, but nothing can set a ctime back:
+any write to the file moves it. So an entry cannot outlive the bytes it
+describes.
+
+A file is hashed in CHUNK_SIZE reads, so memory stays flat however large
+the binaries get.
+"""
+
+from __future__ import annotations
+
+import functools
+import hashlib
+import io
+import json
+import os
+import stat
+import sys
+from pathlib import Path
+from typing import Any, BinaryIO, NamedTuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import gate_cache  # noqa: E402
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+CACHE_NAME = "digest-ledger"
+CACHE_FILE = "ledger.json"
+CHUNK_SIZE = 1 << 20
+
+
+class Digest(NamedTuple):
+    sha256: str
+    size: int
+
+
+def _stream(handle: BinaryIO) -> Digest:
+    digest = hashlib.sha256()
+    size = 0
+    while chunk := handle.read(CHUNK_SIZE):
+        digest.update(chunk)
+        size += len(chunk)
+    return Digest(digest.hexdigest(), size)
+
+
+def _identity(st: os.stat_result) -> tuple[str, list[int]]:
+    return f"{st.st_dev}:{st.st_ino}", [st.st_size, st.st_mtime_ns, st.st_ctime_ns]
+
+
+@functools.lru_cache(maxsize=1)
+def _ledger() -> tuple[Path | None, dict[str, Any]]:
+    store_dir = gate_cache.cache_dir(REPO_ROOT, CACHE_NAME)
+    if store_dir is None:
+        return None, {}
+    store = store_dir / CACHE_FILE
+    try:
+        entries = json.loads(store.read_bytes())
+    except (OSError, ValueError):
+        entries = {}
+    return store, entries if isinstance(entries, dict) else {}
+
+
+def _still_current(key: str, entry: Any) -> bool:
+    if not isinstance(entry, dict) or not isinstance(entry.get("path"), str):
+        return False
+    try:
+        st = os.stat(entry["path"])
+    except OSError:
+        return False
+    return _identity(st) == (key, entry.get("stamp"))
+
+
+def _record(key: str, stamp: list[int], path: str, digest: Digest) -> None:
+    store, entries = _ledger()
+    entries[key] = {"path": path, "stamp": stamp, "sha256": digest.sha256, "size": digest.size}
+    if store is None:
+        return
+    # Entries for files since deleted or rewritten can never be hit again;
+    # dropping them on write keeps the ledger the size of what is on disk.
+    for stale in [k for k, entry in entries.items() if not _still_current(k, entry)]:
+        del entries[stale]
+    try:
+        gate_cache.write_atomic(store, json.dumps(entries, sort_keys=True).encode())
+    except OSError:
+        pass  # an unwritable ledger costs the next validator a re-hash, never this one its answer
+
+
+def sha256_file(handle: BinaryIO) -> Digest:
+    """Digest of the file behind `handle`, from the ledger when it is current.
+
+    `handle` must be freshly opened: on a miss it is read to EOF from where
+    it stands. A handle with no file behind it (a pipe, BytesIO) is simply
+    hashed.
+    """
+    try:
+        st = os.fstat(handle.fileno())
+    except (AttributeError, OSError, io.UnsupportedOperation):
+        return _stream(handle)
+    if not stat.S_ISREG(st.st_mode):
+        return _stream(handle)
+    key, stamp = _identity(st)
+    _, entries = _ledger()
+    entry = entries.get(key)
+    if isinstance(entry, dict) and entry.get("stamp") == stamp:
+        return Digest(entry["sha256"], entry["size"])
+
+    digest = _stream(handle)
+    # WHY re-stat: a file written while it was being hashed has a digest of
+    # neither version, and must not be recorded as either.
+    if _identity(os.fstat(handle.fileno())) == (key, stamp) and digest.size == st.st_size:
+        _record(key, stamp, os.path.abspath(handle.name), digest)
+    return digest
+
+
+def sha256_path(path: Path) -> Digest:
+    """Digest of the file at `path`; see sha256_file."""
+    with path.open("rb") as handle:
+        return sha256_file(handle)
@@ -0,0 +1,100 @@
+"""On-disk cache directory shared by the scripts/ gates.
+
+Several gates derive the same facts from inputs that change far less often
+than the gates run -- tracked Rust sources, the pinned upstream snapshot, the
+workspace manifests. Each cache here is keyed by the content it was derived
+from (a git blob SHA, a pinned ref, a manifest hash), so a stale entry is
+never served: a changed input changes the key, and the old entry is simply
+not found.
+
+WHY inside the git directory rather than `target/` or the tree: a cache under
+the worktree shows up in `git status` the first time it is written (and a
+fresh clone has no `target/` whose cargo-written `.gitignore` would hide it),
+while the git directory is never walked by `git ls-files` or any gate. `git
+rev-parse --git-common-dir` rather than `.git` so a linked worktree shares its
+primary checkout's cache instead of rebuilding it.
+
+`ALETHEIA_GATE_CACHE` overrides the location; CI can point it at a directory
+restored by `actions/cache`.
+"""
+
+from __future__ import annotations
+
+import os
+import subprocess
+import tempfile
+from pathlib import Path
+
+CACHE_ENV = "ALETHEIA_GATE_CACHE"
+CACHE_DIRNAME = "aletheia-gate-cache"
+
+
+def cache_dir(repo_root: Path, name: str) -> Path | None:
+    """Return (creating it) the cache directory `name` for `repo_root`.
+
+    None when there is nowhere safe to cache -- `repo_root` is not a git
+    checkout and no override is set. Callers treat that as "compute without
+    caching", never as an error: a cache is an optimisation, and a gate must
+    give the same answer without one.
+    """
+    override = os.environ.get(CACHE_ENV)
+    if override:
+        base = Path(override)
+    else:
+        proc = subprocess.run(
+            ["git", "rev-parse", "--git-common-dir"],
+            cwd=repo_root,
+            capture_output=True,
+            text=True,
+            check=False,
+        )
+        if proc.returncode != 0:
+            return None
+        base = (repo_root / proc.stdout.strip()) / CACHE_DIRNAME
+    target = base / name
+    try:
+        target.mkdir(parents=True, exist_ok=True)
+    except OSError:
+        return None
+    return target
+
+
+def write_atomic(path: Path, data: bytes) -> None:
+    """Replace `path` with `data` so a concurrent reader sees old or new, never half.
+
+    WHY: gates can run side by side, and two of them may refresh the same
+    cache entry at once. A reader that loads a torn file would fail on a
+    cache, which must never be why a gate fails.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.")
+    try:
+        with os.fdopen(fd, "wb") as fh:
+            fh.write(data)
+        os.replace(tmp, path)
+    except BaseException:
+        Path(tmp).unlink(missing_ok=True)
+        raise
+
+
+def prune(directory: Path, keep: int) -> None:
+    """Delete all but the `keep` most recently written entries in `directory`.
+
+    For caches whose entries are whole generations (one file per key): the
+    key a checkout needs changes with its inputs, and linked worktrees on
+    different revisions share this directory, so wiping every other key would
+    have them evict each other on every run. Dot-files are write_atomic's
+    in-flight temporaries, possibly another run's, and are left alone.
+    """
+    entries = []
+    for entry in directory.glob("[!.]*"):
+        try:
+            entries.append((entry.stat().st_mtime_ns, entry))
+        except OSError:
+            continue
+    entries.sort(reverse=True)
+    for _, stale in entries[keep:]:
+        try:
+            stale.unlink()
+        except OSError:
+            pass
@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+"""Per-process timing and resource records for the scripts/ gates.
+
+None of the gate scripts said where their time went, and run-gate-coverage.py
+could only report PASS or FAIL, so a check that quietly got ten times slower
+was noticed -- if at all -- as "CI feels slow". This module is the one
+instrumentation surface they share. When ALETHEIA_GATE_PROFILE names a
+directory, every Python process that installs it writes one JSON record there
+at exit:
+
+  script, argv, pid, ppid       which run this was
+  wall_s                        from install (interpreter start-up) to exit
+  cpu_user_s, cpu_sys_s         this process
+  cpu_children_s                reaped subprocesses (grep, git, cargo, ...)
+  peak_rss_kb                   high-water resident set size of this process
+  files_read                    distinct files opened for reading, outside
+                                the interpreter's own installation
+  bytes_read                    read(2) bytes incl. pipes (Linux; else null)
+  subprocesses                  processes spawned (Popen, system, spawn)
+  spans                         [{name, start_s, seconds}] from span()
+
+WHY an audit hook rather than wrapping open() or subprocess: the hook sees
+every open and every spawn the process makes -- through pathlib, io, os or a
+library -- without a single gate being edited to route through a wrapper, and
+it cannot be bypassed by a gate that imports `subprocess` directly.
+
+WHY a `sitecustomize` rather than an import in each gate: ~60 entry points,
+many shell-wrapped, would each need the same two lines, and the first one
+forgotten would silently fall out of every profile. Putting
+scripts/gate_profile_site on PYTHONPATH installs this in every Python process
+started under it, which is how run-gate-coverage.py --profile uses it. A
+single script can also be run under it directly:
+
+    ALETHEIA_GATE_PROFILE=/tmp/prof python3 scripts/gate_profile.py scripts/check-x.py [args]
+
+Without ALETHEIA_GATE_PROFILE nothing is installed, and span() is a no-op, so
+gates may mark phases unconditionally.
+"""
+
+from __future__ import annotations
+
+import atexit
+import contextlib
+import json
+import os
+import resource
+import runpy
+import sys
+import time
+from collections.abc import Iterator
+from pathlib import Path
+
+PROFILE_ENV = "ALETHEIA_GATE_PROFILE"
+SITE_DIR = Path(__file__).resolve().parent / "gate_profile_site"
+
+
+class _Recorder:
+    def __init__(self, out_dir: Path) -> None:
+        self.out_dir = out_dir
+        self.started = time.monotonic()
+        self.rchar_at_start = _proc_self("io", b"rchar:")
+        self.files_read: set[str] = set()
+        self.subprocesses = 0
+        self.spans: list[dict] = []
+        self.ignored_prefixes = tuple(
+            {str(Path(p).resolve()) + os.sep for p in (sys.prefix, sys.base_prefix, sys.exec_prefix)}
+        )
+
+    def audit(self, event: str, args: tuple) -> None:
+        if event == "open":
+            path, mode, flags = args
+            if not isinstance(path, (str, bytes, os.PathLike)):
+                return  # an already-open descriptor
+            if mode is not None:
+                reading = "r" in mode and "+" not in mode
+            else:
+                reading = (flags or 0) & (os.O_WRONLY | os.O_RDWR) == 0
+            if not reading:
+                return
+            path = os.fsdecode(path)
+            if path.endswith(".pyc") or os.path.abspath(path).startswith(self.ignored_prefixes):
+                return
+            self.files_read.add(os.path.abspath(path))
+        elif event in ("subprocess.Popen", "os.system", "os.posix_spawn", "os.spawn", "os.fork"):
+            self.subprocesses += 1
+
+    def record(self) -> dict:
+        own = resource.getrusage(resource.RUSAGE_SELF)
+        children = resource.getrusage(resource.RUSAGE_CHILDREN)
+        peak_kb = _proc_self("status", b"VmHWM:")
+        if peak_kb is None:
+            # ru_maxrss is KiB on Linux and bytes on macOS.
+            peak_kb = own.ru_maxrss // 1024 if sys.platform == "darwin" else own.ru_maxrss
+        rchar = _proc_self("io", b"rchar:")
+        return {
+            "script": sys.argv[0] if sys.argv else "",
+            "argv": sys.argv[1:],
+            "pid": os.getpid(),
+            "ppid": os.getppid(),
+            "wall_s": round(time.monotonic() - self.started, 4),
+            "cpu_user_s": round(own.ru_utime, 4),
+            "cpu_sys_s": round(own.ru_stime, 4),
+            "cpu_children_s": round(children.ru_utime + children.ru_stime, 4),
+            "peak_rss_kb": peak_kb,
+            "files_read": len(self.files_read),
+            "bytes_read": (
+                rchar - self.rchar_at_start
+                if rchar is not None and self.rchar_at_start is not None
+                else None
+            ),
+            "subprocesses": self.subprocesses,
+            "spans": self.spans,
+        }
+
+    def write(self) -> None:
+        try:
+            self.out_dir.mkdir(parents=True, exist_ok=True)
+            name = f"{time.time_ns()}-{os.getpid()}.json"
+            (self.out_dir / name).write_text(json.dumps(self.record(), sort_keys=True) + "\n")
+        except OSError:
+            pass  # profiling must never be the reason a gate fails
+
+
+def _proc_self(name: str, field: bytes) -> int | None:
+    """One numeric field of /proc/self/<name>, or None off Linux.
+
+    WHY VmHWM rather than ru_maxrss where both exist: Linux carries ru_maxrss
+    across exec, so a gate started by a 140MB parent reports 140MB however
+    little it used itself. VmHWM belongs to the address space and starts over.
+    """
+    try:
+        with open(f"/proc/self/{name}", "rb") as fh:
+            for line in fh:
+                if line.startswith(field):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return None
+
+
+_RECORDER: _Recorder | None = None
+
+
+def install() -> bool:
+    """Start recording this process if ALETHEIA_GATE_PROFILE is set; idempotent."""
+    global _RECORDER
+    if _RECORDER is not None:
+        return True
+    out_dir = os.environ.get(PROFILE_ENV)
+    if not out_dir:
+        return False
+    _RECORDER = _Recorder(Path(out_dir))
+    sys.addaudithook(_RECORDER.audit)
+    atexit.register(_RECORDER.write)
+    return True
+
+
+@contextlib.contextmanager
+def span(name: str) -> Iterator[None]:
+    """Mark a named phase of the current run; free when not profiling."""
+    recorder = _RECORDER
+    if recorder is None:
+        yield
+        return
+    started = time.monotonic()
+    try:
+        yield
+    finally:
+        recorder.spans.append(
+            {
+                "name": name,
+                "start_s": round(started - recorder.started, 4),
+                "seconds": round(time.monotonic() - started, 4),
+            }
+        )
+
+
+def load_records(directory: Path) -> list[dict]:
+    """Every record under `directory`; an unreadable one is skipped, not fatal."""
+    records = []
+    for path in sorted(directory.rglob("*.json")):
+        try:
+            records.append(json.loads(path.read_text()))
+        except (OSError, ValueError):
+            continue
+    return records
+
+
+def site_env(env: dict[str, str], out_dir: Path) -> dict[str, str]:
+    """`env` with profiling switched on for every Python process started under it."""
+    python_path = os.pathsep.join(p for p in (str(SITE_DIR), env.get("PYTHONPATH", "")) if p)
+    return {**env, PROFILE_ENV: str(out_dir), "PYTHONPATH": python_path}
+
+
+def main() -> int:
+    if len(sys.argv) < 2:
+        print(__doc__, file=sys.stderr)
+        return 2
+    if sys.argv[1] in ("-h", "--help"):
+        print(__doc__)
+        return 0
+    script = sys.argv[1]
+    sys.argv = sys.argv[1:]
+    sys.path.insert(0, str(Path(script).resolve().parent))
+    # The script's own `import gate_profile` must find this recorder, not a
+    # second, never-installed copy of the module.
+    sys.modules["gate_profile"] = sys.modules[__name__]
+    install()
+    runpy.run_path(script, run_name="__main__")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
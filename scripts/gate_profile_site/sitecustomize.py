@@ -0,0 +1,26 @@
+"""Install gate_profile in every Python process started with this directory on
+PYTHONPATH (see scripts/gate_profile.py).
+
+WHY it then runs the next `sitecustomize` on the path: a distribution may ship
+its own, and taking PYTHONPATH's first slot must not silently disable it.
+"""
+
+import importlib.machinery
+import importlib.util
+import sys
+from pathlib import Path
+
+_HERE = Path(__file__).resolve().parent
+_spec = importlib.util.spec_from_file_location("gate_profile", _HERE.parent / "gate_profile.py")
+if _spec is not None and _spec.loader is not None:
+    _module = importlib.util.module_from_spec(_spec)
+    sys.modules["gate_profile"] = _module
+    _spec.loader.exec_module(_module)
+    _module.install()
+
+_next = importlib.machinery.PathFinder.find_spec(
+    "sitecustomize", [p for p in sys.path if p and Path(p).resolve() != _HERE]
+)
+if _next is not None and _next.loader is not None:
+    _chained = importlib.util.module_from_spec(_next)
+    _next.loader.exec_module(_chained)
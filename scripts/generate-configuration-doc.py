@@ -36,6 +36,10 @@ import sys
 from dataclasses import dataclass, field
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import rust_source_index  # noqa: E402
+
 REPO_ROOT = Path(__file__).resolve().parent.parent
 CONFIG_DIR = REPO_ROOT / "crates" / "taxis" / "src" / "config"
 DOC_PATH = REPO_ROOT / "docs" / "CONFIGURATION.md"
@@ -314,7 +318,7 @@ _FILE_CACHE: dict[Path, str] = {}
 
 def read_file(path: Path) -> str:
     if path not in _FILE_CACHE:
-        raw = path.read_text(encoding="utf-8")
+        raw = rust_source_index.read_text(path, REPO_ROOT)
         _FILE_CACHE[path] = normalize_attrs(strip_trailing_comments(raw))
     return _FILE_CACHE[path]
 
@@ -376,7 +380,7 @@ def build_repo_type_index() -> dict[tuple[str, str], Path]:
         if f.name.endswith("_tests.rs") or "tests" in f.parts:
             continue
         try:
-            raw = f.read_text(encoding="utf-8")
+            raw = rust_source_index.read_text(f, REPO_ROOT)
         except (UnicodeDecodeError, OSError):
             continue
         for m in _REPO_ITEM_RE.finditer(raw):
@@ -0,0 +1,189 @@
+"""Batched GitHub issue lookups for the gates, with an on-disk TTL cache.
+
+krites-tethers-remaining.py and check-egress-send-sites.py each ask GitHub
+about a handful of issues. Asked one `gh issue view` at a time -- plus, for
+the tethers report, a second GraphQL call per issue for its close timeline --
+a run paid a network round trip per question. `fetch` asks for every number
+at once: one `gh api graphql` query with an aliased `issue(number: N)` field
+per number, each selecting everything either consumer reads.
+
+Answers are kept in gate_cache.py's directory with the time they were
+fetched. A caller passes the age it will accept: the egress check takes a
+few minutes' staleness, while the tethers report, which promises a live
+measurement, passes `max_age=0` and only ever benefits from the batching.
+Nothing older is ever served: when GitHub cannot be reached, `fetch` raises
+and the caller decides what an outage means.
+
+`ALETHEIA_GH_FIXTURE` names a JSON file of `{"<number>": <issue node or
+null>}` that stands in for GitHub, so tests (and offline reproductions of a
+CI run) exercise the same parsing and caching without `gh` or a network.
+A missing fixture file reads as GitHub being unreachable.
+
+An issue node is GraphQL's shape, not `gh issue view --json`'s: labels and
+closing pull requests sit under `nodes`, e.g. `labels.nodes[].name`.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Any
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import gate_cache  # noqa: E402
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+GH_REPO = "forkwright/aletheia"
+CACHE_NAME = "gh-issues"
+CACHE_FILE = "issues.json"
+FIXTURE_ENV = "ALETHEIA_GH_FIXTURE"
+DEFAULT_MAX_AGE = 600.0
+TIMEOUT_SECONDS = 30
+# Aliased fields per query. GitHub's limits are on nodes, not fields, and the
+# timeline's `last:100` dominates; 50 issues stays far inside them.
+BATCH_SIZE = 50
+
+ISSUE_FIELDS = """
+number
+state
+stateReason
+labels(first:100){nodes{name}}
+closedByPullRequestsReferences(first:100){nodes{number url}}
+timelineItems(itemTypes:[CLOSED_EVENT,REOPENED_EVENT],last:100){
+  totalCount
+  nodes{
+    __typename
+    ... on ClosedEvent{
+      createdAt
+      closer{
+        __typename
+        ... on PullRequest{url state merged mergedAt}
+      }
+    }
+    ... on ReopenedEvent{createdAt}
+  }
+}
+""".strip()
+
+
+class GhError(RuntimeError):
+    """GitHub could not be asked, or answered something that is not an answer."""
+
+
+def batch_query(numbers: list[int]) -> str:
+    fields = " ".join(f"i{number}:issue(number:{number}){{...issueFields}}" for number in numbers)
+    return (
+        "query($owner:String!,$repo:String!){repository(owner:$owner,name:$repo){"
+        f"{fields}}}}}\nfragment issueFields on Issue{{\n{ISSUE_FIELDS}\n}}"
+    )
+
+
+def _query_fixture(path: Path, numbers: list[int]) -> dict[int, dict[str, Any] | None]:
+    try:
+        fixture = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError) as exc:
+        raise GhError(f"{FIXTURE_ENV}={path} cannot stand in for GitHub: {exc}") from exc
+    return {number: fixture.get(str(number)) for number in numbers}
+
+
+def _query_github(repo: str, numbers: list[int]) -> dict[int, dict[str, Any] | None]:
+    owner, name = repo.split("/", 1)
+    try:
+        result = subprocess.run(
+            [
+                "gh",
+                "api",
+                "graphql",
+                "-f",
+                f"query={batch_query(numbers)}",
+                "-F",
+                f"owner={owner}",
+                "-F",
+                f"repo={name}",
+            ],
+            capture_output=True,
+            text=True,
+            timeout=TIMEOUT_SECONDS,
+            check=False,
+        )
+    except (OSError, subprocess.TimeoutExpired) as exc:
+        raise GhError(f"gh api graphql failed to run: {exc}") from exc
+    # WHY parse before looking at the exit code: a number that is not an
+    # issue makes GitHub answer `null` for its alias plus an `errors` entry,
+    # and gh exits 1 for that -- the other issues' answers are still good.
+    try:
+        payload = json.loads(result.stdout)
+        repository = payload["data"]["repository"]
+    except (ValueError, KeyError, TypeError) as exc:
+        raise GhError(
+            f"gh api graphql exited {result.returncode} without an answer: "
+            f"{result.stderr.strip() or exc}"
+        ) from exc
+    if not isinstance(repository, dict):
+        raise GhError(f"gh api graphql found no repository {repo}: {payload.get('errors')}")
+    return {number: repository.get(f"i{number}") for number in numbers}
+
+
+def _query(repo: str, numbers: list[int]) -> dict[int, dict[str, Any] | None]:
+    fixture = os.environ.get(FIXTURE_ENV)
+    if fixture:
+        return _query_fixture(Path(fixture), numbers)
+    found: dict[int, dict[str, Any] | None] = {}
+    for start in range(0, len(numbers), BATCH_SIZE):
+        found.update(_query_github(repo, numbers[start : start + BATCH_SIZE]))
+    return found
+
+
+def _store() -> Path | None:
+    store_dir = gate_cache.cache_dir(REPO_ROOT, CACHE_NAME)
+    return store_dir / CACHE_FILE if store_dir is not None else None
+
+
+def _load_store(store: Path | None) -> dict[str, Any]:
+    if store is None:
+        return {}
+    try:
+        payload = json.loads(store.read_bytes())
+    except (OSError, ValueError):
+        return {}
+    return payload if isinstance(payload, dict) else {}
+
+
+def fetch(
+    numbers: list[int], *, repo: str = GH_REPO, max_age: float = DEFAULT_MAX_AGE
+) -> dict[int, dict[str, Any] | None]:
+    """number -> issue node (None: GitHub says there is no such issue).
+
+    Answers younger than `max_age` seconds come from the cache; the rest are
+    asked in one query and cached. Raises GhError when that query fails, so
+    an outage is never mistaken for an answer.
+    """
+    store = _store()
+    entries = _load_store(store)
+    now = time.time()
+    found: dict[int, dict[str, Any] | None] = {}
+    missing: list[int] = []
+    for number in sorted(set(numbers)):
+        entry = entries.get(f"{repo}#{number}")
+        if isinstance(entry, dict) and now - entry.get("fetched_at", 0) < max_age:
+            found[number] = entry.get("issue")
+        else:
+            missing.append(number)
+    if not missing:
+        return found
+
+    fetched = _query(repo, missing)
+    found.update(fetched)
+    if store is not None:
+        for number, issue in fetched.items():
+            entries[f"{repo}#{number}"] = {"fetched_at": now, "issue": issue}
+        try:
+            gate_cache.write_atomic(store, json.dumps(entries, sort_keys=True).encode())
+        except OSError:
+            pass  # an unwritable cache costs the next run a round trip, never this one its answer
+    return found
@@ -141,6 +141,7 @@ from typing import NoReturn
 
 sys.path.insert(0, str(Path(__file__).resolve().parent))
 
+import gh_issues  # noqa: E402
 from krites_provenance_lib import (
     KRITES_DIR,
     LEDGER_PATH,
@@ -260,30 +261,6 @@ class IssueStatus:
     merged_closing_refs: tuple[str, ...] = field(default_factory=tuple)
 
 
-_ISSUE_CLOSURE_TIMELINE_QUERY = """
-query($owner:String!,$repo:String!,$number:Int!){
-  repository(owner:$owner,name:$repo){
-    issue(number:$number){
-      timelineItems(itemTypes:[CLOSED_EVENT,REOPENED_EVENT],last:100){
-        totalCount
-        nodes{
-          __typename
-          ... on ClosedEvent{
-            createdAt
-            closer{
-              __typename
-              ... on PullRequest{url state merged mergedAt}
-            }
-          }
-          ... on ReopenedEvent{createdAt}
-        }
-      }
-    }
-  }
-}
-""".strip()
-
-
 def _merged_current_closer(payload: dict) -> tuple[str, ...]:
     """Return the PR only when it owns the issue's current close event."""
     try:
@@ -580,113 +557,52 @@ def line_4_no_gate_test(rows: list[dict]) -> Line:
     )
 
 
-def _gh_issue_status(number: int) -> IssueStatus | None:
+def _issue_status(number: int, issue: dict | None) -> IssueStatus | None:
     """Return live issue state plus the PR, if any, owning its current close.
 
     ``closedByPullRequestsReferences`` is retained only as reviewer context;
     the GraphQL ClosedEvent/ReopenedEvent timeline owns causal completion.
     None means a query/proof failure and must never read as zero or resolved.
     """
-    try:
-        result = subprocess.run(
-            [
-                "gh",
-                "issue",
-                "view",
-                str(number),
-                "--repo",
-                GH_REPO,
-                "--json",
-                "state,stateReason,labels,closedByPullRequestsReferences",
-            ],
-            capture_output=True,
-            text=True,
-            timeout=30,
-            check=False,
-        )
-    except (OSError, subprocess.TimeoutExpired) as exc:
-        print(
-            f"gh issue view {number} --repo {GH_REPO} failed to run: {exc}",
-            file=sys.stderr,
-        )
-        return None
-    if result.returncode != 0:
-        print(
-            f"gh issue view {number} --repo {GH_REPO} exited {result.returncode}: "
-            f"{result.stderr.strip()}",
-            file=sys.stderr,
-        )
+    if issue is None:
+        print(f"gh issue query for #{number} in {GH_REPO} found no such issue", file=sys.stderr)
         return None
     try:
-        payload = json.loads(result.stdout)
-    except json.JSONDecodeError as exc:
-        print(
-            f"gh issue view {number} --repo {GH_REPO} returned unparsable JSON: {exc}",
-            file=sys.stderr,
-        )
-        return None
-    labels = tuple(
-        sorted(entry.get("name", "") for entry in payload.get("labels") or [])
-    )
-    # NOTE: gh's closedByPullRequestsReferences nests {name, owner: {login}},
-    # not a flattened nameWithOwner -- url is already the fully-qualified,
-    # always-correct form and needs no reassembly.
-    refs = tuple(
-        ref.get("url", f"#{ref.get('number')}")
-        for ref in payload.get("closedByPullRequestsReferences") or []
-    )
-    owner, repo = GH_REPO.split("/", 1)
-    try:
-        timeline_result = subprocess.run(
-            [
-                "gh",
-                "api",
-                "graphql",
-                "-f",
-                f"query={_ISSUE_CLOSURE_TIMELINE_QUERY}",
-                "-F",
-                f"owner={owner}",
-                "-F",
-                f"repo={repo}",
-                "-F",
-                f"number={number}",
-            ],
-            capture_output=True,
-            text=True,
-            timeout=30,
-            check=False,
-        )
-    except (OSError, subprocess.TimeoutExpired) as exc:
-        print(
-            f"gh closure timeline query for #{number} failed to run: {exc}",
-            file=sys.stderr,
-        )
-        return None
-    if timeline_result.returncode != 0:
-        print(
-            f"gh closure timeline query for #{number} exited "
-            f"{timeline_result.returncode}: {timeline_result.stderr.strip()}",
-            file=sys.stderr,
-        )
-        return None
-    try:
-        timeline_payload = json.loads(timeline_result.stdout)
-        merged_refs = _merged_current_closer(timeline_payload)
-    except (json.JSONDecodeError, TypeError, ValueError) as exc:
-        print(
-            f"gh closure timeline query for #{number} was invalid: {exc}",
-            file=sys.stderr,
+        labels = tuple(sorted(entry.get("name", "") for entry in issue["labels"]["nodes"]))
+        # NOTE: url is already the fully-qualified, always-correct form and
+        # needs no reassembly from the PR's repository owner and name.
+        refs = tuple(
+            ref.get("url", f"#{ref.get('number')}")
+            for ref in issue["closedByPullRequestsReferences"]["nodes"]
         )
+        merged_refs = _merged_current_closer({"data": {"repository": {"issue": issue}}})
+    except (AttributeError, KeyError, TypeError, ValueError) as exc:
+        print(f"gh issue query for #{number} was invalid: {exc}", file=sys.stderr)
         return None
     return IssueStatus(
-        state=payload.get("state"),
-        state_reason=payload.get("stateReason") or None,
+        state=issue.get("state"),
+        state_reason=issue.get("stateReason") or None,
         labels=labels,
         closing_refs=refs,
         merged_closing_refs=merged_refs,
     )
 
 
+def _gh_issue_statuses(numbers: list[int]) -> dict[int, IssueStatus | None]:
+    """Every number's status from one batched GraphQL round trip.
+
+    WHY max_age=0: line 5 promises a live measurement, so the shared cache
+    only ever records this run's answers for other readers; it never
+    answers for GitHub here. An outage fails every number, never a guess.
+    """
+    try:
+        issues = gh_issues.fetch(numbers, repo=GH_REPO, max_age=0)
+    except gh_issues.GhError as exc:
+        print(f"gh issue query for {sorted(set(numbers))} failed: {exc}", file=sys.stderr)
+        return {number: None for number in numbers}
+    return {number: _issue_status(number, issues.get(number)) for number in numbers}
+
+
 def _issue_disposition(status: IssueStatus) -> str:
     # WHY a not_planned close is 'unresolved': GitHub's bare CLOSED bit
     # conflates "fixed" with "declined to fix". A wontfix close is exactly
@@ -746,7 +662,9 @@ def _original_tracked_issue_numbers() -> frozenset[int]:
     return frozenset(int(tok) for tok in match.group(1).split(",") if tok.strip())
 
 
-def _validate_tracked_issue_removals() -> list[int]:
+def _validate_tracked_issue_removals(
+    removed: list[int], statuses: dict[int, IssueStatus | None]
+) -> list[int]:
     """Every issue number present in TRACKED_ISSUES_ANCHOR_COMMIT's tuple but
     absent from TRACKED_MECHANISM_ISSUES today must be independently
     verified, via a live gh query, to be CLOSED with stateReason COMPLETED and
@@ -756,12 +674,9 @@ def _validate_tracked_issue_removals() -> list[int]:
     state, same as any other gh outage); refuses outright the moment a
     removed member is confirmed NOT legitimately closed, since that is a
     positively-confirmed tamper, not an unmeasured state."""
-    original = _original_tracked_issue_numbers()
-    current = set(TRACKED_MECHANISM_ISSUES)
-    removed = sorted(original - current)
     failed: list[int] = []
     for number in removed:
-        status = _gh_issue_status(number)
+        status = statuses[number]
         if status is None:
             failed.append(number)
             continue
@@ -778,17 +693,19 @@ def _validate_tracked_issue_removals() -> list[int]:
 
 
 def line_5_open_mechanism_issues() -> Line:
-    removal_query_failed = _validate_tracked_issue_removals()
+    removed = sorted(_original_tracked_issue_numbers() - set(TRACKED_MECHANISM_ISSUES))
+    fetched = _gh_issue_statuses(sorted({*removed, *TRACKED_MECHANISM_ISSUES}))
+    removal_query_failed = _validate_tracked_issue_removals(removed, fetched)
 
     statuses: dict[int, IssueStatus | None] = {
-        n: _gh_issue_status(n) for n in TRACKED_MECHANISM_ISSUES
+        n: fetched[n] for n in TRACKED_MECHANISM_ISSUES
     }
     failed = sorted(removal_query_failed)
     failed += sorted(n for n, s in statuses.items() if s is None)
     source = (
-        f"gh issue view <N> --repo {GH_REPO} --json state,stateReason,labels,"
-        "closedByPullRequestsReferences plus the issue's ClosedEvent/ReopenedEvent "
-        f"GraphQL timeline, for N in {TRACKED_MECHANISM_ISSUES}; every number present "
+        f"one batched gh api graphql query of {GH_REPO} for each issue's state, "
+        "stateReason, labels, closedByPullRequestsReferences and ClosedEvent/ReopenedEvent "
+        f"timeline, for N in {TRACKED_MECHANISM_ISSUES}; every number present "
         f"in commit {TRACKED_ISSUES_ANCHOR_COMMIT[:12]}'s tuple but absent from it "
         "today is verified CLOSED+COMPLETED with a merged PR owning the current "
         "close event before this line runs"
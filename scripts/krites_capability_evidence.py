@@ -14,7 +14,6 @@ from __future__ import annotations
 import ast
 import json
 import re
-from pathlib import Path
 from typing import TextIO
 
 # WHY a depth cap rather than a visited-file set: `#[path]` legitimately reaches
@@ -538,26 +537,6 @@ def _read_attribute(text: str, pos: int) -> tuple[int, int, int, bool] | None:
     return None
 
 
-def _module_dir(file_path: Path, is_target_root: bool) -> Path:
-    """The directory `mod x;` inside `file_path` resolves against."""
-    if is_target_root or file_path.name == "mod.rs":
-        return file_path.parent
-    return file_path.parent / file_path.stem
-
-
-def _resolve_mod_file(base_dir: Path, name: str, path_attr: str | None) -> Path | None:
-    if path_attr is not None:
-        candidate = (base_dir / path_attr).resolve()
-        return candidate if candidate.is_file() else None
-    flat = base_dir / f"{name}.rs"
-    if flat.is_file():
-        return flat
-    nested = base_dir / name / "mod.rs"
-    if nested.is_file():
-        return nested
-    return None
-
-
 def _path_attr(attrs: list[str]) -> str | None:
     for a in attrs:
         clean_full = strip_noise(a)
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import bisect
 import difflib
 import pathlib
 import re
@@ -454,20 +455,100 @@ def nonblank_lines(text: str) -> list[str]:
 MIN_MATCH_BLOCK_LINES = 4
 
 
+def _longest_match(
+    grams: list[tuple[str, ...]],
+    starts: list[int],
+    index: dict[tuple[str, ...], list[int]],
+    width: int,
+    alo: int,
+    ahi: int,
+    blo: int,
+    bhi: int,
+) -> difflib.Match:
+    """`SequenceMatcher.find_longest_match` over runs of `width`-line windows.
+
+    A common run of L >= width lines is L - width + 1 consecutive matching
+    windows, so this is difflib's own dynamic programme with windows for
+    lines -- including its tie-break (earliest in a, then earliest in b), which
+    the strict `>` below preserves. A rectangle whose longest run is shorter
+    than `width` has no matching window at all and answers size 0.
+    """
+    besti, bestj, bestsize = alo, blo, 0
+    j2len: dict[int, int] = {}
+    previous = -2
+    last_a, last_b = ahi - width, bhi - width
+    for position in range(bisect.bisect_left(starts, alo), bisect.bisect_right(starts, last_a)):
+        i = starts[position]
+        if i != previous + 1:
+            j2len = {}  # the window before i matched nothing, so no run continues into i
+        previous = i
+        candidates = index[grams[i]]
+        newj2len: dict[int, int] = {}
+        for j in candidates[bisect.bisect_left(candidates, blo) : bisect.bisect_right(candidates, last_b)]:
+            k = newj2len[j] = j2len.get(j - 1, 0) + 1
+            if k > bestsize:
+                besti, bestj, bestsize = i - k + 1, j - k + 1, k
+        j2len = newj2len
+    return difflib.Match(besti, bestj, bestsize + width - 1 if bestsize else 0)
+
+
+def matching_blocks(a: list[str], b: list[str], min_size: int = 1) -> list[difflib.Match]:
+    """`SequenceMatcher(None, a, b, autojunk=False).get_matching_blocks()`, blocks >= min_size only.
+
+    WHY not difflib itself: without autojunk its longest-match search visits
+    every pair of equal lines in every rectangle of its recursion, and lines
+    like `}` pair with each other hundreds of times per file -- recomputing
+    the ledger walked about 1.5M such pairs. Two facts make the same answer
+    cheaper:
+
+      - difflib recurses into the rectangles either side of each longest
+        match, and a rectangle's blocks are never longer than its longest
+        match. Once that is below min_size, nothing under it is reported, so
+        the recursion stops there.
+      - a run of >= min_size lines is found from its min_size-line windows,
+        which pair up far more rarely than single lines do.
+
+    With no junk, difflib never has adjacent blocks to merge: a block
+    touching its parent match would have extended it. So the blocks are
+    difflib's, in its order, ending with the same (len(a), len(b), 0)
+    sentinel. min_size=1 is difflib's full answer.
+    """
+    width = max(min_size, 1)
+    grams = list(zip(*(a[k:] for k in range(width))))
+    wanted = set(grams)
+    index: dict[tuple[str, ...], list[int]] = {}
+    for j, gram in enumerate(zip(*(b[k:] for k in range(width)))):
+        if gram in wanted:
+            index.setdefault(gram, []).append(j)
+    starts = [i for i, gram in enumerate(grams) if gram in index]
+
+    blocks: list[difflib.Match] = []
+    queue = [(0, len(a), 0, len(b))]
+    while queue:
+        alo, ahi, blo, bhi = queue.pop()
+        i, j, k = match = _longest_match(grams, starts, index, width, alo, ahi, blo, bhi)
+        if k:
+            blocks.append(match)
+            if alo < i and blo < j:
+                queue.append((alo, i, blo, j))
+            if i + k < ahi and j + k < bhi:
+                queue.append((i + k, ahi, j + k, bhi))
+    blocks.sort()
+    blocks.append(difflib.Match(len(a), len(b), 0))
+    return blocks
+
+
 def verbatim_pct(local_text: str, upstream_text: str | None) -> float:
     local_lines = nonblank_lines(local_text)
     if not local_lines or upstream_text is None:
         return 0.0
     upstream_lines = nonblank_lines(upstream_text)
-    matcher = difflib.SequenceMatcher(None, local_lines, upstream_lines, autojunk=False)
     # NOTE: the floor is capped at the file's own length so a file shorter
     # than MIN_MATCH_BLOCK_LINES that matches upstream in full (a genuine,
     # complete verbatim copy) still scores 100% instead of being floored to
     # 0 by a threshold longer than the file itself.
     floor = min(MIN_MATCH_BLOCK_LINES, len(local_lines))
-    matched = sum(
-        block.size for block in matcher.get_matching_blocks() if block.size >= floor
-    )
+    matched = sum(block.size for block in matching_blocks(local_lines, upstream_lines, floor))
     return round(matched / len(local_lines) * 100, 1)
 
 
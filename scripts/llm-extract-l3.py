@@ -16,16 +16,31 @@ _llm/L3-api-index/<crate_name>.md.
 Also writes _llm/manifest.toml recording generation metadata, source hashes,
 and token estimates per crate.
 
+Regeneration is incremental: every crate's sources are hashed first, and a
+crate whose hash matches its manifest entry keeps its existing markdown and
+token estimate without being parsed. The manifest also records a fingerprint
+of this extractor (its own source and the tree-sitter versions), so editing
+the extractor or upgrading the grammar re-extracts everything, as does
+`--force`.
+
+Crates that do need extracting are parsed on a process pool (--jobs, default
+the CPU count), in batches of files so one large crate spreads across every
+worker. Results are merged back in crate and file order, so the output is
+byte-identical to a --jobs 1 run.
+
 Usage:
-    uv run scripts/llm-extract-l3.py
+    uv run scripts/llm-extract-l3.py [--crates a,b] [--force] [--jobs N]
 """
 
 from __future__ import annotations
 
 import argparse
 import hashlib
+import importlib.metadata
+import os
 import sys
 import tomllib
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass, field
 from datetime import UTC, datetime
 from pathlib import Path
@@ -133,6 +148,7 @@ class CrateIndex:
     modules: list[ModuleSection] = field(default_factory=list)
     source_hash: str = ""
     token_estimate: int = 0
+    reused: bool = False  # markdown kept from an earlier run, not re-extracted
 
 
 # ---------------------------------------------------------------------------
@@ -181,6 +197,43 @@ def workspace_members() -> list[tuple[str, Path]]:
 # ---------------------------------------------------------------------------
 
 
+def read_crate_sources(crate_dir: Path) -> list[tuple[Path, bytes]]:
+    """Every `*.rs` file under `crate_dir` outside `target/`, read once, in render order.
+
+    WHY one read feeds both consumers: the source hash and the extractor each
+    used to walk and read the crate on their own, so every regenerated file
+    was read twice. A file that cannot be read is left out, as both always
+    skipped it.
+    """
+    sources: list[tuple[Path, bytes]] = []
+    for rs_file in sorted(f for f in crate_dir.rglob("*.rs") if "target" not in f.parts):
+        try:
+            sources.append((rs_file, rs_file.read_bytes()))
+        except OSError:
+            continue
+    return sources
+
+
+def hash_sources(crate_dir: Path, sources: list[tuple[Path, bytes]]) -> str:
+    """`hash_crate_sources` over files `read_crate_sources` has already read.
+
+    WHY the files are re-sorted here: `sources` is in Path order, which
+    compares path components, and the contract sorts the relative POSIX
+    strings. The two disagree whenever a name sorts below `/` -- `a-b/x.rs`
+    is after `a/x.rs` by components and before it as a string -- and in that
+    case nous computed a different hash and skipped the crate's L3 section
+    as stale on every bootstrap.
+    """
+    h = hashlib.sha256()
+    for rel_posix, content in sorted(
+        ((rs_file.relative_to(crate_dir).as_posix(), content) for rs_file, content in sources),
+        key=lambda entry: entry[0],
+    ):
+        h.update(rel_posix.encode())
+        h.update(content)
+    return h.hexdigest()
+
+
 def hash_crate_sources(crate_dir: Path) -> str:
     """SHA-256 of all .rs files in a crate, sorted by crate-relative POSIX path.
 
@@ -191,18 +244,7 @@ def hash_crate_sources(crate_dir: Path) -> str:
     contract implemented by `compute_crate_source_hash` in
     `crates/nous/src/bootstrap/mod.rs`.
     """
-    h = hashlib.sha256()
-    rs_files = sorted(
-        f for f in crate_dir.rglob("*.rs") if "target" not in f.parts
-    )
-    for rs_file in rs_files:
-        try:
-            content = rs_file.read_bytes()
-        except OSError:
-            continue
-        h.update(rs_file.relative_to(crate_dir).as_posix().encode())
-        h.update(content)
-    return h.hexdigest()
+    return hash_sources(crate_dir, read_crate_sources(crate_dir))
 
 
 # ---------------------------------------------------------------------------
@@ -523,12 +565,18 @@ def walk_items(
 # ---------------------------------------------------------------------------
 
 
-def extract_from_file(rs_path: Path, crate_dir: Path) -> ModuleSection | None:
-    """Parse one .rs file and return a ModuleSection (or None if nothing public)."""
-    try:
-        source_bytes = rs_path.read_bytes()
-    except OSError:
-        return None
+def extract_from_file(
+    rs_path: Path, crate_dir: Path, source_bytes: bytes | None = None
+) -> ModuleSection | None:
+    """Parse one .rs file and return a ModuleSection (or None if nothing public).
+
+    `source_bytes` is the file's content when the caller has already read it.
+    """
+    if source_bytes is None:
+        try:
+            source_bytes = rs_path.read_bytes()
+        except OSError:
+            return None
 
     tree = _PARSER.parse(source_bytes)
     items = walk_items(tree.root_node, source_bytes)
@@ -560,27 +608,148 @@ def _is_library_source(rs_file: Path, crate_dir: Path) -> bool:
     return rs_file.relative_to(crate_dir).parts[0] not in _NON_LIBRARY_TOP_LEVEL_DIRS
 
 
-def extract_crate(crate_name: str, crate_dir: Path) -> CrateIndex:
-    """Extract all public items from a crate's .rs files."""
+def _library_sources(
+    crate_dir: Path, sources: list[tuple[Path, bytes]]
+) -> list[tuple[Path, bytes]]:
+    """The crate's library files among `sources`, in the order their sections are rendered."""
+    return [(f, content) for f, content in sources if _is_library_source(f, crate_dir)]
+
+
+def _extract_batch(crate_dir: Path, batch: list[tuple[Path, bytes]]) -> list[ModuleSection]:
+    """The non-empty sections of `batch`, in order; one unit of pool work."""
+    sections: list[ModuleSection] = []
+    for rs_file, content in batch:
+        section = extract_from_file(rs_file, crate_dir, content)
+        if section:
+            sections.append(section)
+    return sections
+
+
+def extract_crate(
+    crate_name: str,
+    crate_dir: Path,
+    source_hash: str | None = None,
+    sources: list[tuple[Path, bytes]] | None = None,
+) -> CrateIndex:
+    """Extract all public items from a crate's .rs files.
+
+    `sources` is the crate's `read_crate_sources` and `source_hash` their
+    hash, when the caller has already computed them.
+    """
     idx = CrateIndex(
         name=crate_name,
         path=crate_dir.relative_to(REPO_ROOT).as_posix(),
     )
 
-    rs_files = sorted(
-        f
-        for f in crate_dir.rglob("*.rs")
-        if "target" not in f.parts and _is_library_source(f, crate_dir)
-    )
-    for rs_file in rs_files:
-        section = extract_from_file(rs_file, crate_dir)
-        if section:
-            idx.modules.append(section)
-
-    idx.source_hash = hash_crate_sources(crate_dir)
+    if sources is None:
+        sources = read_crate_sources(crate_dir)
+    idx.modules = _extract_batch(crate_dir, _library_sources(crate_dir, sources))
+    idx.source_hash = source_hash if source_hash is not None else hash_sources(crate_dir, sources)
     return idx
 
 
+# Files per unit of --jobs work. Small enough that the largest crates (krites
+# is several hundred files) spread across every worker; large enough that
+# shipping a batch's sections back costs little next to parsing it.
+_BATCH_FILES = 32
+
+
+def _init_worker() -> None:
+    """Give each pool worker a tree-sitter Parser of its own."""
+    global _PARSER
+    _PARSER = Parser(_LANG)
+
+
+def extract_crates(
+    pending: list[tuple[str, Path, str, list[tuple[Path, bytes]]]], jobs: int
+) -> list[CrateIndex]:
+    """`extract_crate` for every (name, dir, source_hash, sources), `jobs` processes at a time.
+
+    WHY batches of files rather than whole crates: crate sizes are skewed, and
+    with one task per crate the run would wait on krites alone. The batches
+    are submitted, and their sections appended, in crate and file order, so
+    the result is the one a serial run builds.
+    """
+    batches: list[tuple[int, Path, list[tuple[Path, bytes]]]] = []
+    for i, (_, crate_dir, _, sources) in enumerate(pending):
+        files = _library_sources(crate_dir, sources)
+        batches += [(i, crate_dir, files[n : n + _BATCH_FILES]) for n in range(0, len(files), _BATCH_FILES)]
+    if jobs <= 1 or len(batches) <= 1:
+        return [extract_crate(*crate) for crate in pending]
+
+    indices = [
+        CrateIndex(name=name, path=crate_dir.relative_to(REPO_ROOT).as_posix(), source_hash=source_hash)
+        for name, crate_dir, source_hash, _ in pending
+    ]
+    with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker) as pool:
+        futures = [(i, pool.submit(_extract_batch, crate_dir, files)) for i, crate_dir, files in batches]
+        for i, future in futures:
+            indices[i].modules.extend(future.result())
+    return indices
+
+
+# ---------------------------------------------------------------------------
+# Incremental regeneration
+# ---------------------------------------------------------------------------
+
+
+def extractor_fingerprint() -> str:
+    """SHA-256 of what, besides a crate's sources, decides its L3 markdown.
+
+    WHY: the per-crate source hash says nothing about the extractor. Without
+    this, a fix to the extractor would leave every unchanged crate rendered
+    by the old one until someone remembered `--force`.
+    """
+    h = hashlib.sha256(Path(__file__).read_bytes())
+    for dist in ("tree-sitter", "tree-sitter-rust"):
+        try:
+            version = importlib.metadata.version(dist)
+        except importlib.metadata.PackageNotFoundError:
+            version = "unknown"
+        h.update(f"\0{dist}={version}".encode())
+    return h.hexdigest()
+
+
+def recorded_fingerprint() -> str | None:
+    """The extractor fingerprint the existing manifest was written with."""
+    levels = _read_existing_toml().get("levels")
+    l3 = levels.get("L3") if isinstance(levels, dict) else None
+    value = l3.get("extractor_fingerprint") if isinstance(l3, dict) else None
+    return value if isinstance(value, str) else None
+
+
+def reuse_crate(
+    crate_name: str,
+    crate_dir: Path,
+    source_hash: str,
+    existing: dict[str, dict[str, object]],
+) -> CrateIndex | None:
+    """The crate's previous L3 index when its sources are unchanged, else None.
+
+    The markdown on disk must still be the one the manifest describes: its
+    title names the crate and its token estimate is the recorded one. A file
+    deleted or edited since is regenerated rather than trusted.
+    """
+    entry = existing.get(crate_name)
+    path = crate_dir.relative_to(REPO_ROOT).as_posix()
+    if entry is None or entry.get("source_hash") != source_hash or entry.get("path") != path:
+        return None
+    token_estimate = entry.get("l3_token_estimate")
+    try:
+        md = (L3_DIR / f"{crate_name}.md").read_text(encoding="utf-8")
+    except OSError:
+        return None
+    if not md.startswith(f"# L3 API Index: {crate_name}\n") or estimate_tokens(md) != token_estimate:
+        return None
+    return CrateIndex(
+        name=crate_name,
+        path=path,
+        source_hash=source_hash,
+        token_estimate=token_estimate,
+        reused=True,
+    )
+
+
 # ---------------------------------------------------------------------------
 # Rendering
 # ---------------------------------------------------------------------------
@@ -697,12 +866,16 @@ def write_manifest(
     crate_indices: list[CrateIndex],
     generated_at: str,
     merge: bool = False,
+    fingerprint: str | None = None,
 ) -> None:
     """Write _llm/manifest.toml.
 
     If *merge* is True, preserve unmodified crate entries from the existing
     manifest and only overwrite the crates present in *crate_indices*.
 
+    *fingerprint* is recorded as the extractor every entry was produced by;
+    without one, the next run trusts no entry and re-extracts every crate.
+
     Hand-authored `[levels.L1]`, `[levels.L2]`, `[l1]`, and `[[l2]]` sections
     from the existing manifest (Phase 2 of the multi-resolution plan) are
     preserved on every regeneration so the script does not silently erase
@@ -779,6 +952,7 @@ def write_manifest(
         'generator = "scripts/llm-extract-l3.py"',
         'source_hash_algorithm = "sha256"',
         "source_hash_version = 1",
+        *([f'extractor_fingerprint = "{fingerprint}"'] if fingerprint is not None else []),
         "",
     ])
 
@@ -817,13 +991,16 @@ def print_summary(crate_indices: list[CrateIndex]) -> None:
     high_token_crates: list[tuple[str, int]] = []
 
     for idx in crate_indices:
-        item_count = sum(len(m.items) for m in idx.modules)
-        file_count = len(idx.modules)
-        total_items += item_count
         total_tokens += idx.token_estimate
-
         marker = " !" if idx.token_estimate > high_token_threshold else ""
-        print(f"  {idx.name:<28} {item_count:>6} {idx.token_estimate:>7} {file_count:>6}{marker}")
+        if idx.reused:
+            # Not parsed this run, so there are no item or file counts to show.
+            print(f"  {idx.name:<28} {'-':>6} {idx.token_estimate:>7} {'-':>6}{marker}  (unchanged)")
+        else:
+            item_count = sum(len(m.items) for m in idx.modules)
+            file_count = len(idx.modules)
+            total_items += item_count
+            print(f"  {idx.name:<28} {item_count:>6} {idx.token_estimate:>7} {file_count:>6}{marker}")
 
         if idx.token_estimate > high_token_threshold:
             high_token_crates.append((idx.name, idx.token_estimate))
@@ -855,7 +1032,20 @@ def main() -> int:
         default="",
         help='Comma-separated list of crate names to regenerate. If omitted, all crates are processed.',
     )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Re-extract every selected crate, even those whose source hash is unchanged.",
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Processes to parse with (default: CPU count; 1 parses in this process).",
+    )
     args = parser.parse_args()
+    if args.jobs < 1:
+        parser.error("--jobs must be at least 1")
 
     L3_DIR.mkdir(parents=True, exist_ok=True)
 
@@ -885,16 +1075,43 @@ def main() -> int:
     else:
         print(f"Extracting L3 API index for {len(members)} workspace crates...")
 
+    # WHY the fingerprint gates reuse as a whole: an entry is only as current
+    # as the extractor that wrote it. A --crates run under a changed extractor
+    # leaves the other entries stale, so it records no fingerprint and the
+    # next run re-extracts everything.
+    fingerprint = extractor_fingerprint()
+    same_extractor = recorded_fingerprint() == fingerprint
+    existing = read_existing_manifest() if same_extractor and not args.force else {}
+
+    slots: list[CrateIndex | None] = []
+    pending: list[tuple[str, Path, str, list[tuple[Path, bytes]]]] = []
     for crate_name, crate_dir in members:
-        idx = extract_crate(crate_name, crate_dir)
+        sources = read_crate_sources(crate_dir)
+        source_hash = hash_sources(crate_dir, sources)
+        reused = reuse_crate(crate_name, crate_dir, source_hash, existing)
+        slots.append(reused)
+        if reused is None:
+            pending.append((crate_name, crate_dir, source_hash, sources))
+
+    extracted = iter(extract_crates(pending, args.jobs))
+    for slot in slots:
+        if slot is not None:
+            crate_indices.append(slot)
+            continue
+        idx = next(extracted)
         md = render_crate_markdown(idx)
         idx.token_estimate = estimate_tokens(md)
         crate_indices.append(idx)
 
-        out_path = L3_DIR / f"{crate_name}.md"
+        out_path = L3_DIR / f"{idx.name}.md"
         out_path.write_text(md, encoding="utf-8")
 
-    write_manifest(crate_indices, generated_at, merge=bool(selected_crates))
+    write_manifest(
+        crate_indices,
+        generated_at,
+        merge=bool(selected_crates),
+        fingerprint=fingerprint if same_extractor or not selected_crates else None,
+    )
 
     print_summary(crate_indices)
 
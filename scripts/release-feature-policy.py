@@ -11,6 +11,10 @@ import tomllib
 from pathlib import Path
 from typing import Any
 
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import workspace_graph  # noqa: E402
+
 
 ROOT = Path(__file__).resolve().parents[1]
 DEFAULT_POLICY = ROOT / "scripts" / "release-feature-policy.toml"
@@ -436,8 +440,10 @@ def parse_args() -> argparse.Namespace:
     parser.add_argument(
         "--metadata",
         type=Path,
-        required=True,
-        help="Path to `cargo metadata --format-version 1 --no-deps` JSON.",
+        help=(
+            "Path to `cargo metadata --format-version 1 --no-deps` JSON "
+            "(default: the workspace members from the cached workspace graph)."
+        ),
     )
     parser.add_argument("--policy", type=Path, default=DEFAULT_POLICY)
     parser.add_argument("--feature-doc", type=Path, default=DEFAULT_FEATURE_DOC)
@@ -456,7 +462,11 @@ def parse_args() -> argparse.Namespace:
 
 def main() -> int:
     args = parse_args()
-    metadata = load_json(args.metadata)
+    metadata = (
+        load_json(args.metadata)
+        if args.metadata is not None
+        else workspace_graph.load(ROOT).metadata()
+    )
     policy = load_toml(args.policy)
 
     if args.command == "validate":
@@ -19,20 +19,55 @@ less than it appears to. This job's own history is the argument -- #6523 records
 it reporting success on every PR without scanning anything, because a missing
 ripgrep went unnoticed.
 
+Before the first step, the index is listed once (tracked_files.py: every
+tracked path with its mode and blob SHA) and the tracked Rust sources are
+snapshotted once (rust_source_index.py); both are handed to every step, through
+ALETHEIA_TRACKED_FILES and ALETHEIA_RUST_SOURCE_INDEX, so the checks share one
+`git ls-files` and one read of the tree instead of each repeating them. The
+module graph the module-walking checks query (rust_module_graph.py) is brought
+up to date for that snapshot at the same time, so concurrent steps load it
+rather than each building it.
+
+Steps run concurrently (--jobs, default the CPU count): they are independent
+read-only checks, so a local run is bounded by the slowest check rather than
+the sum of all of them. Output is still reported step by step in workflow
+order, each with its wall time, followed by the critical-path total.
+
+--profile runs every step with gate_profile.py switched on, so each Python
+process a step starts leaves a record of its CPU, peak RSS, files and bytes
+read, subprocesses and named phases. The records are summed per step and
+printed as a table ranked by wall time -- which checks dominate the `gate`
+context, and where inside them the time goes. --profile-json also writes that
+table as JSON, for comparing one run against another.
+
 Usage:
-    scripts/run-gate-coverage.py [--job JOB] [--list]
+    scripts/run-gate-coverage.py [--job JOB] [--list] [--jobs N] [--profile] [--profile-json PATH]
 """
 
 from __future__ import annotations
 
 import argparse
+import json
+import os
 import pathlib
 import re
 import subprocess
 import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 
 import yaml
 
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parent))
+
+import gate_cache  # noqa: E402
+import gate_profile  # noqa: E402
+import rust_module_graph  # noqa: E402
+import rust_source_index  # noqa: E402
+import tracked_files  # noqa: E402
+
 REPO_ROOT = pathlib.Path(__file__).resolve().parent.parent
 WORKFLOW = REPO_ROOT / ".github" / "workflows" / "gate-attestation.yml"
 DEFAULT_JOB = "gate-coverage-scripts"
@@ -96,11 +131,127 @@ def load_steps(job: str) -> list[tuple[str, str]]:
     return steps
 
 
+def snapshot_env(scratch: pathlib.Path) -> dict[str, str]:
+    """The step environment, carrying one tracked-file listing and one pre-built
+    Rust source snapshot.
+
+    WHY per-run files rather than pointing at the shared blob store: the store
+    is rewritten whenever a standalone gate learns a new blob, and a run's
+    steps must all read the same tree state however long the run takes.
+    """
+    listing = scratch / "tracked-files"
+    tracked_files.write_snapshot(REPO_ROOT, listing)
+    index = rust_source_index.build(REPO_ROOT, strip=True)
+    snapshot = scratch / "rust-source-index.marshal"
+    gate_cache.write_atomic(snapshot, index.dumps())
+    rust_module_graph.build(index)
+    return {
+        **os.environ,
+        tracked_files.SNAPSHOT_ENV: str(listing),
+        rust_source_index.SNAPSHOT_ENV: str(snapshot),
+    }
+
+
+@dataclass
+class StepResult:
+    name: str
+    returncode: int
+    output: str
+    seconds: float
+    profile: dict | None = None
+
+
+def run_step(
+    name: str, command: str, env: dict[str, str], profile_dir: pathlib.Path | None = None
+) -> StepResult:
+    if profile_dir is not None:
+        env = gate_profile.site_env(env, profile_dir)
+    started = time.monotonic()
+    proc = subprocess.run(
+        ["bash", "-e", "-c", command],
+        cwd=REPO_ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+    result = StepResult(name, proc.returncode, proc.stdout + proc.stderr, time.monotonic() - started)
+    if profile_dir is not None:
+        result.profile = summarize_profile(gate_profile.load_records(profile_dir))
+    return result
+
+
+def summarize_profile(records: list[dict]) -> dict:
+    """One step's profile: the records of every Python process it started, summed.
+
+    WHY CPU is summed from each process's own time rather than read from the
+    children counter: a gate that runs another gate would otherwise count the
+    inner one twice. Subprocesses that are not Python (git, grep, cargo) leave
+    no record, so their CPU is taken from the top-level processes' children
+    counters minus the CPU of the recorded Python processes beneath them.
+    """
+    pids = {r["pid"] for r in records}
+    own_cpu = sum(r["cpu_user_s"] + r["cpu_sys_s"] for r in records)
+    nested_cpu = sum(r["cpu_user_s"] + r["cpu_sys_s"] for r in records if r["ppid"] in pids)
+    top_children = sum(r["cpu_children_s"] for r in records if r["ppid"] not in pids)
+    spans: dict[str, float] = {}
+    for r in records:
+        for s in r["spans"]:
+            spans[s["name"]] = spans.get(s["name"], 0.0) + s["seconds"]
+    return {
+        "processes": len(records),
+        "cpu_s": round(own_cpu + max(top_children - nested_cpu, 0.0), 4),
+        "peak_rss_kb": max((r["peak_rss_kb"] for r in records), default=0),
+        "files_read": sum(r["files_read"] for r in records),
+        "bytes_read": sum(r["bytes_read"] or 0 for r in records),
+        "subprocesses": sum(r["subprocesses"] for r in records),
+        "spans": dict(sorted(spans.items(), key=lambda kv: -kv[1])),
+    }
+
+
+def print_profile(results: list[StepResult]) -> None:
+    """The ranked table: slowest step first, with its heaviest named phases."""
+    print(f"{'step':<44} {'wall':>7} {'cpu':>7} {'rss MB':>7} {'files':>6} {'MB read':>8} {'procs':>5} {'sub':>4}")
+    for r in sorted(results, key=lambda r: r.seconds, reverse=True):
+        p = r.profile or summarize_profile([])
+        print(
+            f"{r.name[:44]:<44} {r.seconds:>6.1f}s {p['cpu_s']:>6.1f}s {p['peak_rss_kb'] / 1024:>7.0f}"
+            f" {p['files_read']:>6} {p['bytes_read'] / 2**20:>8.1f} {p['processes']:>5} {p['subprocesses']:>4}"
+        )
+        for span_name, seconds in list(p["spans"].items())[:3]:
+            print(f"    {span_name:<40} {seconds:>6.1f}s")
+    print()
+
+
+def profile_json(results: list[StepResult]) -> str:
+    steps = [
+        {"name": r.name, "wall_s": round(r.seconds, 4), "returncode": r.returncode, **(r.profile or {})}
+        for r in sorted(results, key=lambda r: r.seconds, reverse=True)
+    ]
+    return json.dumps({"steps": steps}, indent=2) + "\n"
+
+
 def main() -> int:
     ap = argparse.ArgumentParser(description=__doc__)
     ap.add_argument("--job", default=DEFAULT_JOB, help=f"workflow job to reproduce (default: {DEFAULT_JOB})")
     ap.add_argument("--list", action="store_true", help="list the derived steps without running them")
+    ap.add_argument(
+        "--jobs",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="steps to run at once (default: CPU count; 1 runs them one after another)",
+    )
+    ap.add_argument(
+        "--profile",
+        action="store_true",
+        help="record each step's CPU, memory, I/O and phases, and print them ranked by wall time",
+    )
+    ap.add_argument("--profile-json", type=pathlib.Path, metavar="PATH", help="also write the profile as JSON (implies --profile)")
     args = ap.parse_args()
+    if args.jobs < 1:
+        ap.error("--jobs must be at least 1")
+    if args.profile_json is not None:
+        args.profile = True
 
     steps = load_steps(args.job)
     if args.list:
@@ -108,40 +259,97 @@ def main() -> int:
             print(f"  {name}")
         return 0
 
+    with tempfile.TemporaryDirectory(prefix="gate-coverage-") as scratch:
+        profile_root = pathlib.Path(scratch) / "profile" if args.profile else None
+        return run_steps(
+            args.job, steps, snapshot_env(pathlib.Path(scratch)), args.jobs, profile_root, args.profile_json
+        )
+
+
+def run_steps(
+    job: str,
+    steps: list[tuple[str, str]],
+    env: dict[str, str],
+    jobs: int = 1,
+    profile_root: pathlib.Path | None = None,
+    profile_out: pathlib.Path | None = None,
+) -> int:
+    """Run the runnable steps `jobs` at a time, reporting them in workflow order.
+
+    WHY concurrency is safe here: every step in this job is a read-only check
+    (the one writer, `cargo metadata > metadata.json`, writes a file nothing
+    else in the job reads), so no step's result depends on another having run
+    first. Each step's output is captured and printed only once every earlier
+    step has been reported, so the log reads the same at any --jobs value.
+    """
     failed: list[str] = []
     unrun: list[str] = []
+    planned: list[tuple[str, str | None, str]] = []
     for name, run in steps:
         body, had_apt = strip_apt(run)
         if had_apt and not body:
             # An install step with no verification of its own: there is nothing
             # faithful left to run, and inventing a check here would be a guess.
             unrun.append(f"{name}: install-only step with no assertion to reproduce")
-            print(f"  UNRUN {name}")
+            planned.append((name, None, ""))
             continue
         suffix = "  (apt lines dropped; running its own assertion)" if had_apt else ""
 
         command, unresolved = substitute(body)
         if unresolved:
             unrun.append(f"{name}: unresolved expression(s): {'; '.join(unresolved)}")
-            print(f"  UNRUN {name}")
+            planned.append((name, None, ""))
             continue
+        planned.append((name, command, suffix))
 
-        proc = subprocess.run(
-            ["bash", "-e", "-c", command],
-            cwd=REPO_ROOT,
-            capture_output=True,
-            text=True,
-            check=False,
-        )
-        if proc.returncode == 0:
-            print(f"  PASS  {name}{suffix}")
-        else:
-            failed.append(name)
-            print(f"  FAIL  {name}")
-            for line in (proc.stdout + proc.stderr).strip().splitlines()[-12:]:
-                print(f"          {line}")
+    started = time.monotonic()
+    results: list[StepResult] = []
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        pending = [
+            (
+                name,
+                suffix,
+                pool.submit(
+                    run_step,
+                    name,
+                    command,
+                    env,
+                    profile_root / f"{i:03d}" if profile_root is not None else None,
+                )
+                if command is not None
+                else None,
+            )
+            for i, (name, command, suffix) in enumerate(planned)
+        ]
+        for name, suffix, future in pending:
+            if future is None:
+                print(f"  UNRUN {name}")
+                continue
+            result = future.result()
+            results.append(result)
+            timing = f"  [{result.seconds:.1f}s]"
+            if result.returncode == 0:
+                print(f"  PASS  {name}{suffix}{timing}")
+            else:
+                failed.append(name)
+                print(f"  FAIL  {name}{timing}")
+                for line in result.output.strip().splitlines()[-12:]:
+                    print(f"          {line}")
+    wall = time.monotonic() - started
 
     print()
+    if results:
+        slowest = max(results, key=lambda r: r.seconds)
+        print(
+            f"{len(results)} step(s) in {wall:.1f}s wall at --jobs {jobs}; "
+            f"{sum(r.seconds for r in results):.1f}s if run one after another; "
+            f"critical path {slowest.seconds:.1f}s ({slowest.name})"
+        )
+        print()
+        if profile_root is not None:
+            print_profile(results)
+            if profile_out is not None:
+                profile_out.write_text(profile_json(results))
     if unrun:
         print(f"{len(unrun)} step(s) could NOT be reproduced locally:")
         for item in unrun:
@@ -153,7 +361,7 @@ def main() -> int:
             print(f"  - {item}")
     if failed or unrun:
         return 1
-    print(f"{args.job}: all {len(steps)} steps passed locally.")
+    print(f"{job}: all {len(steps)} steps passed locally.")
     return 0
 
 
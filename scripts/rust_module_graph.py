@@ -0,0 +1,402 @@
+#!/usr/bin/env python3
+"""The `mod` tree of the tracked Rust sources, shared by the gates.
+
+Three gates walk a crate's module chain: check-orphaned-modules.py (is every
+file reachable?), check-unfulfilled-expects.py (which files does a lint scope
+reach?) and check-krites-capability-matrix.py (which files can a build
+compile, under which cfg?). Each used to lex every file it visited with its
+own comment stripper, find the `mod` declarations with its own regex and
+resolve `#[path]` with its own rules -- three answers to one question, and
+the same files read and stripped three times per gate run.
+
+This module answers it once per workspace snapshot. For every tracked `*.rs`
+file it records, from the `strip_noise` text rust_source_index.py already
+holds:
+
+  inner_attrs   the file's leading `#![...]` attributes
+  mods          each file-backed `mod NAME;`: line, enclosing inline mods,
+                outer attributes (so cfg is the caller's to evaluate), and
+                the `#[path]` value or the reason it cannot be read
+  includes      each `include!` invocation, with its outer attributes
+
+Declarations depend only on a file's bytes, so they are stored per git blob
+SHA and the whole map is cached on disk (gate_cache.py) under the hash of the
+snapshot's path -> blob map: an unchanged tree loads it without lexing
+anything, and a changed one re-lexes only the blobs it has not seen.
+
+Resolving a declaration to a file is left to query time (`resolve`), because
+it depends on more than the declaring file's bytes -- which candidate files
+exist, and whether the declaring file is a crate root. Resolution follows the
+Rust reference: crate roots and `mod.rs` files own their directory, any other
+`name.rs` owns `name/`; an inline `mod x { ... }` adds `x/`; `#[path]` is
+relative to the declaring file's directory outside an inline module and to
+the module's own directory inside one.
+
+Files outside the snapshot (an untracked file, a test fixture) are lexed from
+disk on demand, so a gate sees the same tree it would have walked itself.
+
+Usage:
+    python3 scripts/rust_module_graph.py --build [--output PATH]
+"""
+
+from __future__ import annotations
+
+import argparse
+import functools
+import hashlib
+import marshal
+import re
+import sys
+from pathlib import Path
+from typing import NamedTuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import gate_cache  # noqa: E402
+import gate_profile  # noqa: E402
+import krites_capability_evidence as EVIDENCE  # noqa: E402
+import rust_source_index  # noqa: E402
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+STORE_NAME = "rust-module-graph"
+STORE_FILE = "graph.marshal"
+
+# WHY the interpreter version: marshal's format is only stable within one
+# Python minor version (see rust_source_index.FORMAT_VERSION).
+FORMAT_VERSION = (1, *sys.version_info[:2])
+
+# Cargo's auto-discovered target directories, relative to a package root.
+# A file directly inside one of them is a crate root of its own.
+TARGET_DIRS = (("src", "bin"), ("tests",), ("benches",), ("examples",))
+
+_PAIRS = {")": "(", "]": "[", "}": "{"}
+
+# WHY each keyword is matched before its word-boundary check, where the other
+# gates put EVIDENCE.RUST_TOKEN_START first: a pattern that opens with a
+# lookbehind gives the regex engine no literal to skip ahead to, so it tries
+# every offset of ~28MB of source. `mod(?<![...]mod)` is the same test,
+# made after the literal has been found.
+_WORD = r"A-Za-z0-9_\u0080-\U0010ffff"
+
+
+def _keyword(word: str) -> str:
+    return rf"{word}(?<![{_WORD}]{word})"
+
+
+_NAME = r"[A-Za-z_][A-Za-z0-9_]*" + EVIDENCE.RUST_TOKEN_END
+
+# The items the graph records, `mod x {` included so the enclosing inline
+# mods of a later `mod y;` are known.
+_ITEM_RE = re.compile(
+    rf"{_keyword('mod')}\s+(?P<name>{_NAME})\s*(?P<term>[;{{])"
+    rf"|{_keyword('include')}\s*!\s*(?P<include_open>[([{{])"
+)
+# A visibility ending just before a `mod`: attributes precede it, not the
+# `mod` keyword. Looked for backwards rather than as an optional prefix of
+# _ITEM_RE, which would cost the literal search above.
+_VISIBILITY_RE = re.compile(rf"{_keyword('pub')}\s*(?:\([^)]*\))?\s*\Z")
+# All three delimiter kinds, not just braces: `top_level` means outside every
+# token tree, and a `mod x;` inside a macro's parentheses is not a module item
+# of the enclosing file.
+_DELIM_RE = re.compile(r"[()\[\]{}]")
+
+
+class ModDecl(NamedTuple):
+    """One file-backed `mod NAME;` declaration."""
+
+    name: str
+    line: int
+    virtual_path: tuple[str, ...]  # enclosing inline mods, outermost first
+    attrs: tuple[str, ...]  # outer attributes, raw, in source order
+    top_level: bool | None  # None: the delimiters before it do not balance
+    path_attr: str | None
+    path_error: str | None  # why a `#[path]`-shaped attribute was not read
+
+
+class Include(NamedTuple):
+    """One `include!` invocation."""
+
+    line: int
+    attrs: tuple[str, ...]
+    top_level: bool | None
+
+
+class FileModules(NamedTuple):
+    inner_attrs: tuple[str, ...]
+    mods: tuple[ModDecl, ...]
+    includes: tuple[Include, ...]
+
+
+def scan(raw: str, clean: str | None = None) -> FileModules:
+    """The module declarations in one file's text.
+
+    `clean` is `strip_noise(raw)` when the caller already has it; every offset
+    found in it names the same place in `raw`, which is where attribute values
+    are read from.
+    """
+    clean = EVIDENCE.strip_noise(raw) if clean is None else clean
+    inner_attrs = tuple(EVIDENCE.leading_inner_attributes(raw, clean))
+    items = list(_ITEM_RE.finditer(clean))
+    while items and items[-1].group("term") == "{":
+        items.pop()
+    if not items:
+        return FileModules(inner_attrs, (), ())
+
+    stack: list[tuple[str, str | None]] = []  # (opener, inline mod it opens)
+    balanced = True
+    mods: list[ModDecl] = []
+    includes: list[Include] = []
+    line = 1
+    counted_to = 0
+
+    def record(m: re.Match[str]) -> None:
+        nonlocal line, counted_to
+        if m.group("term") == "{":
+            stack.append(("{", m.group("name")))
+            return
+        start = m.start()
+        if m.group("name"):
+            visibility = _VISIBILITY_RE.search(clean, max(0, start - 64), start)
+            start = visibility.start() if visibility else start
+        line += clean.count("\n", counted_to, start)
+        counted_to = start
+        top_level = not stack if balanced else None
+        attrs = tuple(EVIDENCE.preceding_outer_attributes(raw, clean, start))
+        if m.group("include_open"):
+            includes.append(Include(line, attrs, top_level))
+            stack.append((m.group("include_open"), None))
+            return
+        path_attr = path_error = None
+        try:
+            path_attr = EVIDENCE._path_attr(list(attrs))
+        except ValueError as error:
+            path_error = str(error)
+        virtual_path = tuple(name for _, name in stack if name is not None)
+        mods.append(
+            ModDecl(m.group("name"), line, virtual_path, attrs, top_level, path_attr, path_error)
+        )
+
+    # WHY a walk over the delimiters alone, merged with the items by offset,
+    # and stopped at the last item: it is a Python step per delimiter, nothing
+    # after the last `mod x;` / `include!` can change what is recorded, and
+    # most files that have any declare their modules at the top.
+    pending = iter(items)
+    item = next(pending, None)
+    inside_item_until = 0
+    for delim in _DELIM_RE.finditer(clean, 0, items[-1].end()):
+        pos = delim.start()
+        while item is not None and item.start() <= pos:
+            record(item)
+            inside_item_until = item.end()  # the item's own opener
+            item = next(pending, None)
+        if pos < inside_item_until:
+            continue
+        ch = delim.group()
+        if ch in "([{":
+            stack.append((ch, None))
+            continue
+        if not stack or stack[-1][0] != _PAIRS[ch]:
+            balanced = False
+        if stack:
+            stack.pop()
+    while item is not None:
+        record(item)
+        item = next(pending, None)
+    return FileModules(inner_attrs, tuple(mods), tuple(includes))
+
+
+def module_dir(path: Path, is_root: bool) -> Path:
+    """The directory a `mod child;` at the top of `path` resolves against."""
+    if is_root or path.name == "mod.rs":
+        return path.parent
+    return path.parent / path.stem
+
+
+def candidates(path: Path, decl: ModDecl, is_root: bool) -> tuple[Path, ...]:
+    """The files `decl` inside `path` may name, in the order rustc tries them."""
+    base = module_dir(path, is_root).joinpath(*decl.virtual_path)
+    if decl.path_attr is not None:
+        return ((base if decl.virtual_path else path.parent) / decl.path_attr,)
+    return (base / f"{decl.name}.rs", base / decl.name / "mod.rs")
+
+
+@functools.lru_cache(maxsize=None)
+def _is_package_dir(directory: Path) -> bool:
+    return (directory / "Cargo.toml").is_file()
+
+
+def is_crate_root(path: Path) -> bool:
+    """Whether Cargo's target auto-discovery makes `path` a crate root.
+
+    For callers that meet a file without knowing how it was reached: `src/lib.rs`,
+    `src/main.rs`, `build.rs`, and a file (or `<name>/main.rs`) directly in
+    `src/bin`, `tests`, `benches` or `examples` of a package.
+    """
+    parent = path.parent
+    if path.name in ("lib.rs", "main.rs") and parent.name == "src":
+        return _is_package_dir(parent.parent)
+    if path.name == "build.rs" and _is_package_dir(parent):
+        return True
+    for directory in (parent, parent.parent if path.name == "main.rs" else None):
+        if directory is None:
+            continue
+        for target in TARGET_DIRS:
+            if directory.parts[-len(target) :] == target:
+                package = directory.parents[len(target) - 1]
+                if _is_package_dir(package):
+                    return True
+    return False
+
+
+def _code_hash() -> str:
+    """Hash of the code whose output the store holds: this lexer and the one it calls."""
+    digest = hashlib.sha256()
+    for module in (__file__, EVIDENCE.__file__):
+        digest.update(Path(module).read_bytes())
+    return digest.hexdigest()
+
+
+def tree_hash(index: rust_source_index.SourceIndex) -> str:
+    digest = hashlib.sha256()
+    for path in index.paths():
+        entry = index.get(path)
+        assert entry is not None
+        digest.update(f"{path}\0{entry.blob}\0".encode("utf-8", "surrogateescape"))
+    return digest.hexdigest()
+
+
+def _freeze(node: FileModules) -> tuple:
+    return (node.inner_attrs, tuple(map(tuple, node.mods)), tuple(map(tuple, node.includes)))
+
+
+def _thaw(record: tuple) -> FileModules:
+    inner_attrs, mods, includes = record
+    return FileModules(
+        inner_attrs,
+        tuple(ModDecl(*decl) for decl in mods),
+        tuple(Include(*include) for include in includes),
+    )
+
+
+class ModuleGraph:
+    """Module declarations for every file of one snapshot, plus resolution."""
+
+    def __init__(
+        self,
+        index: rust_source_index.SourceIndex,
+        nodes: dict[str, FileModules],
+        tree: str,
+    ) -> None:
+        self.index = index
+        self.tree = tree
+        self._nodes = nodes  # blob SHA -> declarations
+
+    def node(self, path: Path) -> FileModules:
+        """Declarations in `path`; OSError if it is neither tracked nor on disk."""
+        entry = self.index.lookup(path)
+        if entry is not None and entry.blob in self._nodes:
+            return self._nodes[entry.blob]
+        raw = path.read_bytes()
+        blob = rust_source_index.git_blob_sha(raw)
+        node = self._nodes.get(blob)
+        if node is None:
+            node = self._nodes[blob] = scan(raw.decode("utf-8", errors="replace"))
+        return node
+
+    def node_for_text(self, path: Path, text: str) -> FileModules:
+        """Declarations in `text`, which the caller read as `path` (or made up)."""
+        entry = self.index.lookup(path)
+        if entry is not None and entry.blob in self._nodes and entry.lossy_text == text:
+            return self._nodes[entry.blob]
+        return scan(text)
+
+    def exists(self, path: Path) -> bool:
+        return self.index.lookup(path) is not None or path.is_file()
+
+    def resolve(self, path: Path, decl: ModDecl, is_root: bool) -> Path | None:
+        """The file `decl` inside `path` brings into the crate, or None."""
+        for candidate in candidates(path, decl, is_root):
+            candidate = candidate.resolve()
+            if self.exists(candidate):
+                return candidate
+        return None
+
+    def dumps(self) -> bytes:
+        blobs = {}
+        for path in self.index.paths():
+            entry = self.index.get(path)
+            assert entry is not None
+            blobs[entry.blob] = _freeze(self._nodes[entry.blob])
+        return marshal.dumps(
+            {"version": FORMAT_VERSION, "code": _code_hash(), "tree": self.tree, "nodes": blobs}
+        )
+
+
+def _load_store(store: Path | None) -> dict:
+    if store is None:
+        return {}
+    try:
+        payload = marshal.loads(store.read_bytes())
+    except (OSError, EOFError, ValueError, TypeError):
+        return {}
+    if (
+        not isinstance(payload, dict)
+        or payload.get("version") != FORMAT_VERSION
+        or payload.get("code") != _code_hash()
+    ):
+        return {}
+    return payload
+
+
+def build(index: rust_source_index.SourceIndex) -> ModuleGraph:
+    """The graph for `index`, from the on-disk store where it already knows the blobs."""
+    tree = tree_hash(index)
+    store_dir = gate_cache.cache_dir(index.repo_root, STORE_NAME)
+    store = store_dir / STORE_FILE if store_dir is not None else None
+    payload = _load_store(store)
+    known = payload.get("nodes", {})
+    nodes: dict[str, FileModules] = {}
+    for entry in index.files():
+        if entry.blob in nodes:
+            continue
+        record = known.get(entry.blob)
+        nodes[entry.blob] = (
+            _thaw(record) if record is not None else scan(entry.lossy_text, entry.stripped)
+        )
+    graph = ModuleGraph(index, nodes, tree)
+    if payload.get("tree") != tree and store is not None:
+        try:
+            gate_cache.write_atomic(store, graph.dumps())
+        except OSError:
+            pass  # an unwritable cache costs the next run time, never this one its answer
+    return graph
+
+
+@functools.lru_cache(maxsize=None)
+def load(repo_root: Path = REPO_ROOT) -> ModuleGraph:
+    """The graph for the current worktree snapshot (see rust_source_index.load)."""
+    index = rust_source_index.load(repo_root)
+    with gate_profile.span("rust_module_graph.load"):
+        return build(index)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--build", action="store_true", help="build (or refresh) the cached graph")
+    parser.add_argument("--output", type=Path, help="also write the serialized graph here")
+    args = parser.parse_args()
+    if not args.build:
+        parser.error("nothing to do; pass --build")
+    graph = load(REPO_ROOT)
+    if args.output is not None:
+        gate_cache.write_atomic(args.output, graph.dumps())
+    declarations = sum(len(graph.node(REPO_ROOT / p).mods) for p in graph.index.paths())
+    print(
+        f"rust-module-graph: {len(graph.index)} tracked Rust files, "
+        f"{declarations} mod declarations (tree {graph.tree[:12]})"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
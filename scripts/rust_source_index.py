@@ -0,0 +1,398 @@
+#!/usr/bin/env python3
+"""Content-addressed snapshot of the tracked Rust sources, shared by the gates.
+
+Every source-reading gate in `gate-coverage-scripts` used to walk and read the
+whole tracked `*.rs` population (~1,900 files, ~28MB) on its own, and the ones
+that lex it paid `krites_capability_evidence.strip_noise` again per run. This
+module reads that population once into a snapshot keyed by git blob SHA --
+each file's raw bytes, its `strip_noise` text and a line-offset table -- so
+the gates read one pre-built snapshot instead of the tree.
+
+Two layers, both content-addressed:
+
+  - the blob store, cached on disk (see gate_cache.py). A blob whose SHA is
+    already stored is never re-read or re-stripped, so after the first run
+    only the files a change touched cost anything. It is split into shards by
+    the SHA's first hex digit, and a build rewrites only the shards it added
+    to;
+  - the per-run snapshot, the path -> blob map for the current worktree.
+    `run-gate-coverage.py` builds it once and hands it to every step through
+    ALETHEIA_RUST_SOURCE_INDEX; a gate run on its own builds the same thing
+    itself from the blob store.
+
+WHY blob SHAs from `git ls-files -s` (via tracked_files.py, whose listing a
+gate run hands down) rather than hashing every file: the index already knows
+the SHA of every clean file, and `git diff-files` names the dirty ones from
+stat data alone. Only a dirty file is read to learn its SHA, so a snapshot of
+an unchanged tree reads nothing but the store. A file git reports dirty only
+because its stat data is stale is read and hashed like a modified one --
+slower, never wrong.
+
+The snapshot reflects the worktree, not the index: a gate reading through it
+sees exactly the bytes it would have read from disk.
+
+Usage:
+    python3 scripts/rust_source_index.py --build [--output PATH]
+"""
+
+from __future__ import annotations
+
+import argparse
+import bisect
+import fnmatch
+import functools
+import hashlib
+import marshal
+import os
+import subprocess
+import sys
+from array import array
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import gate_cache  # noqa: E402
+import gate_profile  # noqa: E402
+import tracked_files  # noqa: E402
+from krites_capability_evidence import strip_noise  # noqa: E402
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+SNAPSHOT_ENV = "ALETHEIA_RUST_SOURCE_INDEX"
+PATHSPEC = "*.rs"
+STORE_NAME = "rust-source-index"
+STORE_SHARD = "blobs-{}.marshal"
+STORE_SHARDS = "0123456789abcdef"
+# WHY blobs are kept for several generations rather than only while the current
+# checkout references them: linked worktrees share the store, and one on
+# another revision would otherwise drop every blob the other needs on each
+# write. A shard's generation counts the builds that rewrote it; a blob no such
+# build has referenced in STORE_GENERATIONS of them is dropped.
+STORE_GENERATIONS = 8
+
+# WHY the interpreter version is part of the format key: marshal's byte format
+# is only guaranteed stable within one Python minor version. A store written by
+# another interpreter is discarded and rebuilt, never misread.
+FORMAT_VERSION = (2, *sys.version_info[:2])
+
+
+class SourceFile:
+    """One tracked Rust file: raw bytes plus the derived views gates lex."""
+
+    __slots__ = ("path", "blob", "raw", "_lossy", "_stripped", "_line_starts")
+
+    def __init__(
+        self,
+        path: str,
+        blob: str,
+        raw: bytes,
+        stripped: str | None = None,
+        line_starts: array | None = None,
+    ) -> None:
+        self.path = path
+        self.blob = blob
+        self.raw = raw
+        self._lossy: str | None = None
+        self._stripped = stripped
+        self._line_starts = line_starts
+
+    @property
+    def text(self) -> str:
+        """Strict UTF-8 text; raises UnicodeDecodeError like `read_text` would."""
+        return self.raw.decode("utf-8")
+
+    @property
+    def lossy_text(self) -> str:
+        """UTF-8 text with undecodable bytes replaced -- what `stripped` is built from."""
+        if self._lossy is None:
+            self._lossy = self.raw.decode("utf-8", errors="replace")
+        return self._lossy
+
+    @property
+    def stripped(self) -> str:
+        """`strip_noise(lossy_text)`: same length, comments and literals blanked."""
+        if self._stripped is None:
+            self._stripped = strip_noise(self.lossy_text)
+        return self._stripped
+
+    @property
+    def line_starts(self) -> array:
+        """Offset into `lossy_text` at which each line begins."""
+        if self._line_starts is None:
+            starts = array("I", [0])
+            text = self.lossy_text
+            at = text.find("\n")
+            while at != -1:
+                starts.append(at + 1)
+                at = text.find("\n", at + 1)
+            self._line_starts = starts
+        return self._line_starts
+
+    def line_of(self, offset: int) -> int:
+        """1-based line number of a character offset into the text."""
+        return bisect.bisect_right(self.line_starts, offset)
+
+    def _record(self) -> tuple[bytes, str | None, bytes | None]:
+        starts = self._line_starts.tobytes() if self._line_starts is not None else None
+        return (self.raw, self._stripped, starts)
+
+
+class SourceIndex:
+    """The path -> SourceFile map for one worktree state."""
+
+    def __init__(self, repo_root: Path, files: dict[str, SourceFile]) -> None:
+        self.repo_root = repo_root
+        self._files = files
+
+    def __len__(self) -> int:
+        return len(self._files)
+
+    def get(self, rel: str) -> SourceFile | None:
+        return self._files.get(rel)
+
+    def paths(self, pattern: str = PATHSPEC) -> list[str]:
+        """Sorted repo-relative paths matching a git-style pathspec glob.
+
+        `fnmatchcase` rather than `PurePath.match`: like a git pathspec, its
+        `*` also crosses `/`, so `crates/*.rs` keeps meaning what it meant as
+        a `git ls-files` argument.
+        """
+        return sorted(p for p in self._files if fnmatch.fnmatchcase(p, pattern))
+
+    def files(self, pattern: str = PATHSPEC) -> list[SourceFile]:
+        return [self._files[p] for p in self.paths(pattern)]
+
+    def lookup(self, path: Path) -> SourceFile | None:
+        """The snapshot entry for an absolute or repo-relative path, if tracked."""
+        try:
+            rel = path.relative_to(self.repo_root) if path.is_absolute() else path
+        except ValueError:
+            return None
+        return self._files.get(rel.as_posix())
+
+    def dumps(self) -> bytes:
+        blobs = {f.blob: f._record() for f in self._files.values()}
+        return marshal.dumps(
+            {
+                "version": FORMAT_VERSION,
+                "repo_root": str(self.repo_root),
+                "files": {p: f.blob for p, f in self._files.items()},
+                "blobs": blobs,
+            }
+        )
+
+    @classmethod
+    def loads(cls, data: bytes, repo_root: Path) -> SourceIndex | None:
+        """Decode a snapshot written by `dumps`, or None if it is not one for `repo_root`."""
+        payload = _decode(data)
+        if payload is None or payload.get("repo_root") != str(repo_root):
+            return None
+        blobs = payload["blobs"]
+        files = {
+            path: _entry(path, blob, blobs[blob]) for path, blob in payload["files"].items()
+        }
+        return cls(repo_root, files)
+
+
+def _decode(data: bytes) -> dict | None:
+    try:
+        payload = marshal.loads(data)
+    except (EOFError, ValueError, TypeError):
+        return None
+    if not isinstance(payload, dict) or payload.get("version") != FORMAT_VERSION:
+        return None
+    return payload
+
+
+def _entry(path: str, blob: str, record: tuple) -> SourceFile:
+    raw, stripped, starts = record
+    line_starts = None
+    if starts is not None:
+        line_starts = array("I")
+        line_starts.frombytes(starts)
+    return SourceFile(path, blob, raw, stripped, line_starts)
+
+
+def git_blob_sha(data: bytes) -> str:
+    """The SHA git assigns `data` as a blob (`git hash-object` without writing)."""
+    return hashlib.sha1(b"blob %d\0" % len(data) + data).hexdigest()
+
+
+def _git_z(repo_root: Path, *args: str) -> list[str]:
+    proc = subprocess.run(
+        ["git", *args],
+        cwd=repo_root,
+        capture_output=True,
+        check=False,
+    )
+    if proc.returncode != 0:
+        raise SystemExit(f"git {args[0]} failed: {proc.stderr.decode('utf-8', 'replace').strip()}")
+    return [p for p in proc.stdout.decode("utf-8", "surrogateescape").split("\0") if p]
+
+
+def _tracked_blobs(repo_root: Path, pathspec: str) -> tuple[dict[str, str], set[str]]:
+    """({path: staged blob SHA}, {paths with an unmerged index entry})."""
+    staged: dict[str, str] = {}
+    unmerged: set[str] = set()
+    for entry in tracked_files.load(repo_root).entries:
+        if entry.mode == tracked_files.GITLINK_MODE:
+            continue  # a submodule gitlink, not a file in this tree
+        if not fnmatch.fnmatchcase(entry.path, pathspec):
+            continue
+        if entry.stage != 0:
+            unmerged.add(entry.path)
+        staged[entry.path] = entry.blob
+    return staged, unmerged
+
+
+def _load_shards(store_dir: Path | None) -> dict[str, dict]:
+    shards: dict[str, dict] = {}
+    if store_dir is None:
+        return shards
+    for digit in STORE_SHARDS:
+        try:
+            payload = _decode((store_dir / STORE_SHARD.format(digit)).read_bytes())
+        except OSError:
+            continue
+        if (
+            payload is not None
+            and isinstance(payload.get("generation"), int)
+            and isinstance(payload.get("blobs"), dict)
+            and isinstance(payload.get("seen"), dict)
+        ):
+            shards[digit] = payload
+    return shards
+
+
+def _save_shard(store_dir: Path, digit: str, shard: dict | None, referenced: list[SourceFile]) -> None:
+    """Merge `referenced` into `shard` as a new generation and write it."""
+    generation = (shard["generation"] if shard is not None else 0) + 1
+    blobs = dict(shard["blobs"]) if shard is not None else {}
+    seen = dict(shard["seen"]) if shard is not None else {}
+    for entry in referenced:
+        blobs[entry.blob] = entry._record()
+        seen[entry.blob] = generation
+    for blob in [b for b in blobs if seen.get(b, 0) <= generation - STORE_GENERATIONS]:
+        del blobs[blob]
+        seen.pop(blob, None)
+    payload = {"version": FORMAT_VERSION, "generation": generation, "blobs": blobs, "seen": seen}
+    gate_cache.write_atomic(store_dir / STORE_SHARD.format(digit), marshal.dumps(payload))
+
+
+def build(repo_root: Path = REPO_ROOT, *, strip: bool = False) -> SourceIndex:
+    """Snapshot the worktree's tracked `*.rs` files, reusing the on-disk blob store.
+
+    `strip=True` also fills `stripped` for every file, so one build pays the
+    lexing for every later reader. Only the shards this build added to are
+    rewritten, with what they held merged in; see STORE_GENERATIONS for what
+    bounds their growth.
+    """
+    staged, unmerged = _tracked_blobs(repo_root, PATHSPEC)
+    dirty = set(_git_z(repo_root, "diff-files", "--name-only", "-z", "--", PATHSPEC)) | unmerged
+    store_dir = gate_cache.cache_dir(repo_root, STORE_NAME)
+    shards = _load_shards(store_dir)
+    known: dict[str, tuple] = {}
+    for shard in shards.values():
+        known.update(shard["blobs"])
+
+    learned: set[str] = set()
+    files: dict[str, SourceFile] = {}
+    for path, blob in staged.items():
+        if path not in dirty and blob in known:
+            files[path] = _entry(path, blob, known[blob])
+            continue
+        try:
+            raw = (repo_root / path).read_bytes()
+        except OSError:
+            continue  # deleted from the worktree; every gate skipped unreadable files
+        if path in dirty:
+            blob = git_blob_sha(raw)
+            if blob in known:
+                files[path] = _entry(path, blob, known[blob])
+                continue
+        files[path] = SourceFile(path, blob, raw)
+        files[path].line_starts  # noqa: B018 -- computed once here, persisted below
+        learned.add(blob[0])
+
+    if strip:
+        for entry in files.values():
+            if entry._stripped is None:
+                entry.stripped  # noqa: B018 -- computed once here, persisted below
+                learned.add(entry.blob[0])
+
+    if learned and store_dir is not None:
+        by_shard: dict[str, list[SourceFile]] = {digit: [] for digit in learned}
+        for entry in files.values():
+            if entry.blob[0] in by_shard:
+                by_shard[entry.blob[0]].append(entry)
+        try:
+            for digit, referenced in sorted(by_shard.items()):
+                _save_shard(store_dir, digit, shards.get(digit), referenced)
+        except OSError:
+            pass  # an unwritable cache costs the next run time, never this one its answer
+    return SourceIndex(repo_root, files)
+
+
+@functools.lru_cache(maxsize=None)
+def _handed_down(snapshot: str, repo_root: Path) -> SourceIndex | None:
+    try:
+        data = Path(snapshot).read_bytes()
+    except OSError:
+        return None
+    return SourceIndex.loads(data, repo_root)
+
+
+def shared(repo_root: Path = REPO_ROOT) -> SourceIndex | None:
+    """The snapshot handed down through ALETHEIA_RUST_SOURCE_INDEX, if it is for `repo_root`."""
+    snapshot = os.environ.get(SNAPSHOT_ENV)
+    if not snapshot:
+        return None
+    return _handed_down(snapshot, repo_root.resolve())
+
+
+def load(repo_root: Path = REPO_ROOT) -> SourceIndex:
+    """The handed-down snapshot when there is one, otherwise a fresh build."""
+    with gate_profile.span("rust_source_index.load"):
+        return shared(repo_root) or build(repo_root)
+
+
+def read_text(path: Path, repo_root: Path = REPO_ROOT, errors: str = "strict") -> str:
+    """`path.read_text(encoding="utf-8", errors=errors)`, served from the shared
+    snapshot when one was handed down and holds the file.
+
+    For gates that enumerate files themselves (a directory walk rather than
+    `git ls-files`) and so must keep seeing untracked files: the walk stays
+    theirs, only the read is shared.
+    """
+    index = shared(repo_root)
+    entry = index.lookup(path) if index is not None else None
+    if entry is None:
+        return path.read_text(encoding="utf-8", errors=errors)
+    return entry.raw.decode("utf-8", errors=errors)
+
+
+def read_source(path: Path, repo_root: Path = REPO_ROOT) -> tuple[str, str]:
+    """(strict text, `strip_noise` text) for `path`, shared-snapshot first."""
+    index = shared(repo_root)
+    entry = index.lookup(path) if index is not None else None
+    if entry is None:
+        text = path.read_text(encoding="utf-8")
+        return text, strip_noise(text)
+    return entry.text, entry.stripped
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--build", action="store_true", help="build the snapshot (with stripped text)")
+    parser.add_argument("--output", type=Path, help="also write the snapshot here, for ALETHEIA_RUST_SOURCE_INDEX")
+    args = parser.parse_args()
+    if not args.build:
+        parser.error("nothing to do; pass --build")
+    index = build(REPO_ROOT, strip=True)
+    if args.output is not None:
+        gate_cache.write_atomic(args.output, index.dumps())
+    print(f"rust-source-index: {len(index)} tracked Rust files snapshotted")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
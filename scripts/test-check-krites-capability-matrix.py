@@ -24,9 +24,13 @@ from __future__ import annotations
 
 import copy
 import importlib.util
+import json
+import os
 import re
+import subprocess
 import sys
 import tempfile
+from contextlib import redirect_stderr
 from io import StringIO
 from pathlib import Path
 
@@ -433,6 +437,88 @@ def test_call_site_measurements_are_not_row_authored_shell() -> None:
     )
 
 
+def test_in_process_call_site_matcher_agrees_with_grep() -> None:
+    """WHY: call sites are counted in one in-process pass, not by running each
+    row's grep. The translation from grep's regex dialects is only trustworthy
+    while it selects exactly the lines grep itself selects."""
+    lines = [
+        'run("::compact");',
+        "  x <~ BFS(edges[])",
+        "x <~BFS (edges[])",
+        "DataValue::Bool(true)",
+        "DataValue::Boolean",
+        "let p = Poison; // Poisoned",
+        "FixedRulePayload and FixedRuleInputRelation",
+        "a(b) a|b {1} a+ a? *star",
+        "tab\there",
+        "aaa ab 1234 [x] x-y",
+    ]
+    cases = [
+        ("-rn", "[\"'`]::compact"),
+        ("-rEn", "<~\\s*BFS\\("),
+        ("-rn", "DataValue::Bool\\b"),
+        ("-rn", "\\bPoison\\b"),
+        ("-rn", "FixedRuleInputRelation\\|FixedRulePayload"),
+        ("-rn", "a(b)"),
+        ("-rn", "a|b {1} a+ a?"),
+        ("-rn", "*star"),
+        ("-rn", "^a\\{3\\}"),
+        ("-rEn", "a{3} |[0-9]{4}"),
+        ("-rn", "[^a-z ]-y$"),
+        ("-rn", "[[:digit:]]\\+ \\[x"),
+        ("-rn", "\\<ab\\>"),
+        ("-rEn", "(Fixed|Data)[A-Z]\\w+"),
+        ("-rn", "x <~ *BFS"),
+    ]
+    with tempfile.TemporaryDirectory() as tmp:
+        sample = Path(tmp) / "sample.rs"
+        sample.write_text("\n".join(lines) + "\n", encoding="utf-8")
+        for flag, pattern in cases:
+            grep = subprocess.run(
+                ["grep", flag.replace("r", ""), "--", pattern, str(sample)],
+                capture_output=True,
+                text=True,
+                check=False,
+            )
+            expected = [int(line.split(":", 1)[0]) for line in grep.stdout.splitlines()]
+            regex, literals = CHECKER._compile_grep_pattern(pattern, flag == "-rEn")
+            found = [n for n, line in enumerate(lines, 1) if regex.search(line)]
+            check(
+                f"{flag} {pattern!r} selects the lines grep selects",
+                found == expected,
+                f"grep={expected} in-process={found}",
+            )
+            check(
+                f"{flag} {pattern!r} prefilter keeps every matched line",
+                all(any(lit in lines[n - 1] for lit in literals) for n in found)
+                or not literals,
+                f"literals={literals}",
+            )
+
+
+def test_untranslatable_call_site_patterns_fail_the_row() -> None:
+    rows = _rows_with(
+        **{
+            "sysop-compact": {
+                "call_sites": 0,
+                "call_sites_method": (
+                    "grep -rn '\\(a\\)\\1' crates/ --include='*.rs' "
+                    "| grep -v ^crates/krites/"
+                ),
+            }
+        }
+    )
+    errors = CHECKER.check_call_sites_measured(rows)
+    check(
+        "a back-reference is refused rather than counted differently from grep",
+        any(
+            "sysop-compact" in error and "back-references" in error
+            for error in errors
+        ),
+        str(errors[:2]),
+    )
+
+
 def test_not_measured_call_sites_use_checker_owned_exceptions() -> None:
     arbitrary = _rows_with(
         **{
@@ -523,6 +609,72 @@ def test_issue_completion_requires_state_and_a_closing_pr() -> None:
     )
 
 
+def test_issue_statuses_come_from_one_batched_query() -> None:
+    merged_pr = "https://github.com/forkwright/aletheia/pull/7"
+    fixture = {
+        "11": {
+            "number": 11,
+            "state": "CLOSED",
+            "stateReason": "COMPLETED",
+            "labels": {"nodes": [{"name": "krites"}, {"name": "bug"}]},
+            "closedByPullRequestsReferences": {"nodes": [{"number": 7, "url": merged_pr}]},
+            "timelineItems": {
+                "totalCount": 1,
+                "nodes": [
+                    {
+                        "__typename": "ClosedEvent",
+                        "closer": {
+                            "__typename": "PullRequest",
+                            "url": merged_pr,
+                            "state": "MERGED",
+                            "merged": True,
+                            "mergedAt": "2026-08-19T00:00:00Z",
+                        },
+                    }
+                ],
+            },
+        },
+        "12": None,
+        "13": {"number": 13, "state": "OPEN", "labels": None},
+    }
+    with tempfile.TemporaryDirectory() as tmp:
+        fixture_path = Path(tmp) / "issues.json"
+        fixture_path.write_text(json.dumps(fixture), encoding="utf-8")
+        saved = {key: os.environ.get(key) for key in ("ALETHEIA_GH_FIXTURE", "ALETHEIA_GATE_CACHE")}
+        os.environ["ALETHEIA_GH_FIXTURE"] = str(fixture_path)
+        os.environ["ALETHEIA_GATE_CACHE"] = str(Path(tmp) / "cache")
+        try:
+            with redirect_stderr(StringIO()):
+                statuses = TETHERS._gh_issue_statuses([11, 12, 13])
+                fixture_path.unlink()
+                outage = TETHERS._gh_issue_statuses([11])
+        finally:
+            for key, value in saved.items():
+                if value is None:
+                    os.environ.pop(key, None)
+                else:
+                    os.environ[key] = value
+    complete = statuses[11]
+    check(
+        "a batched answer carries labels, closing refs and the merged current closer",
+        complete is not None
+        and complete.labels == ("bug", "krites")
+        and complete.closing_refs == (merged_pr,)
+        and TETHERS._issue_disposition(complete) == "resolved",
+        str(complete),
+    )
+    check(
+        "a missing or malformed issue is a failed query, never a status",
+        statuses[12] is None and statuses[13] is None,
+        str(statuses),
+    )
+    check(
+        "an outage fails the number even with a fresh cached answer",
+        outage == {11: None},
+        str(outage),
+    )
+
+
 def test_citation_pointing_at_the_wrong_line_fails() -> None:
     rows = _rows_with(**{"api-db-run": {"source": "crates/krites/src/lib.rs:1"}})
     errors = CHECKER.check_file_line_refs(rows)
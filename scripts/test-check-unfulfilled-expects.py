@@ -705,6 +705,32 @@ mod lifecycle_and_builders;
             )
 
 
+def test_file_level_fulfilled_by_path_attr_child_module() -> None:
+    # Real shape: crates/episteme/src/dedup_tests.rs ends in
+    # `#[path = "dedup_proptests.rs"] mod proptests;`. Matching `#[path]` on
+    # the literal-blanked line lost the value, so the child's `.unwrap()`
+    # never reached the search span.
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        umbrella = '''\
+#![expect(clippy::unwrap_used, reason = "test assertions")]
+
+#[path = "dedup_proptests.rs"]
+mod proptests;
+'''
+        _write_crate(
+            root,
+            "#[cfg(test)]\nmod dedup_tests;\n",
+            {
+                "dedup_tests.rs": umbrella,
+                "dedup_proptests.rs": '#[test]\nfn p() { let v: u32 = "1".parse().unwrap(); }\n',
+            },
+        )
+        got = CHECK.check_text(root / "src" / "dedup_tests.rs", umbrella)
+        if got:
+            FAILURES.append(f"#[path] child: expected fulfilled, got {got}")
+
+
 # --------------------------------------------------------------------------
 # strip_noncode: the primitive everything above depends on.
 # --------------------------------------------------------------------------
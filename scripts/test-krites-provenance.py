@@ -21,13 +21,17 @@ actually soaked against.
 
 from __future__ import annotations
 
+import difflib
 import importlib.util
+import os
+import random
 import sys
 import tempfile
 from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).resolve().parent))
 
+import gate_cache
 import krites_provenance_lib as LIB
 
 _CHECK_SCRIPT_PATH = Path(__file__).parent / "check-krites-provenance.py"
@@ -505,6 +509,49 @@ def test_verbatim_pct_full_match_on_file_shorter_than_floor() -> None:
     identical = "fn a() {}\nfn b() {}\n"
     pct = LIB.verbatim_pct(identical, identical)
     expect(pct == 100.0, f"a file identical to upstream must score 100% regardless of length; got {pct}")
+
+
+def _difflib_blocks(a: list[str], b: list[str], min_size: int) -> list[difflib.Match]:
+    blocks = difflib.SequenceMatcher(None, a, b, autojunk=False).get_matching_blocks()
+    return [block for block in blocks[:-1] if block.size >= min_size] + blocks[-1:]
+
+
+def test_matching_blocks_equals_difflib_on_random_sequences() -> None:
+    # WHY a small alphabet with a heavy `}`: ties between equally long matches
+    # and popular lines are where a matcher's answer can quietly differ.
+    rng = random.Random(6656)
+    for case in range(3000):
+        a = [rng.choice("}}}abc") for _ in range(rng.randint(0, 25))]
+        b = [rng.choice("}}}abc") for _ in range(rng.randint(0, 25))]
+        min_size = rng.randint(1, 4)
+        observed = LIB.matching_blocks(a, b, min_size)
+        expected = _difflib_blocks(a, b, min_size)
+        if observed != expected:
+            expect(False, f"case {case}: matching_blocks({a}, {b}, {min_size}) = {observed}, difflib says {expected}")
+            return
+
+
+def test_matching_blocks_equals_difflib_on_the_whole_ledger() -> None:
+    # INVARIANT: published percentages must not move with the matcher. Every row
+    # check_verbatim_recompute measures is compared block for block against
+    # difflib, not just by the rounded percentage.
+    _, rows = LIB.parse_ledger(LIB.LEDGER_PATH.read_text())
+    compared = 0
+    for r in rows:
+        if r["status"] in ("derived", "dual"):
+            compare_to = r["upstream_path"]
+        else:
+            compare_to = r.get("replaced_upstream_path", "none")
+        upstream = LIB.UPSTREAM_SNAPSHOT_DIR / compare_to
+        if compare_to == "none" or not upstream.is_file():
+            continue
+        a = LIB.nonblank_lines((LIB.KRITES_SRC / r["path"]).read_text(errors="replace"))
+        b = LIB.nonblank_lines(upstream.read_text(errors="replace"))
+        floor = min(LIB.MIN_MATCH_BLOCK_LINES, len(a))
+        if a and LIB.matching_blocks(a, b, floor) != _difflib_blocks(a, b, floor):
+            expect(False, f"{r['path']}: matching_blocks differs from difflib against {compare_to}")
+        compared += 1
+    expect(compared > 100, f"the ledger comparison must cover the measured rows; compared {compared}")
 # --- P1: status-sequence enforcement (the sneakier variant: verbatim_pct zeroed too) ---
 
 
@@ -699,6 +746,114 @@ def test_verbatim_recompute_detects_drift() -> None:
             CHECKER.KRITES_SRC = orig_src
 
 
+def _recompute_fixture(root: Path) -> tuple[Path, Path, list[dict]]:
+    snapshot_dir = root / "snapshot"
+    snapshot_dir.mkdir()
+    src_dir = root / "src"
+    src_dir.mkdir()
+    shared = "fn a() {}\nfn b() {}\nfn c() {}\nfn d() {}\n"
+    (snapshot_dir / "up.rs").write_text(shared + "fn e() {}\n")
+    (snapshot_dir / "other.rs").write_text("fn q() {}\n")
+    (src_dir / "same.rs").write_text(shared)  # 100.0
+    (src_dir / "half.rs").write_text(shared + "fn w() {}\nfn x() {}\nfn y() {}\nfn z() {}\n")  # 50.0
+    (src_dir / "apart.rs").write_text("fn q() {}\nfn r() {}\n")  # 0.0 (floored)
+    rows = [
+        row("same.rs", "up.rs", 10.0, "derived"),  # stale
+        row("gone.rs", "missing.rs", 0.0, "derived"),  # not in the snapshot
+        row("half.rs", "up.rs", 50.0, "dual"),
+        row("apart.rs", "other.rs", 20.0, "derived"),  # stale
+    ]
+    return snapshot_dir, src_dir, rows
+
+
+def _with_recompute_fixture(test) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        snapshot_dir, src_dir, rows = _recompute_fixture(root)
+        saved = (CHECKER.UPSTREAM_SNAPSHOT_DIR, CHECKER.KRITES_SRC, os.environ.get(gate_cache.CACHE_ENV))
+        CHECKER.UPSTREAM_SNAPSHOT_DIR = snapshot_dir
+        CHECKER.KRITES_SRC = src_dir
+        os.environ[gate_cache.CACHE_ENV] = str(root / "cache")
+        try:
+            test(root, src_dir, rows)
+        finally:
+            CHECKER.UPSTREAM_SNAPSHOT_DIR, CHECKER.KRITES_SRC, cache = saved
+            if cache is None:
+                os.environ.pop(gate_cache.CACHE_ENV, None)
+            else:
+                os.environ[gate_cache.CACHE_ENV] = cache
+
+
+def test_verbatim_recompute_reuses_a_cached_pair() -> None:
+    def run(root: Path, src_dir: Path, rows: list[dict]) -> None:
+        measured: list[str] = []
+        real = CHECKER.verbatim_pct
+
+        def counting(local_text: str, upstream_text: str | None) -> float:
+            measured.append(local_text)
+            return real(local_text, upstream_text)
+
+        CHECKER.verbatim_pct = counting
+        try:
+            first = CHECKER.check_verbatim_recompute(rows)
+            expect(len(measured) == 3, f"a cold cache must measure every pair; measured {len(measured)}")
+            measured.clear()
+            second = CHECKER.check_verbatim_recompute(rows)
+            expect(measured == [], f"an unchanged pair must come from the cache; measured {len(measured)}")
+            expect(second == first, f"cached results must give the same errors: {second} != {first}")
+            (src_dir / "half.rs").write_text("fn only_here() {}\n")
+            third = CHECKER.check_verbatim_recompute(rows)
+            expect(len(measured) == 1, f"only the edited file's pair may be re-measured; measured {len(measured)}")
+            expect(
+                any(e.startswith("half.rs:") and "recomputation 0.0" in e for e in third),
+                f"the edit must move half.rs's recomputed figure: {third}",
+            )
+        finally:
+            CHECKER.verbatim_pct = real
+
+    _with_recompute_fixture(run)
+
+
+def test_verbatim_recompute_keeps_other_worktrees_versions() -> None:
+    """Linked worktrees share the cache; one on another krites_provenance_lib.py
+    revision must not evict this one's results, or neither ever hits."""
+
+    def run(root: Path, src_dir: Path, rows: list[dict]) -> None:
+        real = CHECKER.verbatim_algorithm_version
+        CHECKER.verbatim_algorithm_version = lambda: "other-worktree"
+        try:
+            CHECKER.check_verbatim_recompute(rows)
+        finally:
+            CHECKER.verbatim_algorithm_version = real
+        CHECKER.check_verbatim_recompute(rows)
+        kept = sorted(p.name for p in (root / "cache" / CHECKER.RECOMPUTE_CACHE_NAME).iterdir())
+        expect(
+            kept == sorted(["other-worktree.json", f"{real()}.json"]),
+            f"both versions' results must survive a save: {kept}",
+        )
+
+    _with_recompute_fixture(run)
+
+
+def test_verbatim_recompute_in_parallel_reports_in_row_order() -> None:
+    results: list[list[str]] = []
+
+    def run(jobs: int):
+        def inner(root: Path, src_dir: Path, rows: list[dict]) -> None:
+            results.append(CHECKER.check_verbatim_recompute(rows, jobs))
+
+        return inner
+
+    _with_recompute_fixture(run(1))
+    _with_recompute_fixture(run(3))
+    serial, parallel = results
+    expect(parallel == serial, f"--jobs must not change the errors or their order: {parallel} != {serial}")
+    expect(
+        [e.split(":", 1)[0] for e in serial] == ["same.rs", "gone.rs", "apart.rs"],
+        f"errors must follow ledger row order: {serial}",
+    )
+
+
 # --- #6797: a sovereign/'none' row must be an explicit, reasoned declaration ---
 
 
@@ -1682,6 +1837,8 @@ def main() -> int:
         test_verbatim_pct_ignores_reindentation,
         test_verbatim_pct_floors_out_scattered_punctuation_matches,
         test_verbatim_pct_full_match_on_file_shorter_than_floor,
+        test_matching_blocks_equals_difflib_on_random_sequences,
+        test_matching_blocks_equals_difflib_on_the_whole_ledger,
         test_status_sequence_rejects_direct_derived_to_sovereign,
         test_status_sequence_accepts_derived_to_dual_and_dual_to_sovereign,
         test_status_sequence_ignores_path_absent_from_base,
@@ -1700,6 +1857,9 @@ def main() -> int:
         test_soak_expiry_fails_closed_when_commit_count_unavailable,
         test_verbatim_recompute_fails_closed_without_snapshot,
         test_verbatim_recompute_detects_drift,
+        test_verbatim_recompute_reuses_a_cached_pair,
+        test_verbatim_recompute_keeps_other_worktrees_versions,
+        test_verbatim_recompute_in_parallel_reports_in_row_order,
         test_no_unjustified_exemption_rejects_bare_none,
         test_no_unjustified_exemption_accepts_justified_none,
         test_no_unjustified_exemption_ignores_rows_with_a_real_predecessor,
@@ -20,9 +20,17 @@ Exits 0 on success, 1 on first failure.
 
 from __future__ import annotations
 
+import contextlib
 import importlib.util
+import io
+import os
+import subprocess
 import sys
+import tempfile
+from array import array
+from collections.abc import Iterator
 from pathlib import Path
+from unittest import mock
 
 SCRIPT_PATH = Path(__file__).resolve().parent / "check-krites-verbatim-drift.py"
 
@@ -48,6 +56,18 @@ def check(name: str, condition: bool, detail: str = "") -> None:
         FAILURES.append(f"{name}: {detail}")
 
 
+@contextlib.contextmanager
+def _gate_cache() -> Iterator[Path]:
+    """A fresh, empty gate cache for the duration of the block."""
+    with tempfile.TemporaryDirectory() as tmp:
+        with mock.patch.dict(os.environ, {DRIFT.gate_cache.CACHE_ENV: tmp}):
+            yield Path(tmp)
+
+
+def _refuse(path: Path, data: bytes) -> None:
+    raise PermissionError(13, "Permission denied", str(path))
+
+
 def test_punctuation_only_lines_excluded() -> None:
     src = "fn f() {\n}\n);\n{\n},\n"
     lines = DRIFT.eligible_lines(src)
@@ -135,7 +155,59 @@ def test_short_stream_below_shingle_size_yields_empty_set() -> None:
     s = DRIFT.shingles(tokens)
     check(
         "fewer than SHINGLE_SIZE tokens -> empty shingle set or non-crashing",
-        isinstance(s, frozenset),
+        isinstance(s, array),
+    )
+
+
+def test_shingle_hashes_are_sorted_and_unique() -> None:
+    tokens = DRIFT.tokenize("fn real_function_body() { call_something_here_please(); }\n" * 3)
+    s = list(DRIFT.shingles(tokens))
+    windows = {tuple(tokens[i : i + DRIFT.SHINGLE_SIZE]) for i in range(len(tokens) - DRIFT.SHINGLE_SIZE + 1)}
+    check("shingle hashes sorted and unique", s == sorted(set(s)), f"got {s!r}")
+    check("one hash per distinct window", len(s) == len(windows), f"{len(s)} != {len(windows)}")
+
+
+def _exact_jaccard(a_tokens: list[str], b_tokens: list[str]) -> float:
+    """The pre-hashing metric: Jaccard over the literal token windows."""
+
+    def windows(tokens: list[str]) -> set[tuple[str, ...]]:
+        return {tuple(tokens[i : i + DRIFT.SHINGLE_SIZE]) for i in range(len(tokens) - DRIFT.SHINGLE_SIZE + 1)}
+
+    a, b = windows(a_tokens), windows(b_tokens)
+    union = len(a | b)
+    return len(a & b) / union if union else 0.0
+
+
+def test_hash_collisions_stay_within_tolerance() -> None:
+    """Shingles are 64-bit hashes, so the score is exact only while no two
+    distinct windows collide. Re-derive the figures the report and calibration
+    stand on from the literal windows and hold them to JACCARD_HASH_TOLERANCE."""
+    if not DRIFT.UPSTREAM_SRC.is_dir():
+        check("upstream snapshot present", False, f"missing at {DRIFT.UPSTREAM_SRC}")
+        return
+
+    krites = DRIFT.load_krites_corpus()
+    upstream = DRIFT.load_upstream_corpus()
+    tokens: dict[Path, list[str]] = {}
+
+    def tokens_of(fs) -> list[str]:
+        if fs.path not in tokens:
+            tokens[fs.path] = DRIFT.tokenize(fs.path.read_text(encoding="utf-8", errors="replace"))
+        return tokens[fs.path]
+
+    pairs = [(fs, upstream[relpath]) for relpath, fs in krites.items() if relpath in upstream]
+    for relpath in DRIFT.KNOWN_ORIGINAL_FILES:
+        best = DRIFT.global_best_match(krites[relpath], upstream)
+        if best.best_match is not None:
+            pairs.append((krites[relpath], upstream[best.best_match]))
+    worst = 0.0
+    for fs, up in pairs:
+        hashed = DRIFT.jaccard(fs.shingle_set, up.shingle_set)
+        worst = max(worst, abs(hashed - _exact_jaccard(tokens_of(fs), tokens_of(up))))
+    check(
+        "hashed jaccard matches the exact window jaccard",
+        worst <= DRIFT.JACCARD_HASH_TOLERANCE,
+        f"worst deviation {worst} over {len(pairs)} pairs",
     )
 
 
@@ -166,6 +238,175 @@ def test_calibration_regression_guard() -> None:
     )
 
 
+def test_shingle_index_agrees_with_exhaustive_scan() -> None:
+    """The index is only an optimisation if it returns the exhaustive scan's
+    answer for every file, including which of two tied upstream files wins."""
+    if not DRIFT.UPSTREAM_SRC.is_dir():
+        check("upstream snapshot present", False, f"missing at {DRIFT.UPSTREAM_SRC}")
+        return
+
+    krites = DRIFT.load_krites_corpus()
+    upstream = DRIFT.load_upstream_corpus()
+    index = DRIFT.ShingleIndex(upstream)
+    for relpath, fs in krites.items():
+        indexed = DRIFT.global_best_match(fs, upstream, index)
+        exhaustive = DRIFT.global_best_match(fs, upstream)
+        check(f"indexed best match equals exhaustive: {relpath}", indexed == exhaustive, f"{indexed} != {exhaustive}")
+
+    tokens = DRIFT.tokenize("fn real_function_body() { call_something_here_please(); }\n" * 2)
+    twin = DRIFT.FileShingles("b.rs", Path("b.rs"), len(tokens), DRIFT.shingles(tokens))
+    tied = {"a.rs": twin, "b.rs": twin}
+    query = DRIFT.FileShingles("q.rs", Path("q.rs"), len(tokens), twin.shingle_set)
+    check(
+        "a tie keeps the first upstream file in corpus order",
+        DRIFT.global_best_match(query, tied, DRIFT.ShingleIndex(tied)).best_match == "a.rs",
+    )
+
+
+def test_upstream_cache_serves_what_a_fresh_load_computes() -> None:
+    """A cache hit must be indistinguishable from re-deriving the corpus, and a
+    corrupt entry must be recomputed rather than trusted or fatal."""
+    if not DRIFT.UPSTREAM_SRC.is_dir():
+        check("upstream snapshot present", False, f"missing at {DRIFT.UPSTREAM_SRC}")
+        return
+
+    fresh = DRIFT._load_corpus(DRIFT.UPSTREAM_SRC)
+    with _gate_cache() as cache:
+        check("cache miss returns the fresh corpus", DRIFT.load_upstream_corpus() == fresh)
+        check("cache hit returns the fresh corpus", DRIFT.load_upstream_corpus() == fresh)
+        entries = [p for p in cache.rglob("*") if p.is_file()]
+        check("one cache entry written", len(entries) == 1, f"got {entries!r}")
+        # Replaced, never rewritten in place: a live mapping of the old
+        # entry must keep reading the bytes it mapped, as with write_atomic.
+        for entry in entries:
+            DRIFT.gate_cache.write_atomic(entry, b"not a corpus")
+        check("corrupt cache entry is recomputed", DRIFT.load_upstream_corpus() == fresh)
+
+
+def test_unwritable_upstream_cache_still_answers() -> None:
+    """gate_cache.cache_dir: a gate must give the same answer without a cache,
+    and a cache it cannot write to is no cache."""
+    if not DRIFT.UPSTREAM_SRC.is_dir():
+        check("upstream snapshot present", False, f"missing at {DRIFT.UPSTREAM_SRC}")
+        return
+
+    fresh = DRIFT._load_corpus(DRIFT.UPSTREAM_SRC)
+    with _gate_cache(), mock.patch.object(DRIFT.gate_cache, "write_atomic", _refuse):
+        try:
+            corpus = DRIFT.load_upstream_corpus()
+        except OSError as exc:
+            corpus = exc
+    check("unwritable cache returns the fresh corpus", corpus == fresh, f"got {type(corpus).__name__}")
+
+
+def test_read_only_upstream_cache_keeps_other_pins_and_still_answers() -> None:
+    """A rewrite must leave another worktree's snapshot key in place, and a cache
+    directory the gate cannot write to -- read-only, or another user's -- must
+    cost it only the cache."""
+    if not DRIFT.UPSTREAM_SRC.is_dir():
+        check("upstream snapshot present", False, f"missing at {DRIFT.UPSTREAM_SRC}")
+        return
+
+    fresh = DRIFT._load_corpus(DRIFT.UPSTREAM_SRC)
+    with _gate_cache() as cache:
+        shingles = cache / DRIFT.UPSTREAM_CACHE_NAME
+        shingles.mkdir()
+        other = shingles / "other-pin.shingles"
+        other.write_bytes(b"another worktree's corpus")
+        check("cache miss returns the fresh corpus", DRIFT.load_upstream_corpus() == fresh)
+        check("another pin's corpus survives a rewrite", other.is_file())
+
+        for entry in shingles.iterdir():
+            entry.unlink()
+        other.write_bytes(b"another worktree's corpus")
+        shingles.chmod(0o500)
+        try:
+            if os.access(shingles, os.W_OK):
+                return  # root ignores the mode; nothing here can be made unwritable
+            try:
+                corpus = DRIFT.load_upstream_corpus()
+            except OSError as exc:
+                corpus = exc
+        finally:
+            shingles.chmod(0o700)
+    check("read-only cache returns the fresh corpus", corpus == fresh, f"got {corpus!r:.80}")
+
+
+def _report(**kwargs) -> tuple[int, str]:
+    out = io.StringIO()
+    with contextlib.redirect_stdout(out):
+        code = DRIFT.run_report(strict=True, **kwargs)
+    return code, out.getvalue()
+
+
+def test_changed_since_reports_exactly_what_a_full_run_does() -> None:
+    """--strict must not depend on which files an incremental run re-scored,
+    whether the per-file score cache starts cold or warm."""
+    if not DRIFT.UPSTREAM_SRC.is_dir():
+        check("upstream snapshot present", False, f"missing at {DRIFT.UPSTREAM_SRC}")
+        return
+
+    with _gate_cache():
+        cold = _report(changed_since="HEAD")
+        warm = _report(changed_since="HEAD")
+        full = _report()
+    check("cold incremental run matches a full run", cold == full)
+    check("warm incremental run matches a full run", warm == full)
+
+
+def test_score_cache_survives_other_worktrees_and_write_failures() -> None:
+    """Linked worktrees share the score cache, so a save must not wipe another
+    upstream key's scores; and an unwritable cache must not fail the gate."""
+    if not DRIFT.UPSTREAM_SRC.is_dir():
+        check("upstream snapshot present", False, f"missing at {DRIFT.UPSTREAM_SRC}")
+        return
+
+    with _gate_cache() as cache:
+        other = cache / DRIFT.SCORE_CACHE_NAME / "other-worktree.marshal"
+        other.parent.mkdir(parents=True, exist_ok=True)
+        other.write_bytes(DRIFT.marshal.dumps({}))
+        full = _report()
+        check("another worktree's scores survive a save", other.is_file())
+        for entry in (cache / DRIFT.SCORE_CACHE_NAME).iterdir():
+            entry.unlink()
+        with mock.patch.object(DRIFT.gate_cache, "write_atomic", _refuse):
+            try:
+                unwritable = _report(changed_since="HEAD")
+            except OSError as exc:
+                unwritable = exc
+    check("unwritable score cache still reports", unwritable == full, f"got {unwritable!r:.80}")
+
+
+def test_changed_since_rescores_every_file_that_moved() -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        src = root / "crates" / "krites" / "src"
+        src.mkdir(parents=True)
+        for name in ("edited.rs", "kept.rs", "staged.rs", "deleted.rs"):
+            (src / name).write_text(f"fn {name[:-3]}() {{}}\n")
+        git = ["git", "-c", "user.name=t", "-c", "user.email=t@t"]
+        subprocess.run([*git, "init", "-q"], cwd=root, check=True)
+        subprocess.run([*git, "add", "-A"], cwd=root, check=True)
+        subprocess.run([*git, "commit", "-qm", "base"], cwd=root, check=True)
+        (src / "edited.rs").write_text("fn edited_again() {}\n")
+        (src / "staged.rs").write_text("fn staged_again() {}\n")
+        subprocess.run([*git, "add", "staged.rs"], cwd=src, check=True)
+        (src / "deleted.rs").unlink()
+        (src / "untracked.rs").write_text("fn untracked() {}\n")
+        kept_blob = subprocess.run(
+            ["git", "rev-parse", "HEAD:crates/krites/src/kept.rs"],
+            cwd=root, capture_output=True, text=True, check=True,
+        ).stdout.strip()
+
+        with mock.patch.multiple(DRIFT, REPO_ROOT=root, KRITES_SRC=src):
+            unchanged = DRIFT._unchanged_since("HEAD")
+    check(
+        "only a file untouched since the ref may reuse a cached score",
+        unchanged == {"kept.rs": kept_blob},
+        f"got {unchanged!r}",
+    )
+
+
 def test_generated_exhibit_a_notice_excluded() -> None:
     # WHY(#5956): this filter keeps ordinary comment lines, and 122 of the upstream files
     # carry the MPL notice in their own header -- so a per-file notice stamped on a derived
@@ -206,7 +447,16 @@ def main() -> int:
         test_shingles_identical_text_full_overlap,
         test_shingles_disjoint_text_zero_overlap,
         test_short_stream_below_shingle_size_yields_empty_set,
+        test_shingle_hashes_are_sorted_and_unique,
+        test_hash_collisions_stay_within_tolerance,
         test_calibration_regression_guard,
+        test_shingle_index_agrees_with_exhaustive_scan,
+        test_upstream_cache_serves_what_a_fresh_load_computes,
+        test_unwritable_upstream_cache_still_answers,
+        test_read_only_upstream_cache_keeps_other_pins_and_still_answers,
+        test_changed_since_reports_exactly_what_a_full_run_does,
+        test_score_cache_survives_other_worktrees_and_write_failures,
+        test_changed_since_rescores_every_file_that_moved,
         test_generated_exhibit_a_notice_excluded,
     ]
     for t in tests:
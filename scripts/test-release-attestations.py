@@ -8,6 +8,7 @@ import json
 import subprocess
 import sys
 import tempfile
+import threading
 from pathlib import Path
 
 SCRIPT_PATH = Path(__file__).parent / "check-release-attestations.py"
@@ -129,6 +130,67 @@ def test_failed_signature_fails(root: Path) -> None:
     )
 
 
+def test_concurrent_verification_reports_in_bundle_order(root: Path) -> None:
+    in_flight = threading.Barrier(CHECKER.DEFAULT_JOBS, timeout=10)
+
+    def failing(command: list[str]) -> subprocess.CompletedProcess[str]:
+        bundle = Path(command[command.index("--bundle") + 1]).name
+        return subprocess.CompletedProcess(command, 1, stdout="", stderr=f"bad {bundle}")
+
+    def all_at_once(command: list[str]) -> subprocess.CompletedProcess[str]:
+        # Every verification must be running before any may finish.
+        in_flight.wait()
+        return failing(command)
+
+    sequential = CHECKER.check_attestations(root, TAG, SHA, REPO, runner=failing)
+    verifications: list[object] = []
+    try:
+        concurrent = CHECKER.check_attestations(
+            root,
+            TAG,
+            SHA,
+            REPO,
+            runner=all_at_once,
+            jobs=CHECKER.DEFAULT_JOBS,
+            verifications=verifications,
+        )
+    except threading.BrokenBarrierError:
+        expect(False, "verifications should run concurrently at --jobs 6")
+        return
+    expect(
+        concurrent == sequential and len(concurrent) == 6,
+        f"errors should keep bundle order at any --jobs: {concurrent} != {sequential}",
+    )
+    expect(
+        [v.bundle for v in verifications]
+        == [error.split(":", 1)[0] for error in sequential],
+        f"verifications should be recorded in bundle order: {verifications}",
+    )
+    summary = json.loads(CHECKER.summary_json(verifications, 6, 1.5))
+    expect(
+        summary["jobs"] == 6
+        and len(summary["verifications"]) == 6
+        and all(
+            not v["ok"] and v["seconds"] >= 0 and v["predicate_type"]
+            for v in summary["verifications"]
+        ),
+        f"summary should carry each verification's latency and outcome: {summary}",
+    )
+
+
+def test_unloadable_sbom_keeps_its_place_among_verifications(root: Path) -> None:
+    (root / "aletheia-linux-x86_64-1.2.3.cdx.json").write_text("{", encoding="utf-8")
+
+    def failing(command: list[str]) -> subprocess.CompletedProcess[str]:
+        return subprocess.CompletedProcess(command, 1, stdout="", stderr="bad")
+
+    errors = CHECKER.check_attestations(root, TAG, SHA, REPO, runner=failing, jobs=3)
+    expect(
+        len(errors) == 6 and "failed to load SBOM" in errors[1],
+        f"SBOM load error should stay second: {errors}",
+    )
+
+
 def run_test(test: object) -> None:
     with tempfile.TemporaryDirectory(prefix="aletheia-attestations-") as tmp:
         root = Path(tmp)
@@ -141,6 +203,8 @@ def main() -> int:
         test_all_bundles_and_policy_flags_pass,
         test_signed_sbom_mismatch_fails,
         test_failed_signature_fails,
+        test_concurrent_verification_reports_in_bundle_order,
+        test_unloadable_sbom_keeps_its_place_among_verifications,
     ):
         run_test(test)
 
@@ -12,6 +12,7 @@ import stat
 import sys
 import tarfile
 import tempfile
+import tracemalloc
 from pathlib import Path
 
 SCRIPT_PATH = Path(__file__).parent / "check-release-tarball.py"
@@ -218,6 +219,48 @@ def test_noncanonical_member_alias_fails() -> None:
     )
 
 
+def test_large_binary_is_hashed_in_constant_memory() -> None:
+    size = 24 << 20
+    with tempfile.TemporaryDirectory(prefix="aletheia-tarball-") as tmp:
+        root = Path(tmp)
+        package = _write_fixture(root)
+        binary = package / "aletheia"
+        binary.write_bytes(bytes(range(256)) * (size // 256))
+        (package / "PACKAGE-MANIFEST.txt").unlink()
+        _write_manifest(package)
+        tarball = root / "fixture.tar.gz"
+        _archive(package, tarball)
+        standalone = root / "aletheia-linux-x86_64-1.2.3"
+        standalone.write_bytes(binary.read_bytes())
+        tracemalloc.start()
+        try:
+            errors = _check_paths(tarball, SOURCE_SHA, standalone)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+    expect(not errors, f"large fixture should pass: {errors}")
+    expect(
+        peak < size // 4,
+        f"members and the standalone binary must be streamed, peak was {peak} bytes",
+    )
+
+
+def test_truncated_download_is_reported_not_raised() -> None:
+    with tempfile.TemporaryDirectory(prefix="aletheia-tarball-") as tmp:
+        root = Path(tmp)
+        package = _write_fixture(root)
+        tarball = root / "fixture.tar.gz"
+        _archive(package, tarball)
+        tarball.write_bytes(tarball.read_bytes()[:-64])
+        standalone = root / "aletheia-linux-x86_64-1.2.3"
+        standalone.write_bytes((package / "aletheia").read_bytes())
+        errors = _check_paths(tarball, SOURCE_SHA, standalone)
+    expect(
+        bool(errors) and errors[0].startswith("failed to open tarball:"),
+        f"truncated gzip stream should fail as unreadable: {errors}",
+    )
+
+
 def test_cli_files_must_remain_beneath_invocation_directory() -> None:
     with tempfile.TemporaryDirectory(prefix="aletheia-tarball-cli-") as tmp:
         parent = Path(tmp)
@@ -261,6 +304,8 @@ def main() -> int:
         test_empty_package_root_fails,
         test_embedded_binary_must_equal_standalone_asset,
         test_noncanonical_member_alias_fails,
+        test_large_binary_is_hashed_in_constant_memory,
+        test_truncated_download_is_reported_not_raised,
         test_cli_files_must_remain_beneath_invocation_directory,
     ):
         test()
@@ -21,6 +21,9 @@ The extractor is covered by these invariants:
     - doc comments immediately above a pub item are attached to it
     - fn bodies are stripped (only the signature is rendered)
     - running the extractor twice produces identical output (determinism)
+    - a crate whose source hash is unchanged is not re-parsed, and its
+      reused output is byte-identical to a full run's
+    - a --jobs run writes exactly what a serial run writes
 
 Run with:
     uv run scripts/test_llm_extract_l3.py
@@ -30,7 +33,9 @@ Exits 0 on success, 1 on first failure. Designed to be invoked by CI.
 
 from __future__ import annotations
 
+import contextlib
 import hashlib
+import io
 import importlib.util
 import sys
 import tempfile
@@ -357,6 +362,32 @@ def test_source_hash_multi_file_matches_contract(tmp: Path) -> None:
     )
 
 
+def test_source_hash_orders_paths_as_strings(tmp: Path) -> None:
+    """Files hash in crate-relative POSIX string order, as the Rust side sorts them.
+
+    Regression test: the hash used to follow Path ordering, which compares
+    components, so `src/a-b/x.rs` hashed after `src/a/x.rs` here and before it
+    in `compute_crate_source_hash`, and nous rejected the crate's L3 section
+    as stale.
+    """
+    crate_dir = tmp / "hash-order" / "fixture-crate"
+    (crate_dir / "src" / "a").mkdir(parents=True)
+    (crate_dir / "src" / "a-b").mkdir(parents=True)
+    (crate_dir / "Cargo.toml").write_text(FIXTURE_CARGO_TOML)
+    (crate_dir / "src" / "a" / "x.rs").write_text("pub fn a() {}\n")
+    (crate_dir / "src" / "a-b" / "x.rs").write_text("pub fn b() {}\n")
+
+    actual = EXTRACTOR.hash_crate_sources(crate_dir)  # type: ignore[attr-defined]
+    expected = hashlib.sha256(
+        b"src/a-b/x.rs" + b"pub fn b() {}\n" +
+        b"src/a/x.rs" + b"pub fn a() {}\n"
+    ).hexdigest()
+    expect(
+        actual == expected,
+        f"source hash does not follow the string-sorted contract: {actual} vs {expected}",
+    )
+
+
 def test_source_hash_excludes_target_dir(tmp: Path) -> None:
     """Files under a target/ directory do not contribute to the source hash."""
     crate_dir = tmp / "hash-target" / "fixture-crate"
@@ -450,6 +481,121 @@ def test_integration_test_fixtures_excluded(tmp: Path) -> None:
     )
 
 
+def _run_main_in_workspace(ws: Path, argv: list[str]) -> list[str]:
+    """Run the extractor's main() against workspace `ws`; return the crates it parsed.
+
+    Crates parsed in this process are recorded; pass `--jobs 1` to see them all.
+    """
+    parsed: list[str] = []
+    real_extract = EXTRACTOR.extract_crate  # type: ignore[attr-defined]
+
+    def recording_extract(crate_name: str, *args: object) -> object:
+        parsed.append(crate_name)
+        return real_extract(crate_name, *args)
+
+    llm_dir = ws / "_llm"
+    rebound = {
+        "REPO_ROOT": ws,
+        "CRATES_DIR": ws / "crates",
+        "LLM_DIR": llm_dir,
+        "L3_DIR": llm_dir / "L3-api-index",
+        "MANIFEST_PATH": llm_dir / "manifest.toml",
+        "WORKSPACE_CARGO": ws / "Cargo.toml",
+        "extract_crate": recording_extract,
+    }
+    original = {name: getattr(EXTRACTOR, name) for name in rebound}
+    original_argv = sys.argv
+    try:
+        for name, value in rebound.items():
+            setattr(EXTRACTOR, name, value)
+        sys.argv = ["llm-extract-l3.py", *argv]
+        with contextlib.redirect_stdout(io.StringIO()):
+            rc = EXTRACTOR.main()  # type: ignore[attr-defined]
+    finally:
+        for name, value in original.items():
+            setattr(EXTRACTOR, name, value)
+        sys.argv = original_argv
+    expect(rc == 0, f"extractor main() exited {rc} for argv {argv}")
+    return parsed
+
+
+def test_unchanged_crates_are_not_reparsed(tmp: Path) -> None:
+    """A crate whose source hash matches the manifest keeps its L3 output unparsed.
+
+    The reused output must be exactly what a full run writes, a changed crate
+    must still be re-extracted, and --force must re-extract everything.
+    """
+    ws = tmp / "incremental"
+    for name in ("alpha", "beta"):
+        crate_dir = ws / "crates" / name
+        (crate_dir / "src").mkdir(parents=True)
+        (crate_dir / "Cargo.toml").write_text(f'[package]\nname = "{name}"\nversion = "0.1.0"\n')
+        (crate_dir / "src" / "lib.rs").write_text(FIXTURE_LIB_RS)
+    (ws / "Cargo.toml").write_text('[workspace]\nmembers = ["crates/alpha", "crates/beta"]\n')
+    manifest = ws / "_llm" / "manifest.toml"
+    l3 = ws / "_llm" / "L3-api-index"
+
+    first = _run_main_in_workspace(ws, ["--jobs", "1"])
+    expect(first == ["alpha", "beta"], f"first run should parse every crate, parsed {first}")
+    full_manifest = manifest.read_text()
+    full_md = {p.name: p.read_text() for p in l3.iterdir()}
+
+    second = _run_main_in_workspace(ws, ["--jobs", "1"])
+    expect(second == [], f"unchanged crates were re-parsed: {second}")
+    expect(manifest.read_text() == full_manifest, "incremental manifest differs from a full run's")
+    expect(
+        {p.name: p.read_text() for p in l3.iterdir()} == full_md,
+        "incremental run changed unchanged crates' markdown",
+    )
+
+    (ws / "crates" / "beta" / "src" / "lib.rs").write_text(FIXTURE_LIB_RS + "\npub fn added() {}\n")
+    third = _run_main_in_workspace(ws, ["--jobs", "1"])
+    expect(third == ["beta"], f"only the changed crate should be re-parsed, parsed {third}")
+    expect("pub fn added" in (l3 / "beta.md").read_text(), "changed crate's new item missing from L3")
+
+    (l3 / "alpha.md").write_text("# L3 API Index: alpha\n\ntruncated\n")
+    fourth = _run_main_in_workspace(ws, ["--jobs", "1"])
+    expect(fourth == ["alpha"], f"an edited L3 file should be regenerated, parsed {fourth}")
+
+    forced = _run_main_in_workspace(ws, ["--force", "--jobs", "1"])
+    expect(forced == ["alpha", "beta"], f"--force should re-parse every crate, parsed {forced}")
+
+
+def test_parallel_run_matches_serial(tmp: Path) -> None:
+    """--jobs output is byte-identical to a serial run's, with a crate split
+    across several batches and workers."""
+    outputs = []
+    for jobs in ("1", "3"):
+        ws = tmp / f"jobs-{jobs}"
+        for name, files in (("alpha", 7), ("beta", 1)):
+            crate_dir = ws / "crates" / name
+            (crate_dir / "src").mkdir(parents=True)
+            (crate_dir / "Cargo.toml").write_text(f'[package]\nname = "{name}"\nversion = "0.1.0"\n')
+            (crate_dir / "src" / "lib.rs").write_text(FIXTURE_LIB_RS)
+            for n in range(files):
+                (crate_dir / "src" / f"m{n}.rs").write_text(f"/// Item {n}.\npub fn item_{n}() {{}}\n")
+        (ws / "Cargo.toml").write_text('[workspace]\nmembers = ["crates/alpha", "crates/beta"]\n')
+        original_batch = EXTRACTOR._BATCH_FILES  # type: ignore[attr-defined]
+        EXTRACTOR._BATCH_FILES = 2  # type: ignore[attr-defined]
+        try:
+            _run_main_in_workspace(ws, ["--force", "--jobs", jobs])
+        finally:
+            EXTRACTOR._BATCH_FILES = original_batch  # type: ignore[attr-defined]
+        llm = ws / "_llm"
+        outputs.append(
+            {
+                p.relative_to(llm).as_posix(): p.read_text().replace(str(ws), "<ws>")
+                for p in sorted(llm.rglob("*"))
+                if p.is_file()
+            }
+        )
+    for out in outputs:
+        manifest = out.get("manifest.toml", "")
+        out["manifest.toml"] = "\n".join(l for l in manifest.splitlines() if not l.startswith("generated_at"))
+    expect(outputs[0] == outputs[1], "--jobs 3 output differs from --jobs 1 output")
+    expect("pub fn item_6" in outputs[1].get("L3-api-index/alpha.md", ""), "parallel run lost a batch")
+
+
 # ---------------------------------------------------------------------------
 # Entry point
 # ---------------------------------------------------------------------------
@@ -471,9 +617,12 @@ def main() -> int:
         test_source_hash_stable(tmp)
         test_source_hash_changes_with_content(tmp)
         test_source_hash_multi_file_matches_contract(tmp)
+        test_source_hash_orders_paths_as_strings(tmp)
         test_source_hash_excludes_target_dir(tmp)
         test_empty_crate_produces_no_modules(tmp)
         test_integration_test_fixtures_excluded(tmp)
+        test_unchanged_crates_are_not_reparsed(tmp)
+        test_parallel_run_matches_serial(tmp)
 
     if _FAILURES:
         print(f"FAIL: {len(_FAILURES)} assertion(s) failed", file=sys.stderr)
@@ -0,0 +1,329 @@
+#!/usr/bin/env python3
+"""Benchmark the source-reading gates against a synthetic, scaled-up workspace.
+
+Nothing measured how the scripts/ gates scale as `crates/` grows -- it is
+already 30 crates and ~820k lines, and the cost of a gate that is linear in
+the tree today and quadratic tomorrow is paid on every PR. This harness builds
+a throwaway copy of the workspace at N times its current size, runs each gate
+against it a few rounds, and compares the result with a committed baseline.
+
+WHY the synthetic workspace is the real one replicated rather than generated
+Rust: the gates read more than `crates/` -- the capability matrix, the
+CONFIGURATION.md block, the workspace manifest -- and a generator would have
+to restate every input each gate expects, a second source of truth that
+drifts from what the gates actually read. Instead the tracked tree (as it is
+on disk, uncommitted edits to the gates included) is copied once, and every
+top-level crate directory except `crates/krites` is replicated N-1 times
+under `crates/<name>-x<k>`, with each copied package renamed and added to the
+workspace members. krites is left single because its matrix and provenance
+rows name its files one by one; its checks still scan every replica, since
+they count call sites across the whole of `crates/`. Every file those counts
+read is outside krites and so replicated exactly N times, which is why the
+replicated matrix's exact call-site breakdowns are multiplied by N: the
+scaled tree then passes the capability matrix as the real one does, and its
+timing is of a passing run.
+
+Each gate runs with its own empty gate cache (gate_cache.py), so round one is
+a cold run and the later rounds are warm. The regression check compares the
+warm MINIMUM: the least noisy statistic a handful of rounds gives, and the
+one that moves when the code, not the machine's load, changes. A gate whose
+declared dependencies are not installed (llm-extract-l3.py needs tree-sitter)
+is reported as skipped, never timed as a fast failure.
+
+Baselines are per-machine numbers. Refresh them on the machine that compares
+against them, and read a regression from another machine as a prompt to
+re-measure, not a verdict. --update-baseline refuses a run in which any gate
+was skipped or exited non-zero: a baseline missing a gate cannot guard it, and
+one timing a failure guards the wrong thing.
+
+Usage:
+    python3 scripts/tests/bench_gates.py [--scale N ...] [--rounds N] [--only SCRIPT]
+        [--threshold FRACTION] [--update-baseline] [--output PATH]
+"""
+
+from __future__ import annotations
+
+import argparse
+import importlib.util
+import json
+import os
+import platform
+import re
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+SCRIPTS = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(SCRIPTS))
+
+import gate_cache  # noqa: E402
+import gate_profile  # noqa: E402
+import rust_source_index  # noqa: E402
+
+REPO_ROOT = SCRIPTS.parent
+BASELINE = Path(__file__).resolve().parent / "bench_baselines.json"
+DEFAULT_SCALES = (1, 2, 10)
+DEFAULT_ROUNDS = 3
+DEFAULT_THRESHOLD = 0.25
+# A gate that finishes in a few tens of milliseconds moves by more than
+# DEFAULT_THRESHOLD on scheduler noise alone; below this absolute slowdown a
+# change is not reported as a regression.
+NOISE_FLOOR_S = 0.1
+# Crates whose files are named one by one in committed ledgers; see above.
+NOT_REPLICATED = {"krites"}
+CAPABILITY_MATRIX = Path("crates/krites/CAPABILITY_MATRIX.toml")
+# The exact per-pattern counts of an aggregate call_sites_method row, which
+# check-krites-capability-matrix.py requires to reproduce, not merely to floor.
+_BREAKDOWN = re.compile(r"(across crates/ excluding crates/krites/ \()([0-9+]+)(\))")
+
+
+@dataclass(frozen=True)
+class Bench:
+    script: str
+    args: tuple[str, ...] = ()
+    requires: tuple[str, ...] = ()
+
+    @property
+    def name(self) -> str:
+        return " ".join((self.script, *self.args))
+
+
+BENCHES = (
+    Bench("check-orphaned-modules.py"),
+    Bench("check-unfulfilled-expects.py"),
+    Bench("check-krites-capability-matrix.py"),
+    Bench("generate-configuration-doc.py", ("--check",)),
+    Bench("llm-extract-l3.py", requires=("tree_sitter", "tree_sitter_rust")),
+)
+
+
+def copy_tracked_tree(source: Path, dest: Path) -> None:
+    """Copy every tracked path of `source` as it is on disk into `dest`."""
+    listing = subprocess.run(["git", "ls-files", "-z"], cwd=source, capture_output=True, check=True).stdout
+    for rel in filter(None, os.fsdecode(listing).split("\0")):
+        src = source / rel
+        if not src.exists() and not src.is_symlink():
+            continue  # deleted in the worktree
+        target = dest / rel
+        target.parent.mkdir(parents=True, exist_ok=True)
+        shutil.copy2(src, target, follow_symlinks=False)
+
+
+_PACKAGE_NAME = re.compile(r'^(\[package\][^\[]*?^name\s*=\s*")([^"]+)(")', re.M | re.S)
+_MEMBERS = re.compile(r"^(members\s*=\s*\[)(.*?)(^\])", re.M | re.S)
+
+
+def scale_workspace(root: Path, scale: int) -> list[str]:
+    """Replicate the crates under `root` until there are `scale` copies of each.
+
+    Returns the workspace members that were added. Each replica's packages are
+    renamed `<name>-x<k>` so the workspace still has one crate per name.
+    """
+    manifest = root / "Cargo.toml"
+    text = manifest.read_text(encoding="utf-8")
+    block = _MEMBERS.search(text)
+    if block is None:
+        raise ValueError(f"{manifest}: no [workspace] members list to extend")
+    members = re.findall(r'"([^"]+)"', block.group(2))
+
+    added: list[str] = []
+    for crate_dir in sorted(p for p in (root / "crates").iterdir() if p.is_dir()):
+        if crate_dir.name in NOT_REPLICATED:
+            continue
+        inner = [m for m in members if m == f"crates/{crate_dir.name}" or m.startswith(f"crates/{crate_dir.name}/")]
+        for k in range(2, scale + 1):
+            replica = crate_dir.with_name(f"{crate_dir.name}-x{k}")
+            shutil.copytree(crate_dir, replica, symlinks=True)
+            for cargo in replica.rglob("Cargo.toml"):
+                body = cargo.read_text(encoding="utf-8")
+                cargo.write_text(_PACKAGE_NAME.sub(rf"\g<1>\g<2>-x{k}\g<3>", body, count=1), encoding="utf-8")
+            added += [f"crates/{replica.name}" + m[len(f"crates/{crate_dir.name}") :] for m in inner]
+
+    if added:
+        extra = "".join(f'    "{m}",\n' for m in added)
+        text = text[: block.end(2)] + extra + text[block.end(2) :]
+        manifest.write_text(text, encoding="utf-8")
+        scale_breakdowns(root / CAPABILITY_MATRIX, scale)
+    return added
+
+
+def scale_breakdowns(matrix: Path, scale: int) -> None:
+    """Multiply the matrix's exact call-site breakdowns by `scale`; see above."""
+    if not matrix.is_file():
+        return
+    text = matrix.read_text(encoding="utf-8")
+    scaled = _BREAKDOWN.sub(
+        lambda m: m.group(1) + "+".join(str(int(n) * scale) for n in m.group(2).split("+")) + m.group(3),
+        text,
+    )
+    matrix.write_text(scaled, encoding="utf-8")
+
+
+def make_workspace(dest: Path, scale: int) -> Path:
+    """A git checkout of this tree at `scale` times its crate count, under `dest`."""
+    root = dest / f"workspace-x{scale}"
+    copy_tracked_tree(REPO_ROOT, root)
+    scale_workspace(root, scale)
+    # The gates enumerate sources with `git ls-files`, so the replicas must be
+    # tracked; an index is enough, no commit is needed.
+    subprocess.run(["git", "init", "-q"], cwd=root, check=True)
+    subprocess.run(["git", "add", "-A"], cwd=root, check=True)
+    return root
+
+
+def missing_requirements(bench: Bench) -> list[str]:
+    return [m for m in bench.requires if importlib.util.find_spec(m) is None]
+
+
+def run_bench(bench: Bench, root: Path, rounds: int) -> dict:
+    """Time `bench` in `root` for `rounds` rounds, the first against a cold cache."""
+    scratch = Path(tempfile.mkdtemp(prefix="bench-", dir=root.parent))
+    env = {
+        k: v
+        for k, v in os.environ.items()
+        if k not in (rust_source_index.SNAPSHOT_ENV, gate_profile.PROFILE_ENV)
+    }
+    env[gate_cache.CACHE_ENV] = str(scratch / "cache")
+
+    seconds: list[float] = []
+    returncodes: set[int] = set()
+    peak_rss_kb = 0
+    for i in range(rounds):
+        profile_dir = scratch / f"profile-{i}"
+        started = time.monotonic()
+        proc = subprocess.run(
+            [sys.executable, str(root / "scripts" / bench.script), *bench.args],
+            cwd=root,
+            env=gate_profile.site_env(env, profile_dir),
+            capture_output=True,
+            check=False,
+        )
+        seconds.append(time.monotonic() - started)
+        returncodes.add(proc.returncode)
+        peak_rss_kb = max([peak_rss_kb, *(r["peak_rss_kb"] for r in gate_profile.load_records(profile_dir))])
+    shutil.rmtree(scratch, ignore_errors=True)
+
+    warm = seconds[1:] or seconds
+    return {
+        "rounds": rounds,
+        "cold_s": round(seconds[0], 4),
+        "min_s": round(min(warm), 4),
+        "median_s": round(statistics.median(warm), 4),
+        "max_s": round(max(warm), 4),
+        # Recorded, not judged: on a replicated tree a gate may legitimately
+        # report findings (a replica nobody depends on is an orphan). A code
+        # that changes between runs is still worth seeing in the diff.
+        "returncodes": sorted(returncodes),
+        "peak_rss_kb": peak_rss_kb,
+    }
+
+
+def regressions(results: dict, baseline: dict, threshold: float) -> list[str]:
+    """Every benchmark whose warm minimum slowed past `threshold` of its baseline."""
+    found = []
+    for key, now in sorted(results.items()):
+        then = baseline.get(key)
+        if then is None or "min_s" not in now or "min_s" not in then:
+            continue
+        limit = then["min_s"] * (1 + threshold)
+        if now["min_s"] > limit and now["min_s"] - then["min_s"] > NOISE_FLOOR_S:
+            found.append(f"{key}: {now['min_s']:.2f}s vs baseline {then['min_s']:.2f}s (limit {limit:.2f}s)")
+    return found
+
+
+def incomplete(results: dict) -> list[str]:
+    """Every benchmark that was skipped or timed a failing run."""
+    found = []
+    for key, r in sorted(results.items()):
+        if "skipped" in r:
+            found.append(f"{key}: skipped ({r['skipped']})")
+        elif r["returncodes"] != [0]:
+            found.append(f"{key}: exited {r['returncodes']}")
+    return found
+
+
+def machine() -> dict:
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+    }
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--scale", type=int, nargs="+", default=list(DEFAULT_SCALES), help="workspace sizes, as multiples of today's")
+    ap.add_argument("--rounds", type=int, default=DEFAULT_ROUNDS, help=f"runs per gate and scale (default {DEFAULT_ROUNDS})")
+    ap.add_argument("--only", action="append", metavar="SCRIPT", help="benchmark only this gate (repeatable)")
+    ap.add_argument("--baseline", type=Path, default=BASELINE, help="baseline JSON to compare with or update")
+    ap.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help="allowed slowdown as a fraction (default 0.25)")
+    ap.add_argument("--update-baseline", action="store_true", help="write these results as the new baseline")
+    ap.add_argument("--output", type=Path, help="also write this run's results as JSON")
+    args = ap.parse_args()
+    if min(args.scale) < 1 or args.rounds < 1:
+        ap.error("--scale and --rounds must be at least 1")
+
+    benches = [b for b in BENCHES if not args.only or b.script in args.only]
+    unknown = set(args.only or ()) - {b.script for b in BENCHES}
+    if unknown:
+        ap.error(f"no benchmark for {', '.join(sorted(unknown))}; known: {', '.join(b.script for b in BENCHES)}")
+
+    results: dict[str, dict] = {}
+    with tempfile.TemporaryDirectory(prefix="bench-gates-") as tmp:
+        for scale in sorted(set(args.scale)):
+            started = time.monotonic()
+            root = make_workspace(Path(tmp), scale)
+            print(f"x{scale}: workspace built in {time.monotonic() - started:.1f}s", flush=True)
+            for bench in benches:
+                key = f"{bench.name} @x{scale}"
+                missing = missing_requirements(bench)
+                if missing:
+                    results[key] = {"skipped": f"missing {', '.join(missing)}"}
+                    print(f"  SKIP  {key}: {results[key]['skipped']}", flush=True)
+                    continue
+                r = results[key] = run_bench(bench, root, args.rounds)
+                print(
+                    f"  {key:<52} cold {r['cold_s']:>7.2f}s  min {r['min_s']:>7.2f}s"
+                    f"  median {r['median_s']:>7.2f}s  rss {r['peak_rss_kb'] / 1024:>6.0f}MB",
+                    flush=True,
+                )
+            shutil.rmtree(root, ignore_errors=True)
+
+    document = {"machine": machine(), "results": results}
+    if args.output is not None:
+        args.output.write_text(json.dumps(document, indent=2, sort_keys=True) + "\n")
+    if args.update_baseline:
+        unfit = incomplete(results)
+        if unfit:
+            print(f"\nnot writing a baseline; {len(unfit)} benchmark(s) cannot be one:")
+            for line in unfit:
+                print(f"  - {line}")
+            return 1
+        args.baseline.write_text(json.dumps(document, indent=2, sort_keys=True) + "\n")
+        print(f"\nbaseline written to {args.baseline}")
+        return 0
+
+    try:
+        baseline = json.loads(args.baseline.read_text())
+    except FileNotFoundError:
+        print(f"\nno baseline at {args.baseline}; run with --update-baseline to create one")
+        return 0
+    if baseline.get("machine") != document["machine"]:
+        print(f"\nnote: baseline was measured on {baseline.get('machine')}; this is {document['machine']}")
+    slower = regressions(results, baseline.get("results", {}), args.threshold)
+    if slower:
+        print(f"\n{len(slower)} benchmark(s) slower than baseline by more than {args.threshold:.0%}:")
+        for line in slower:
+            print(f"  - {line}")
+        return 1
+    print(f"\nno benchmark slower than baseline by more than {args.threshold:.0%}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
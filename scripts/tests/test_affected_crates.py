@@ -0,0 +1,140 @@
+from __future__ import annotations
+
+import importlib.util
+import json
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import workspace_graph as wg  # noqa: E402
+from test_workspace_graph import fixture_metadata  # noqa: E402
+
+
+SCRIPT_PATH = Path(__file__).resolve().parents[1] / "affected-crates.py"
+SPEC = importlib.util.spec_from_file_location("affected_crates", SCRIPT_PATH)
+if SPEC is None or SPEC.loader is None:
+    raise RuntimeError(f"cannot load {SCRIPT_PATH}")
+ac = importlib.util.module_from_spec(SPEC)
+sys.modules[SPEC.name] = ac
+SPEC.loader.exec_module(ac)
+
+
+def old_affected(meta: dict, changed_ids: set[str]) -> set[str]:
+    """The BFS affected-crates.py ran over the full metadata before the cache."""
+    members = set(meta["workspace_members"])
+    rev_deps: dict[str, set[str]] = {mid: set() for mid in members}
+    for node in meta["resolve"]["nodes"]:
+        if node["id"] in members:
+            for dep in node["deps"]:
+                if dep["pkg"] in rev_deps:
+                    rev_deps[dep["pkg"]].add(node["id"])
+    affected = changed_ids & members
+    queue = list(affected)
+    while queue:
+        for rdep in rev_deps[queue.pop()]:
+            if rdep not in affected:
+                affected.add(rdep)
+                queue.append(rdep)
+    return affected
+
+
+class AffectedPackages(unittest.TestCase):
+    def setUp(self) -> None:
+        self.meta = fixture_metadata(Path("/ws"))
+        self.graph = wg.from_metadata(self.meta, "k")
+
+    def test_the_closure_answers_like_the_bfs_it_replaced(self) -> None:
+        for pkg in self.meta["packages"]:
+            with self.subTest(changed=pkg["name"]):
+                changed = str(Path(pkg["manifest_path"]).parent / "src" / "lib.rs")
+                names = {p["name"] for p in ac.affected_packages(self.graph, [changed])}
+                owner = self.graph.owners([changed]).get(changed)
+                expected = old_affected(self.meta, {owner} if owner is not None else set())
+                self.assertEqual(names, {self.graph.names[i] for i in expected})
+        self.assertEqual(
+            {p["name"] for p in ac.affected_packages(self.graph, ["crates/koina/src/lib.rs"])},
+            {"koina", "taxis", "nous"},
+        )
+
+    def test_each_package_says_whether_a_changed_file_or_a_dependency_brought_it_in(self) -> None:
+        packages = ac.affected_packages(
+            self.graph,
+            ["crates/taxis/src/lib.rs", "crates/taxis/Cargo.toml", "crates/poiesis/core/src/a.rs", "docs/x.md"],
+        )
+        self.assertEqual(
+            {p["name"]: (p["reason"], p["files"], p["via"]) for p in packages},
+            {
+                # koina dev-depends on taxis, which depends on koina: both ways round
+                "koina": ("transitive", [], ["taxis"]),
+                "nous": ("transitive", [], ["taxis"]),
+                "poiesis": ("transitive", [], ["poiesis-core"]),
+                "poiesis-core": ("direct", ["crates/poiesis/core/src/a.rs"], []),
+                "taxis": ("direct", ["crates/taxis/Cargo.toml", "crates/taxis/src/lib.rs"], []),
+            },
+        )
+
+    def test_text_order_and_membership_match_the_graph_closure(self) -> None:
+        changed = ["crates/koina/src/lib.rs"]
+        names = [p["name"] for p in ac.affected_packages(self.graph, changed)]
+        expected_ids = sorted(old_affected(self.meta, set(self.graph.owners(changed).values())))
+        self.assertEqual(names, [self.graph.names[i] for i in expected_ids])
+        self.assertEqual(ac.affected_packages(self.graph, ["README.md"]), [])
+
+
+class PlanShards(unittest.TestCase):
+    def test_slowest_first_onto_the_lightest_shard(self) -> None:
+        durations = {"a": 7.0, "b": 6.0, "c": 5.0, "d": 4.0, "e": 3.0, "f": 2.0}
+        plan = ac.plan_shards(sorted(durations), durations, 3)
+        self.assertEqual(
+            [(s["shard"], s["packages"], s["estimated_seconds"]) for s in plan],
+            [(1, ["a", "f"], 9.0), (2, ["b", "e"], 9.0), (3, ["c", "d"], 9.0)],
+        )
+        self.assertEqual(plan[0]["nextest_args"], "-p a -p f")
+
+    def test_more_shards_than_packages_emits_no_empty_leg(self) -> None:
+        """WHY: a leg with no `-p` would run nextest over the whole workspace."""
+        plan = ac.plan_shards(["a", "b"], {}, 5)
+        self.assertEqual([s["packages"] for s in plan], [["a"], ["b"]])
+        self.assertEqual(ac.plan_shards([], {}, 5), [])
+
+    def test_a_crate_without_history_is_estimated_at_the_mean(self) -> None:
+        plan = ac.plan_shards(["fast", "new", "slow"], {"fast": 2.0, "slow": 10.0}, 1)
+        self.assertEqual(plan[0]["estimated_seconds"], 18.0)
+
+
+class LoadDurations(unittest.TestCase):
+    def write(self, name: str, text: str) -> Path:
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        path = Path(tmp.name) / name
+        path.write_text(text, encoding="utf-8")
+        return path
+
+    def test_libtest_json_and_junit_runs_are_summed_per_crate_and_averaged_per_run(self) -> None:
+        events = [
+            {"type": "suite", "event": "started", "test_count": 2},
+            {"type": "test", "event": "started", "name": "koina$tests::a"},
+            {"type": "test", "event": "ok", "name": "koina$tests::a", "exec_time": 1.5},
+            {"type": "test", "event": "failed", "name": "koina::integration$b", "exec_time": 0.5},
+            {"type": "test", "event": "ok", "name": "aletheia::bin/aletheia$c", "exec_time": 4.0},
+        ]
+        libtest = self.write("run.json", "\n".join(json.dumps(e) for e in events) + "\n")
+        junit = self.write(
+            "junit.xml",
+            '<?xml version="1.0"?>\n<testsuites><testsuite name="koina">'
+            '<testcase classname="koina" name="tests::a" time="3.000"/>'
+            '<testcase classname="taxis::it" name="x" time="1.250"/>'
+            "</testsuite></testsuites>\n",
+        )
+        self.assertEqual(
+            ac.load_durations([libtest, junit]),
+            {"koina": 2.5, "aletheia": 4.0, "taxis": 1.25},
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
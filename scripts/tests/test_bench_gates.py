@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+import sys
+import tempfile
+import tomllib
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import bench_gates as bench  # noqa: E402
+
+MANIFEST = """\
+[workspace]
+resolver = "2"
+members = [
+    "crates/koina",
+    "crates/poiesis",
+    "crates/poiesis/core",
+    "crates/krites",
+]
+
+[workspace.package]
+version = "0.1.0"
+"""
+
+
+def package(name: str) -> str:
+    return f'[package]\nname = "{name}"\nversion.workspace = true\n\n[dependencies]\nname-like = "1"\n'
+
+
+class ScaleWorkspace(unittest.TestCase):
+    def setUp(self) -> None:
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.root = Path(tmp.name)
+        (self.root / "Cargo.toml").write_text(MANIFEST)
+        for rel, name in (
+            ("crates/koina", "koina"),
+            ("crates/poiesis", "poiesis"),
+            ("crates/poiesis/core", "poiesis-core"),
+            ("crates/krites", "krites"),
+        ):
+            (self.root / rel / "src").mkdir(parents=True)
+            (self.root / rel / "Cargo.toml").write_text(package(name))
+            (self.root / rel / "src" / "lib.rs").write_text("pub fn f() {}\n")
+
+    def members(self) -> list[str]:
+        return tomllib.loads((self.root / "Cargo.toml").read_text())["workspace"]["members"]
+
+    def test_every_crate_but_krites_is_replicated_as_a_renamed_member(self) -> None:
+        bench.scale_workspace(self.root, 3)
+        members = self.members()
+        for k in (2, 3):
+            for rel, name in (
+                (f"crates/koina-x{k}", f"koina-x{k}"),
+                (f"crates/poiesis-x{k}", f"poiesis-x{k}"),
+                (f"crates/poiesis-x{k}/core", f"poiesis-core-x{k}"),
+            ):
+                self.assertIn(rel, members)
+                cargo = tomllib.loads((self.root / rel / "Cargo.toml").read_text())
+                self.assertEqual(cargo["package"]["name"], name)
+                self.assertEqual(cargo["dependencies"], {"name-like": "1"})
+                self.assertTrue((self.root / rel / "src" / "lib.rs").is_file())
+        self.assertFalse((self.root / "crates" / "krites-x2").exists())
+        self.assertEqual(len(members), 4 + 2 * 3)
+
+    def test_scale_one_is_the_tree_unchanged(self) -> None:
+        self.assertEqual(bench.scale_workspace(self.root, 1), [])
+        self.assertEqual((self.root / "Cargo.toml").read_text(), MANIFEST)
+
+    def test_exact_call_site_breakdowns_scale_with_the_replicas(self) -> None:
+        """WHY: the capability matrix requires an aggregate row's breakdown to
+        reproduce exactly, and every site it counts is in a replicated crate."""
+        matrix = self.root / bench.CAPABILITY_MATRIX
+        row = (
+            'call_sites = 16\ncall_sites_method = "sum of quote-anchored grep for \'::a\', \'::b\' '
+            'across crates/ excluding crates/krites/ ({})"\n'
+        )
+        matrix.write_text(row.format("3+13"))
+        bench.scale_workspace(self.root, 3)
+        self.assertEqual(matrix.read_text(), row.format("9+39"))
+
+
+class Regressions(unittest.TestCase):
+    BASELINE = {"a @x1": {"min_s": 2.0}, "b @x1": {"min_s": 0.02}, "c @x1": {"min_s": 1.0}}
+
+    def test_only_a_slowdown_past_the_threshold_and_the_noise_floor_is_reported(self) -> None:
+        results = {
+            "a @x1": {"min_s": 2.6},  # 30% slower
+            "b @x1": {"min_s": 0.05},  # 150% slower, but by 30ms
+            "c @x1": {"min_s": 1.2},  # within 25%
+            "d @x1": {"min_s": 9.0},  # no baseline yet
+            "e @x1": {"skipped": "missing tree_sitter"},
+        }
+        found = bench.regressions(results, self.BASELINE, 0.25)
+        self.assertEqual(len(found), 1)
+        self.assertTrue(found[0].startswith("a @x1:"))
+
+    def test_a_skipped_or_failing_gate_cannot_be_a_baseline(self) -> None:
+        results = {
+            "a @x1": {"min_s": 1.0, "returncodes": [0]},
+            "b @x2": {"min_s": 1.0, "returncodes": [1]},
+            "c @x1": {"skipped": "missing tree_sitter"},
+        }
+        self.assertEqual(
+            bench.incomplete(results),
+            ["b @x2: exited [1]", "c @x1: skipped (missing tree_sitter)"],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
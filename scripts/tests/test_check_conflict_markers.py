@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+import importlib.util
+import re
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+SCRIPT_PATH = Path(__file__).resolve().parents[1] / "check-conflict-markers.py"
+SPEC = importlib.util.spec_from_file_location("check_conflict_markers", SCRIPT_PATH)
+if SPEC is None or SPEC.loader is None:
+    raise RuntimeError(f"cannot load {SCRIPT_PATH}")
+cm = importlib.util.module_from_spec(SPEC)
+sys.modules[SPEC.name] = cm
+SPEC.loader.exec_module(cm)
+
+# The definition the bytes scanner replaced: decode, split into lines, match each.
+LINE_MARKERS = (
+    re.compile(r"^<{7}(?: |$)"),
+    re.compile(r"^={7}$"),
+    re.compile(r"^>{7}(?: |$)"),
+    re.compile(r"^\|{7}(?: |$)"),
+)
+
+
+def line_scan(raw: bytes) -> tuple[int, str] | None:
+    for lineno, line in enumerate(raw.decode("utf-8", "replace").splitlines(), 1):
+        if any(m.match(line) for m in LINE_MARKERS):
+            return lineno, line[:60]
+    return None
+
+
+class FirstMarker(unittest.TestCase):
+    def test_bytes_scan_agrees_with_the_line_by_line_definition(self) -> None:
+        """WHY: the speed-up must not change what counts as a marker line,
+        including after the line breaks splitlines() honours beyond \\n."""
+        cases = [
+            b"",
+            b"clean\n",
+            b"<<<<<<< HEAD\nours\n=======\ntheirs\n>>>>>>> branch\n",
+            b"a\n=======\n",
+            b"a\r\n=======\r\nb",
+            b"a\r=======\rb",
+            b"=======",
+            b"========\n",
+            b"<<<<<<<< no\n<<<<<<<x no\n",
+            b"x <<<<<<< mid-line\n",
+            b"|||||||\n",
+            b"||||||| base\n",
+            b">>>>>>>",
+            b"a\x0b=======\n",
+            b"a\x0c<<<<<<< HEAD\n",
+            b"a\x1d>>>>>>> b\n",
+            "a\u0085=======\n".encode(),
+            "a\u2028=======\n".encode(),
+            "a\u2029||||||| base\n".encode(),
+            "a\u2005=======\n".encode(),  # U+2005 is a space, not a line break
+            b"a\x85=======\n",  # a lone continuation byte decodes to U+FFFD
+            b"\xe2\x80=======\n",
+            b"\xff\xfe\n<<<<<<< " + "\u00e9".encode() * 80 + b"\n",
+            b"one\n\ntwo\r\n\rthree\n=======\n",
+        ]
+        for raw in cases:
+            with self.subTest(raw=raw):
+                self.assertEqual(cm.first_marker(raw), line_scan(raw))
+
+
+class ScanFile(unittest.TestCase):
+    def setUp(self) -> None:
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.root = Path(tmp.name)
+        patch = mock.patch.object(cm, "REPO_ROOT", self.root)
+        patch.start()
+        self.addCleanup(patch.stop)
+
+    def test_reports_the_first_marker_with_its_line(self) -> None:
+        (self.root / "a.md").write_bytes(b"x\n<<<<<<< HEAD\ny\n=======\n")
+        self.assertEqual(cm.scan_file("a.md"), "a.md:2: conflict marker: <<<<<<< HEAD")
+
+    def test_binary_empty_and_missing_files_are_skipped(self) -> None:
+        (self.root / "bin").write_bytes(b"\x00=======\n")
+        (self.root / "empty").write_bytes(b"")
+        for rel in ("bin", "empty", "missing"):
+            with self.subTest(rel=rel):
+                self.assertIsNone(cm.scan_file(rel))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,9 +1,12 @@
 from __future__ import annotations
 
 import importlib.util
+import json
+import os
 import sys
 import tempfile
 import unittest
+from contextlib import AbstractContextManager
 from pathlib import Path
 from unittest import mock
 
@@ -15,6 +18,11 @@ eg = importlib.util.module_from_spec(SPEC)
 sys.modules[SPEC.name] = eg
 SPEC.loader.exec_module(eg)
 
+sys.path.insert(0, str(SCRIPT_PATH.parent))
+
+import gate_cache  # noqa: E402
+import gh_issues  # noqa: E402
+
 SEND = 'pub async fn f(c: &reqwest::Client) { let _ = c.get("https://x").send().await; }\n'
 
 
@@ -121,7 +129,7 @@ class Accounting(unittest.TestCase):
     def test_a_tracked_site_passes_while_its_issue_is_open(self) -> None:
         with tempfile.TemporaryDirectory() as tmp:
             root = self._tree(tmp, ["known.rs"])
-            with mock.patch.object(eg, "open_issue", lambda _n: True):
+            with mock.patch.object(eg, "open_issues", lambda ns: dict.fromkeys(ns, True)):
                 rc = self._main_over(root, tracked={"crates/organon/src/known.rs": 1})
             self.assertEqual(rc, 0)
 
@@ -130,7 +138,7 @@ class Accounting(unittest.TestCase):
         exemption nobody agreed to."""
         with tempfile.TemporaryDirectory() as tmp:
             root = self._tree(tmp, ["known.rs"])
-            with mock.patch.object(eg, "open_issue", lambda _n: False):
+            with mock.patch.object(eg, "open_issues", lambda ns: dict.fromkeys(ns, False)):
                 rc = self._main_over(root, tracked={"crates/organon/src/known.rs": 1})
             self.assertEqual(rc, 1)
 
@@ -154,11 +162,37 @@ class Accounting(unittest.TestCase):
         around, and a tracked entry is already a recorded state."""
         with tempfile.TemporaryDirectory() as tmp:
             root = self._tree(tmp, ["known.rs"])
-            failed = mock.Mock(returncode=1, stdout=b"")
-            with mock.patch.object(eg.subprocess, "run", return_value=failed):
+            with self._github(tmp, None):
+                rc = self._main_over(root, tracked={"crates/organon/src/known.rs": 1})
+            self.assertEqual(rc, 0)
+
+    def test_an_outage_does_not_revive_a_stale_cached_closed_answer(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            root = self._tree(tmp, ["known.rs"])
+            with self._github(tmp, {"1": {"number": 1, "state": "CLOSED"}}):
+                self.assertEqual(eg.open_issues([1]), {1: False})
+            store = Path(tmp) / "cache" / gh_issues.CACHE_NAME / gh_issues.CACHE_FILE
+            entries = json.loads(store.read_text(encoding="utf-8"))
+            for entry in entries.values():
+                entry["fetched_at"] -= 30 * 24 * 3600  # weeks old: no longer an answer
+            store.write_text(json.dumps(entries), encoding="utf-8")
+            with self._github(tmp, None):
+                self.assertEqual(eg.open_issues([1]), {1: True})
                 rc = self._main_over(root, tracked={"crates/organon/src/known.rs": 1})
             self.assertEqual(rc, 0)
 
+    @staticmethod
+    def _github(tmp: str, issues: dict | None) -> AbstractContextManager[object]:
+        """Stand GitHub in with a fixture; None is GitHub being unreachable."""
+        fixture = Path(tmp) / "gh-fixture.json"
+        fixture.unlink(missing_ok=True)
+        if issues is not None:
+            fixture.write_text(json.dumps(issues), encoding="utf-8")
+        return mock.patch.dict(
+            os.environ,
+            {gh_issues.FIXTURE_ENV: str(fixture), gate_cache.CACHE_ENV: str(Path(tmp) / "cache")},
+        )
+
 
 if __name__ == "__main__":
     unittest.main()
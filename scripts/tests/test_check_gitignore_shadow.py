@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+import importlib.util
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import tracked_files  # noqa: E402
+
+SCRIPT_PATH = Path(__file__).resolve().parents[1] / "check-gitignore-shadow.py"
+SPEC = importlib.util.spec_from_file_location("check_gitignore_shadow", SCRIPT_PATH)
+if SPEC is None or SPEC.loader is None:
+    raise RuntimeError(f"cannot load {SCRIPT_PATH}")
+shadow = importlib.util.module_from_spec(SPEC)
+sys.modules[SPEC.name] = shadow
+SPEC.loader.exec_module(shadow)
+
+
+class IgnoreMatches(unittest.TestCase):
+    def setUp(self) -> None:
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.root = Path(tmp.name).resolve()
+        env = mock.patch.dict(os.environ)
+        env.start()
+        self.addCleanup(env.stop)
+        os.environ.pop(tracked_files.SNAPSHOT_ENV, None)
+        subprocess.run(["git", "init", "-q"], cwd=self.root, check=True)
+        files = ["data/a.toml", "data/b.toml", "keep.log", "x.log", "src/lib.rs", "spaced name.txt"]
+        for rel in files:
+            (self.root / rel).parent.mkdir(parents=True, exist_ok=True)
+            (self.root / rel).write_text("x\n", encoding="utf-8")
+        subprocess.run(["git", "add", "--", *files], cwd=self.root, check=True)
+        (self.root / ".gitignore").write_text("data/\n*.log\n!keep.log\nspaced*\n", encoding="utf-8")
+
+    def test_one_check_ignore_process_attributes_every_shadowed_path(self) -> None:
+        real_run = subprocess.run
+        check_ignores: list[list[str]] = []
+
+        def counting_run(argv: list[str], **kwargs: object) -> subprocess.CompletedProcess:
+            if argv[:2] == ["git", "check-ignore"]:
+                check_ignores.append(argv)
+            return real_run(argv, **kwargs)
+
+        with mock.patch.object(shadow.subprocess, "run", counting_run):
+            matches = shadow.ignore_matches(self.root)
+        self.assertEqual(len(check_ignores), 1)
+        self.assertEqual(
+            shadow.by_rule(matches),
+            {
+                ".gitignore:1:data/": ["data/a.toml", "data/b.toml"],
+                ".gitignore:4:spaced*": ["spaced name.txt"],
+                ".gitignore:2:*.log": ["x.log"],
+            },
+        )
+
+    def test_a_path_re_included_by_a_negation_is_not_shadowed(self) -> None:
+        """WHY: `-v` names the negation that last matched keep.log; without `-v`
+        check-ignore would not have listed it at all."""
+        self.assertNotIn("keep.log", [match.path for match in shadow.ignore_matches(self.root)])
+
+    def test_nothing_matched_is_an_empty_answer(self) -> None:
+        (self.root / ".gitignore").write_text("target/\n", encoding="utf-8")
+        self.assertEqual(shadow.ignore_matches(self.root), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
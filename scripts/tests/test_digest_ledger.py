@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+import hashlib
+import io
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import digest_ledger  # noqa: E402
+import gate_cache  # noqa: E402
+
+
+class Ledger(unittest.TestCase):
+    def setUp(self) -> None:
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.tmp = Path(tmp.name)
+        env = mock.patch.dict(os.environ, {gate_cache.CACHE_ENV: str(self.tmp / "cache")})
+        env.start()
+        self.addCleanup(env.stop)
+        digest_ledger._ledger.cache_clear()
+        self.addCleanup(digest_ledger._ledger.cache_clear)
+        self.asset = self.tmp / "aletheia-linux-x86_64-1.2.3"
+        self.asset.write_bytes(b"binary" * 1000)
+
+    def hashed(self, path: Path) -> tuple[digest_ledger.Digest, int]:
+        """The digest, and how many times the file's bytes were actually read."""
+        real_stream = digest_ledger._stream
+        reads: list[int] = []
+
+        def counting_stream(handle: io.BufferedReader) -> digest_ledger.Digest:
+            reads.append(1)
+            return real_stream(handle)
+
+        with mock.patch.object(digest_ledger, "_stream", counting_stream):
+            return digest_ledger.sha256_path(path), len(reads)
+
+    def test_an_asset_is_hashed_once_across_validators(self) -> None:
+        expected = digest_ledger.Digest(hashlib.sha256(self.asset.read_bytes()).hexdigest(), 6000)
+        self.assertEqual(self.hashed(self.asset), (expected, 1))
+        self.assertEqual(self.hashed(self.asset), (expected, 0))
+        digest_ledger._ledger.cache_clear()  # the next validator is a new process
+        self.assertEqual(self.hashed(self.asset), (expected, 0))
+
+    def test_a_rewrite_is_hashed_again_even_with_its_mtime_restored(self) -> None:
+        digest_ledger.sha256_path(self.asset)
+        before = self.asset.stat()
+        self.asset.write_bytes(b"BINARY" * 1000)
+        os.utime(self.asset, ns=(before.st_atime_ns, before.st_mtime_ns))
+        digest, reads = self.hashed(self.asset)
+        self.assertEqual((digest.sha256, reads), (hashlib.sha256(b"BINARY" * 1000).hexdigest(), 1))
+
+    def test_entries_for_deleted_files_are_dropped_on_the_next_write(self) -> None:
+        gone = self.tmp / "gone"
+        gone.write_bytes(b"x")
+        digest_ledger.sha256_path(gone)
+        gone.unlink()
+        digest_ledger.sha256_path(self.asset)
+        _, entries = digest_ledger._ledger()
+        self.assertEqual([entry["path"] for entry in entries.values()], [str(self.asset)])
+
+    def test_a_handle_without_a_file_is_simply_hashed(self) -> None:
+        self.assertEqual(
+            digest_ledger.sha256_file(io.BytesIO(b"abc")),
+            digest_ledger.Digest(hashlib.sha256(b"abc").hexdigest(), 3),
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+import importlib.util
+import os
+import subprocess
+import sys
+import tempfile
+import textwrap
+import unittest
+from pathlib import Path
+
+SCRIPTS = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(SCRIPTS))
+
+import gate_profile  # noqa: E402
+
+SCRIPT_PATH = SCRIPTS / "run-gate-coverage.py"
+SPEC = importlib.util.spec_from_file_location("run_gate_coverage", SCRIPT_PATH)
+if SPEC is None or SPEC.loader is None:
+    raise RuntimeError(f"cannot load {SCRIPT_PATH}")
+RUN = importlib.util.module_from_spec(SPEC)
+sys.modules[SPEC.name] = RUN
+SPEC.loader.exec_module(RUN)
+
+# A stand-in gate: reads one file, spawns one process, marks one phase.
+GATE = textwrap.dedent(
+    """
+    import subprocess, sys
+    sys.path.insert(0, {scripts!r})
+    import gate_profile
+    with gate_profile.span("phase"):
+        open(sys.argv[1]).read()
+        subprocess.run(["true"], check=True)
+    """
+)
+
+
+class Records(unittest.TestCase):
+    def setUp(self) -> None:
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.tmp = Path(tmp.name)
+        self.gate = self.tmp / "gate.py"
+        self.gate.write_text(GATE.format(scripts=str(SCRIPTS)))
+        self.data = self.tmp / "data.txt"
+        self.data.write_text("x" * 10_000)
+        self.env = {k: v for k, v in os.environ.items() if k != gate_profile.PROFILE_ENV}
+
+    def run_gate(self, argv: list[str], env: dict[str, str]) -> None:
+        subprocess.run([sys.executable, *argv], env=env, check=True, cwd=self.tmp)
+
+    def assert_one_record(self, out: Path) -> dict:
+        records = gate_profile.load_records(out)
+        self.assertEqual(len(records), 1)
+        record = records[0]
+        self.assertTrue(record["script"].endswith("gate.py"))
+        self.assertEqual(record["argv"], [str(self.data)])
+        self.assertGreaterEqual(record["files_read"], 2)  # the gate itself and its data
+        self.assertEqual(record["subprocesses"], 1)
+        self.assertEqual([s["name"] for s in record["spans"]], ["phase"])
+        self.assertGreater(record["wall_s"], 0)
+        self.assertGreater(record["peak_rss_kb"], 0)
+        if record["bytes_read"] is not None:
+            self.assertGreaterEqual(record["bytes_read"], 10_000)
+        return record
+
+    def test_the_site_hook_profiles_a_gate_that_was_not_edited_for_it(self) -> None:
+        """WHY: the hook is what makes the profile cover every entry point; a
+        gate must not have to opt in to be measured."""
+        out = self.tmp / "out"
+        self.run_gate([str(self.gate), str(self.data)], gate_profile.site_env(self.env, out))
+        self.assert_one_record(out)
+
+    def test_the_runner_shares_its_recorder_with_the_gate(self) -> None:
+        """WHY: a second, never-installed copy of the module would swallow
+        every span the gate marks."""
+        out = self.tmp / "out"
+        env = {**self.env, gate_profile.PROFILE_ENV: str(out)}
+        self.run_gate([str(SCRIPTS / "gate_profile.py"), str(self.gate), str(self.data)], env)
+        self.assert_one_record(out)
+
+    def test_nothing_is_written_without_the_env_var(self) -> None:
+        self.run_gate([str(self.gate), str(self.data)], self.env)
+        self.assertEqual(list(self.tmp.rglob("*.json")), [])
+
+
+class Summary(unittest.TestCase):
+    @staticmethod
+    def record(pid: int, ppid: int, cpu: float, children: float, spans: list[dict] | None = None) -> dict:
+        return {
+            "pid": pid,
+            "ppid": ppid,
+            "cpu_user_s": cpu,
+            "cpu_sys_s": 0.0,
+            "cpu_children_s": children,
+            "peak_rss_kb": pid,
+            "files_read": 1,
+            "bytes_read": None,
+            "subprocesses": 1,
+            "spans": spans or [],
+        }
+
+    def test_a_nested_gate_is_not_counted_twice(self) -> None:
+        """WHY: the outer process's children counter already includes the
+        inner gate's CPU, which has its own record too."""
+        records = [
+            self.record(10, 1, 1.0, 3.0, [{"name": "a", "start_s": 0, "seconds": 0.5}]),
+            self.record(20, 10, 2.0, 0.0, [{"name": "a", "start_s": 0, "seconds": 0.25}]),
+        ]
+        summary = RUN.summarize_profile(records)
+        self.assertEqual(summary["cpu_s"], 4.0)  # 1 + 2 own, plus 1 of non-Python children
+        self.assertEqual(summary["peak_rss_kb"], 20)
+        self.assertEqual(summary["processes"], 2)
+        self.assertEqual(summary["bytes_read"], 0)
+        self.assertEqual(summary["spans"], {"a": 0.75})
+
+
+if __name__ == "__main__":
+    unittest.main()
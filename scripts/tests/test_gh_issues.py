@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import gate_cache  # noqa: E402
+import gh_issues  # noqa: E402
+
+
+def issue(number: int, state: str = "OPEN") -> dict[str, object]:
+    return {"number": number, "state": state, "labels": {"nodes": []}}
+
+
+class Fetch(unittest.TestCase):
+    def setUp(self) -> None:
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.fixture = Path(tmp.name) / "issues.json"
+        env = mock.patch.dict(
+            os.environ,
+            {gate_cache.CACHE_ENV: str(Path(tmp.name) / "cache"), gh_issues.FIXTURE_ENV: str(self.fixture)},
+        )
+        env.start()
+        self.addCleanup(env.stop)
+
+    def stand_in(self, issues: dict[str, object]) -> None:
+        self.fixture.write_text(json.dumps(issues), encoding="utf-8")
+
+    def test_a_fresh_answer_is_served_from_the_cache_and_a_stale_one_is_asked_again(self) -> None:
+        self.stand_in({"1": issue(1), "2": None})
+        self.assertEqual(gh_issues.fetch([2, 1, 1]), {1: issue(1), 2: None})
+        self.fixture.unlink()  # GitHub is gone; the cache still answers
+        self.assertEqual(gh_issues.fetch([1, 2]), {1: issue(1), 2: None})
+        with self.assertRaises(gh_issues.GhError):
+            gh_issues.fetch([1], max_age=0)
+        self.stand_in({"1": issue(1, "CLOSED")})
+        self.assertEqual(gh_issues.fetch([1], max_age=0), {1: issue(1, "CLOSED")})
+
+
+class GraphQL(unittest.TestCase):
+    def setUp(self) -> None:
+        env = mock.patch.dict(os.environ)
+        env.start()
+        self.addCleanup(env.stop)
+        os.environ.pop(gh_issues.FIXTURE_ENV, None)
+
+    def run_gh(self, stdout: str, returncode: int = 0) -> tuple[dict, list[list[str]]]:
+        calls: list[list[str]] = []
+
+        def fake_run(argv: list[str], **_kwargs: object) -> subprocess.CompletedProcess:
+            calls.append(argv)
+            return subprocess.CompletedProcess(argv, returncode, stdout, "boom")
+
+        with mock.patch.object(gh_issues.subprocess, "run", fake_run):
+            found = gh_issues._query("forkwright/aletheia", list(range(1, 13)))
+        return found, calls
+
+    def test_a_dozen_issues_are_one_round_trip(self) -> None:
+        answer = {"data": {"repository": {f"i{n}": issue(n) for n in range(1, 13)}}}
+        found, calls = self.run_gh(json.dumps(answer))
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(found[12], issue(12))
+        query = next(arg for arg in calls[0] if arg.startswith("query="))
+        self.assertIn("i7:issue(number:7){...issueFields}", query)
+        self.assertEqual(query.count("{"), query.count("}"))
+
+    def test_a_number_that_is_not_an_issue_does_not_sink_the_others(self) -> None:
+        """WHY: GitHub answers null plus an `errors` entry for it and gh exits 1."""
+        answer = {
+            "data": {"repository": {f"i{n}": (None if n == 5 else issue(n)) for n in range(1, 13)}},
+            "errors": [{"type": "NOT_FOUND", "path": ["repository", "i5"]}],
+        }
+        found, _ = self.run_gh(json.dumps(answer), returncode=1)
+        self.assertIsNone(found[5])
+        self.assertEqual(found[6], issue(6))
+
+    def test_no_answer_at_all_is_an_error_not_an_empty_result(self) -> None:
+        for stdout in ("", "not json", json.dumps({"data": {"repository": None}, "errors": []})):
+            with self.subTest(stdout=stdout), self.assertRaises(gh_issues.GhError):
+                self.run_gh(stdout, returncode=1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,165 @@
+from __future__ import annotations
+
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import gate_cache  # noqa: E402
+import rust_module_graph as rmg  # noqa: E402
+import rust_source_index as rsi  # noqa: E402
+
+
+def mods(text: str) -> list[rmg.ModDecl]:
+    return list(rmg.scan(text).mods)
+
+
+class Scan(unittest.TestCase):
+    def test_a_mod_shaped_string_is_not_a_declaration(self) -> None:
+        """WHY: a test fixture handing a synthetic source over as a string was
+        read as a real `mod foo;` (crates/gnosis/src/index_tests.rs)."""
+        self.assertEqual(mods('std::fs::write(&p, "pub mod foo;\\npub fn keep() {}").unwrap();'), [])
+        self.assertEqual([d.name for d in mods('let s = r#"mod fake; "#;\nmod after;\n')], ["after"])
+
+    def test_a_path_attribute_value_survives_literal_blanking(self) -> None:
+        """WHY: blanking every literal also blanked `#[path]`'s, reporting a
+        correctly wired file as unresolved."""
+        (decl,) = mods('#[cfg(test)]\n#[path = "providers_dto.rs"]\npub(crate) mod providers_dto;\n')
+        self.assertEqual(decl.path_attr, "providers_dto.rs")
+        self.assertEqual(decl.attrs, ("cfg(test)", 'path = "providers_dto.rs"'))
+        self.assertEqual(decl.line, 3)
+
+    def test_inline_mods_nest_and_a_char_brace_does_not_close_them(self) -> None:
+        """WHY: an unblanked `'}'` popped `outer` early, so `inner` was looked
+        for in the wrong directory (crates/taxis/src/interpolate.rs)."""
+        (decl,) = mods("mod outer {\n    fn f(c: char) { if c == '}' { } }\n    mod inner;\n}\n")
+        self.assertEqual((decl.name, decl.virtual_path, decl.top_level), ("inner", ("outer",), False))
+
+    def test_a_lifetime_is_not_a_char_literal(self) -> None:
+        self.assertEqual([d.name for d in mods("fn f<'a>(x: &'a str) -> &'a str { x }\nmod after;\n")], ["after"])
+
+    def test_a_declaration_inside_a_macro_is_not_top_level(self) -> None:
+        (decl,) = mods("cfg_if! {\n    if #[cfg(unix)] { mod sys; }\n}\n")
+        self.assertEqual((decl.virtual_path, decl.top_level), ((), False))
+
+    def test_declarations_after_unbalanced_delimiters_are_marked(self) -> None:
+        first, second = mods("mod a;\n)\nmod b;\n")
+        self.assertTrue(first.top_level)
+        self.assertIsNone(second.top_level)
+
+    def test_an_unreadable_path_attribute_is_recorded_not_raised(self) -> None:
+        (decl,) = mods('#[cfg_attr(unix, path = "u.rs")]\nmod m;\n')
+        self.assertIsNone(decl.path_attr)
+        self.assertIn("cfg_attr", decl.path_error)
+
+    def test_includes_and_inner_attributes_are_recorded(self) -> None:
+        node = rmg.scan('#![cfg(feature = "x")]\n#[cfg(test)]\ninclude!("gen.rs");\n')
+        self.assertEqual(node.inner_attrs, ('cfg(feature = "x")',))
+        self.assertEqual(node.includes, (rmg.Include(3, ("cfg(test)",), True),))
+
+
+class Resolution(unittest.TestCase):
+    def decl(self, text: str) -> rmg.ModDecl:
+        (decl,) = mods(text)
+        return decl
+
+    def test_path_is_relative_to_the_file_outside_an_inline_mod_and_the_module_inside(self) -> None:
+        """WHY: the Rust reference's rule, and the one place the declaring
+        file's directory and its module directory part ways."""
+        src = Path("/c/src")
+        outside = self.decl('#[path = "t.rs"]\nmod tests;\n')
+        inside = self.decl('mod outer {\n    #[path = "t.rs"]\n    mod tests;\n}\n')
+        self.assertEqual(rmg.candidates(src / "a.rs", outside, False), (src / "t.rs",))
+        self.assertEqual(rmg.candidates(src / "a.rs", inside, False), (src / "a" / "outer" / "t.rs",))
+        self.assertEqual(rmg.candidates(src / "mod.rs", inside, False), (src / "outer" / "t.rs",))
+
+    def test_a_crate_root_owns_its_directory(self) -> None:
+        decl = self.decl("mod helper;\n")
+        tool = Path("/c/src/bin/tool.rs")
+        self.assertEqual(rmg.candidates(tool, decl, True)[0], Path("/c/src/bin/helper.rs"))
+        self.assertEqual(rmg.candidates(tool, decl, False)[0], Path("/c/src/bin/tool/helper.rs"))
+
+    def test_crate_roots_are_cargo_targets_of_a_package(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            pkg = Path(tmp).resolve() / "pkg"
+            pkg.mkdir()
+            (pkg / "Cargo.toml").write_text("[package]\n")
+            for rel, root in (
+                ("src/lib.rs", True),
+                ("src/bin/tool.rs", True),
+                ("src/bin/tool/main.rs", True),
+                ("tests/it.rs", True),
+                ("build.rs", True),
+                ("src/a.rs", False),
+                ("src/tests/x.rs", False),
+                ("src/bin/tool/helper.rs", False),
+            ):
+                with self.subTest(rel=rel):
+                    self.assertEqual(rmg.is_crate_root(pkg / rel), root)
+
+
+class Caching(unittest.TestCase):
+    def setUp(self) -> None:
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.root = Path(tmp.name).resolve() / "repo"
+        self.root.mkdir()
+        env = mock.patch.dict(os.environ, {gate_cache.CACHE_ENV: str(Path(tmp.name) / "cache")})
+        env.start()
+        self.addCleanup(env.stop)
+        os.environ.pop(rsi.SNAPSHOT_ENV, None)
+        subprocess.run(["git", "init", "-q"], cwd=self.root, check=True)
+        self.write({"src/lib.rs": "mod a;\n", "src/a.rs": "mod b;\n", "src/a/b.rs": "fn b() {}\n"})
+
+    def write(self, files: dict[str, str]) -> None:
+        for name, body in files.items():
+            path = self.root / name
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(body, encoding="utf-8")
+        subprocess.run(["git", "add", "-A"], cwd=self.root, check=True)
+
+    def build(self) -> tuple[rmg.ModuleGraph, list[str]]:
+        scanned: list[str] = []
+        real_scan = rmg.scan
+
+        def counting_scan(raw: str, clean: str | None = None) -> rmg.FileModules:
+            scanned.append(raw)
+            return real_scan(raw, clean)
+
+        with mock.patch.object(rmg, "scan", counting_scan):
+            graph = rmg.build(rsi.build(self.root))
+        return graph, scanned
+
+    def test_an_unchanged_tree_is_not_lexed_again_and_a_change_relexes_only_its_blob(self) -> None:
+        first, scanned = self.build()
+        self.assertEqual(len(scanned), 3)
+        second, scanned = self.build()
+        self.assertEqual((scanned, second.tree), ([], first.tree))
+        (self.root / "src" / "a.rs").write_text("mod b;\nmod c;\n", encoding="utf-8")
+        third, scanned = self.build()
+        self.assertEqual(scanned, ["mod b;\nmod c;\n"])
+        self.assertNotEqual(third.tree, first.tree)
+        self.assertEqual(
+            [d.name for d in third.node(self.root / "src" / "a.rs").mods], ["b", "c"]
+        )
+
+    def test_resolution_sees_untracked_files_and_the_cached_graph_answers_like_a_fresh_one(self) -> None:
+        self.build()
+        graph, _ = self.build()
+        (self.root / "src" / "new.rs").write_text("mod inner;\n", encoding="utf-8")
+        lib = self.root / "src" / "lib.rs"
+        a = self.root / "src" / "a.rs"
+        (b,) = graph.node(a).mods
+        self.assertEqual(graph.resolve(a, b, False), self.root / "src" / "a" / "b.rs")
+        (inner,) = graph.node(self.root / "src" / "new.rs").mods
+        self.assertIsNone(graph.resolve(self.root / "src" / "new.rs", inner, False))
+        self.assertEqual(graph.node(lib), rmg.scan("mod a;\n"))
+
+
+if __name__ == "__main__":
+    unittest.main()
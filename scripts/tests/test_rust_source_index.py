@@ -0,0 +1,212 @@
+from __future__ import annotations
+
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import gate_cache  # noqa: E402
+import rust_source_index as rsi  # noqa: E402
+
+
+class SnapshotTestCase(unittest.TestCase):
+    def setUp(self) -> None:
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.root = Path(tmp.name).resolve() / "repo"
+        self.root.mkdir()
+        cache = Path(tmp.name) / "cache"
+        env = mock.patch.dict(os.environ, {gate_cache.CACHE_ENV: str(cache)})
+        env.start()
+        self.addCleanup(env.stop)
+        os.environ.pop(rsi.SNAPSHOT_ENV, None)
+        subprocess.run(["git", "init", "-q"], cwd=self.root, check=True)
+
+    def track(self, files: dict[str, str]) -> None:
+        for name, body in files.items():
+            path = self.root / name
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(body, encoding="utf-8")
+        subprocess.run(["git", "add", "-A"], cwd=self.root, check=True)
+
+
+class Building(SnapshotTestCase):
+    def test_only_tracked_rust_files_are_snapshotted(self) -> None:
+        self.track({"a.rs": "fn a() {}\n", "notes.md": "x\n", "crates/x/src/lib.rs": "fn b() {}\n"})
+        (self.root / "scratch.rs").write_text("fn s() {}\n", encoding="utf-8")
+        index = rsi.build(self.root)
+        self.assertEqual(index.paths(), ["a.rs", "crates/x/src/lib.rs"])
+
+    def test_pattern_star_crosses_directories_like_a_git_pathspec(self) -> None:
+        """WHY: gates passed `crates/*.rs` to `git ls-files`, where `*` matches
+        `/` too. A glob that stopped at one level would silently drop every
+        nested source file from those gates."""
+        self.track({"a.rs": "", "crates/x/src/deep/mod.rs": ""})
+        self.assertEqual(rsi.build(self.root).paths("crates/*.rs"), ["crates/x/src/deep/mod.rs"])
+
+    def test_a_dirty_file_is_read_from_the_worktree_with_its_own_blob_sha(self) -> None:
+        """WHY: the snapshot must show a gate what it would have read from disk.
+        Serving the staged blob would let a local run pass on code that is no
+        longer there."""
+        self.track({"a.rs": "fn old() {}\n"})
+        (self.root / "a.rs").write_text("fn new() {}\n", encoding="utf-8")
+        entry = rsi.build(self.root).get("a.rs")
+        assert entry is not None
+        self.assertEqual(entry.text, "fn new() {}\n")
+        expected = subprocess.run(
+            ["git", "hash-object", "a.rs"], cwd=self.root, capture_output=True, text=True, check=True
+        ).stdout.strip()
+        self.assertEqual(entry.blob, expected)
+
+    def test_a_clean_file_keys_on_the_blob_git_already_knows(self) -> None:
+        self.track({"a.rs": "fn a() {}\n"})
+        staged = subprocess.run(
+            ["git", "ls-files", "-s", "a.rs"], cwd=self.root, capture_output=True, text=True, check=True
+        ).stdout.split()[1]
+        entry = rsi.build(self.root).get("a.rs")
+        assert entry is not None
+        self.assertEqual(entry.blob, staged)
+
+    def test_a_file_deleted_from_the_worktree_is_skipped(self) -> None:
+        self.track({"a.rs": "", "b.rs": ""})
+        (self.root / "a.rs").unlink()
+        self.assertEqual(rsi.build(self.root).paths(), ["b.rs"])
+
+    def test_the_store_serves_a_later_build_identically(self) -> None:
+        self.track({"a.rs": 'fn a() { let s = "mod x;"; } // mod y;\n'})
+        first = rsi.build(self.root, strip=True).get("a.rs")
+        second = rsi.build(self.root).get("a.rs")
+        assert first is not None and second is not None
+        self.assertEqual(second.raw, first.raw)
+        self.assertEqual(second.stripped, first.stripped)
+        self.assertEqual(list(second.line_starts), list(first.line_starts))
+
+    def test_a_corrupt_store_is_rebuilt_not_trusted(self) -> None:
+        self.track({"a.rs": "fn a() {}\n"})
+        rsi.build(self.root)
+        for shard in gate_cache.cache_dir(self.root, rsi.STORE_NAME).iterdir():
+            shard.write_bytes(b"not a snapshot")
+        entry = rsi.build(self.root).get("a.rs")
+        assert entry is not None
+        self.assertEqual(entry.text, "fn a() {}\n")
+
+
+class SharedStore(SnapshotTestCase):
+    """Linked worktrees share one store, so it must serve more than one revision."""
+
+    def commit(self, files: dict[str, str]) -> str:
+        self.track(files)
+        git = ["git", "-c", "user.name=t", "-c", "user.email=t@t"]
+        subprocess.run([*git, "commit", "-qm", "x"], cwd=self.root, check=True)
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"], cwd=self.root, capture_output=True, text=True, check=True
+        ).stdout.strip()
+
+    def misses(self) -> list[str]:
+        """Build, returning the tracked files it had to read from the worktree."""
+        real = Path.read_bytes
+        read: list[str] = []
+
+        def counting(path: Path) -> bytes:
+            if path.is_relative_to(self.root):
+                read.append(path.relative_to(self.root).as_posix())
+            return real(path)
+
+        with mock.patch.object(Path, "read_bytes", counting):
+            rsi.build(self.root, strip=True)
+        return read
+
+    def test_alternating_revisions_both_stay_warm(self) -> None:
+        shared = {f"crates/c{i}/src/lib.rs": f"fn f{i}() {{}}\n" for i in range(40)}
+        first = self.commit({**shared, "a.rs": "fn first() {}\n"})
+        second = self.commit({"a.rs": "fn second() {}\n", "b.rs": "fn only_second() {}\n"})
+        subprocess.run(["git", "checkout", "-q", first], cwd=self.root, check=True)
+        self.assertEqual(len(self.misses()), 41)
+        subprocess.run(["git", "checkout", "-q", second], cwd=self.root, check=True)
+        self.assertEqual(sorted(self.misses()), ["a.rs", "b.rs"])
+        for revision in (first, second, first):
+            subprocess.run(["git", "checkout", "-q", revision], cwd=self.root, check=True)
+            self.assertEqual(self.misses(), [], revision)
+
+    def test_a_blob_unreferenced_for_store_generations_builds_is_dropped(self) -> None:
+        self.track({"a.rs": "fn gone() {}\n"})
+        gone = rsi.build(self.root).get("a.rs").blob
+        shard = gone[0]
+        for generation in range(rsi.STORE_GENERATIONS):
+            # Distinct files, all landing in the same shard, each one a miss.
+            body = next(
+                f"fn f{generation}_{n}() {{}}\n"
+                for n in range(10_000)
+                if rsi.git_blob_sha(f"fn f{generation}_{n}() {{}}\n".encode())[0] == shard
+            )
+            (self.root / "a.rs").write_text(body, encoding="utf-8")
+            rsi.build(self.root)
+        store = rsi._load_shards(gate_cache.cache_dir(self.root, rsi.STORE_NAME))
+        self.assertNotIn(gone, store[shard]["blobs"])
+        self.assertEqual(len(store[shard]["blobs"]), rsi.STORE_GENERATIONS)
+
+
+class Views(unittest.TestCase):
+    def test_stripped_text_preserves_offsets(self) -> None:
+        raw = b'fn a() {\n    let s = "mod fake;"; // mod gone;\n}\n'
+        entry = rsi.SourceFile("a.rs", rsi.git_blob_sha(raw), raw)
+        self.assertEqual(len(entry.stripped), len(entry.lossy_text))
+        self.assertNotIn("fake", entry.stripped)
+        self.assertNotIn("gone", entry.stripped)
+
+    def test_line_of_maps_offsets_to_one_based_lines(self) -> None:
+        raw = b"one\ntwo\nthree"
+        entry = rsi.SourceFile("a.rs", rsi.git_blob_sha(raw), raw)
+        self.assertEqual(entry.line_of(0), 1)
+        self.assertEqual(entry.line_of(4), 2)
+        self.assertEqual(entry.line_of(len(raw) - 1), 3)
+
+    def test_strict_text_refuses_what_read_text_would_refuse(self) -> None:
+        entry = rsi.SourceFile("a.rs", "0" * 40, b"\xff\xfe")
+        with self.assertRaises(UnicodeDecodeError):
+            entry.text  # noqa: B018
+
+
+class HandedDown(SnapshotTestCase):
+    def tearDown(self) -> None:
+        rsi._handed_down.cache_clear()
+
+    def test_read_text_is_served_from_the_handed_down_snapshot(self) -> None:
+        self.track({"a.rs": "fn snap() {}\n"})
+        snapshot = self.root.parent / "snapshot.marshal"
+        gate_cache.write_atomic(snapshot, rsi.build(self.root).dumps())
+        (self.root / "a.rs").write_text("fn later() {}\n", encoding="utf-8")
+        with mock.patch.dict(os.environ, {rsi.SNAPSHOT_ENV: str(snapshot)}):
+            self.assertEqual(rsi.read_text(self.root / "a.rs", self.root), "fn snap() {}\n")
+            self.assertIs(rsi.load(self.root), rsi.shared(self.root))
+
+    def test_a_snapshot_for_another_checkout_is_ignored(self) -> None:
+        """WHY: the env var leaks into every child process, including a gate's
+        own tests running against a fixture tree. A snapshot built for the real
+        repo must never answer for a different root."""
+        self.track({"a.rs": "fn a() {}\n"})
+        snapshot = self.root.parent / "snapshot.marshal"
+        gate_cache.write_atomic(snapshot, rsi.build(self.root).dumps())
+        other = self.root.parent / "other"
+        other.mkdir()
+        (other / "a.rs").write_text("fn other() {}\n", encoding="utf-8")
+        with mock.patch.dict(os.environ, {rsi.SNAPSHOT_ENV: str(snapshot)}):
+            self.assertIsNone(rsi.shared(other))
+            self.assertEqual(rsi.read_text(other / "a.rs", other), "fn other() {}\n")
+
+    def test_untracked_files_fall_back_to_disk(self) -> None:
+        self.track({"a.rs": ""})
+        snapshot = self.root.parent / "snapshot.marshal"
+        gate_cache.write_atomic(snapshot, rsi.build(self.root).dumps())
+        (self.root / "new.rs").write_text("fn new() {}\n", encoding="utf-8")
+        with mock.patch.dict(os.environ, {rsi.SNAPSHOT_ENV: str(snapshot)}):
+            self.assertEqual(rsi.read_text(self.root / "new.rs", self.root), "fn new() {}\n")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import tracked_files  # noqa: E402
+
+
+def git(root: Path, *args: str, check: bool = True) -> None:
+    subprocess.run(
+        ["git", "-c", "user.name=t", "-c", "user.email=t@t", *args],
+        cwd=root,
+        check=check,
+        capture_output=True,
+    )
+
+
+class Listing(unittest.TestCase):
+    def setUp(self) -> None:
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.root = Path(tmp.name).resolve()
+        env = mock.patch.dict(os.environ)
+        env.start()
+        self.addCleanup(env.stop)
+        os.environ.pop(tracked_files.SNAPSHOT_ENV, None)
+        git(self.root, "init", "-q")
+        for rel in ("Cargo.toml", "crates/a/Cargo.toml", "crates/a/src/lib.rs", "docs/x.md"):
+            (self.root / rel).parent.mkdir(parents=True, exist_ok=True)
+            (self.root / rel).write_text(f"{rel}\n", encoding="utf-8")
+        git(self.root, "add", "-A")
+
+    def test_entries_carry_mode_blob_and_a_git_style_glob_crosses_directories(self) -> None:
+        index = tracked_files.load(self.root)
+        self.assertEqual(index.paths("*Cargo.toml"), ["Cargo.toml", "crates/a/Cargo.toml"])
+        self.assertEqual(index.paths("crates/*.rs"), ["crates/a/src/lib.rs"])
+        entry = index.get("docs/x.md")
+        self.assertEqual((entry.mode, entry.stage), ("100644", 0))
+        blob = subprocess.run(
+            ["git", "hash-object", "docs/x.md"], cwd=self.root, capture_output=True, text=True, check=True
+        ).stdout.strip()
+        self.assertEqual(entry.blob, blob)
+
+    def test_an_unmerged_path_is_listed_once_and_reported_as_unmerged(self) -> None:
+        """WHY: plain `git ls-files` prints an unmerged path once per stage, so
+        a check walking it scanned (and reported) the same file three times."""
+        git(self.root, "commit", "-qm", "base")
+        git(self.root, "checkout", "-qb", "side")
+        (self.root / "docs/x.md").write_text("side\n", encoding="utf-8")
+        git(self.root, "commit", "-qam", "side")
+        git(self.root, "checkout", "-q", "-")
+        (self.root / "docs/x.md").write_text("main\n", encoding="utf-8")
+        git(self.root, "commit", "-qam", "main")
+        git(self.root, "merge", "-q", "side", check=False)  # conflicts
+        index = tracked_files.load(self.root)
+        self.assertEqual(index.unmerged(), ["docs/x.md"])
+        self.assertEqual(index.paths().count("docs/x.md"), 1)
+        self.assertEqual(len(index), 4)
+
+    def test_a_handed_down_listing_is_used_only_for_the_checkout_it_was_taken_from(self) -> None:
+        snapshot = self.root.parent / f"{self.root.name}-tracked"
+        self.addCleanup(snapshot.unlink, missing_ok=True)
+        tracked_files.write_snapshot(self.root, snapshot)
+        os.environ[tracked_files.SNAPSHOT_ENV] = str(snapshot)
+        (self.root / "later.txt").write_text("x\n", encoding="utf-8")
+        git(self.root, "add", "later.txt")
+
+        with mock.patch.object(tracked_files, "listing", side_effect=AssertionError("listed again")):
+            handed = tracked_files.load(self.root)
+        self.assertNotIn("later.txt", handed)
+
+        with tempfile.TemporaryDirectory() as other:
+            git(Path(other), "init", "-q")
+            self.assertEqual(len(tracked_files.load(Path(other))), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,164 @@
+from __future__ import annotations
+
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import gate_cache  # noqa: E402
+import workspace_graph as wg  # noqa: E402
+
+
+def package(root: Path, name: str, rel: str) -> dict[str, object]:
+    return {
+        "id": f"path+file://{root / rel}#{name}@0.1.0",
+        "name": name,
+        "manifest_path": str(root / rel / "Cargo.toml"),
+        "features": {},
+        "source": None,
+    }
+
+
+def fixture_metadata(root: Path) -> dict[str, object]:
+    """koina <- taxis <- nous, taxis <-dev- koina (a cycle), poiesis/core nested
+    in poiesis, a local non-member package nested in koina, and a registry
+    crate everyone uses."""
+    koina = package(root, "koina", "crates/koina")
+    taxis = package(root, "taxis", "crates/taxis")
+    nous = package(root, "nous", "crates/nous")
+    poiesis = package(root, "poiesis", "crates/poiesis")
+    core = package(root, "poiesis-core", "crates/poiesis/core")
+    serde = {"id": "registry+https://github.com/rust-lang/crates.io-index#serde@1.0.0", "name": "serde",
+             "manifest_path": "/registry/serde/Cargo.toml", "features": {},
+             "source": "registry+https://github.com/rust-lang/crates.io-index"}
+    probe = package(root, "probe", "crates/koina/fixtures/probe")
+    members = [koina, taxis, nous, poiesis, core]
+
+    def node(pkg: dict[str, object], *deps: dict[str, object]) -> dict[str, object]:
+        return {"id": pkg["id"], "deps": [{"pkg": dep["id"]} for dep in (*deps, serde)]}
+
+    return {
+        "packages": [*members, serde, probe],
+        "workspace_members": [pkg["id"] for pkg in members],
+        "workspace_root": str(root),
+        "resolve": {
+            "nodes": [
+                node(koina, taxis),
+                node(taxis, koina),
+                node(nous, taxis),
+                node(poiesis, core),
+                node(core),
+                {"id": serde["id"], "deps": []},
+                {"id": probe["id"], "deps": []},
+            ]
+        },
+    }
+
+
+class Graph(unittest.TestCase):
+    def setUp(self) -> None:
+        self.root = Path("/ws")
+        self.meta = fixture_metadata(self.root)
+        self.graph = wg.from_metadata(self.meta, "k")
+        self.ids = {pkg["name"]: pkg["id"] for pkg in self.meta["packages"]}
+
+    def test_only_members_and_member_edges_are_kept(self) -> None:
+        self.assertNotIn(self.ids["serde"], self.graph.names)
+        self.assertEqual(self.graph.deps[self.ids["nous"]], (self.ids["taxis"],))
+        self.assertEqual(self.graph.metadata()["workspace_members"], sorted(self.graph.names))
+
+    def test_a_file_belongs_to_the_deepest_package_directory_enclosing_it(self) -> None:
+        """WHY: every enclosing member used to be reported, so a change to
+        crates/poiesis/core also scheduled all of poiesis."""
+        names = self.graph.names
+        paths = [
+            "crates/poiesis/core/src/lib.rs",
+            "crates/poiesis/src/lib.rs",
+            "/ws/crates/koina/Cargo.toml",
+            "crates/nous/../koina/src/a.rs",
+            "crates/koina/fixtures/probe/src/lib.rs",
+            "crates/koinaX/src/lib.rs",
+            "README.md",
+            "../elsewhere/crates/koina/src/lib.rs",
+            "/elsewhere/crates/koina/src/lib.rs",
+        ]
+        self.assertEqual(
+            {path: names[pkg_id] for path, pkg_id in self.graph.owners(paths).items()},
+            {
+                "crates/poiesis/core/src/lib.rs": "poiesis-core",
+                "crates/poiesis/src/lib.rs": "poiesis",
+                "/ws/crates/koina/Cargo.toml": "koina",
+                "crates/nous/../koina/src/a.rs": "koina",
+            },
+        )
+
+    def test_the_trie_returns_the_value_of_the_longest_entered_prefix(self) -> None:
+        trie = wg.PathTrie()
+        trie.insert(("a",), "outer")
+        trie.insert(("a", "b", "c"), "inner")
+        trie.insert(("a", "b", "c", "skip"), None)
+        self.assertEqual(trie.longest(("a", "b", "x")), "outer")
+        self.assertEqual(trie.longest(("a", "b", "c", "d")), "inner")
+        self.assertIsNone(trie.longest(("a", "b", "c", "skip", "f")))
+        self.assertIsNone(trie.longest(("b",)))
+
+
+class Caching(unittest.TestCase):
+    def setUp(self) -> None:
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.root = Path(tmp.name).resolve() / "repo"
+        self.root.mkdir()
+        env = mock.patch.dict(os.environ, {gate_cache.CACHE_ENV: str(Path(tmp.name) / "cache")})
+        env.start()
+        self.addCleanup(env.stop)
+        subprocess.run(["git", "init", "-q"], cwd=self.root, check=True)
+        (self.root / "Cargo.toml").write_text('[workspace]\nmembers = ["crates/*"]\n')
+        (self.root / "Cargo.lock").write_text("version = 4\n")
+        subprocess.run(["git", "add", "-A"], cwd=self.root, check=True)
+
+    def load(self) -> tuple[wg.WorkspaceGraph, int]:
+        calls: list[Path] = []
+
+        def fake_cargo(repo_root: Path) -> dict:
+            calls.append(repo_root)
+            return fixture_metadata(repo_root)
+
+        wg.load.cache_clear()
+        with mock.patch.object(wg, "cargo_metadata", fake_cargo):
+            graph = wg.load(self.root)
+        return graph, len(calls)
+
+    def test_cargo_runs_once_per_distinct_set_of_manifests(self) -> None:
+        first, calls = self.load()
+        self.assertEqual(calls, 1)
+        second, calls = self.load()
+        self.assertEqual((calls, second), (0, first))
+        (self.root / "Cargo.lock").write_text("version = 4\n# bumped\n")
+        _, calls = self.load()
+        self.assertEqual(calls, 1)
+
+    def test_an_untracked_member_manifest_changes_the_key(self) -> None:
+        """WHY untracked too: with `members = ["crates/*"]` a new crate joins the
+        workspace before anyone stages it, without touching the root manifest."""
+        before = wg.inputs_key(self.root)
+        (self.root / "crates" / "new").mkdir(parents=True)
+        (self.root / "crates" / "new" / "Cargo.toml").write_text('[package]\nname = "new"\n')
+        self.assertNotEqual(wg.inputs_key(self.root), before)
+
+    def test_outside_a_git_checkout_the_graph_is_computed_uncached(self) -> None:
+        with tempfile.TemporaryDirectory() as plain:
+            with mock.patch.dict(os.environ, {gate_cache.CACHE_ENV: ""}):
+                self.assertIsNone(wg.inputs_key(Path(plain)))
+                self.root = Path(plain)
+                graph, calls = self.load()
+        self.assertEqual((calls, graph.key), (1, ""))
+
+
+if __name__ == "__main__":
+    unittest.main()
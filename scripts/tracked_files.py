@@ -0,0 +1,124 @@
+"""One `git ls-files -s -z` per gate run: every tracked path with its mode and blob.
+
+Gates that enumerate tracked files used to spawn their own `git ls-files`,
+some of them twice (check-conflict-markers.py listed the paths, then the
+unmerged entries) and one of them once per file it asked about
+(check-workspace-locks.py's `--error-unmatch`). The listing is the same for
+all of them, so it is taken once:
+
+  - `run-gate-coverage.py` writes the raw listing to a per-run file and hands
+    it to every step through ALETHEIA_TRACKED_FILES, so all steps see one
+    index state however long the run takes;
+  - a gate run on its own lists the index itself, once per `load`.
+
+Each entry carries the staged blob SHA, which is what a content-keyed cache
+wants (rust_source_index.py keys its blob store on it). The SHA is the
+index's, not the worktree's: a file modified since it was staged has a
+different blob on disk, which `git diff-files` names.
+"""
+
+from __future__ import annotations
+
+import fnmatch
+import functools
+import os
+import subprocess
+from pathlib import Path
+from typing import NamedTuple
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+SNAPSHOT_ENV = "ALETHEIA_TRACKED_FILES"
+GITLINK_MODE = "160000"
+
+
+class Entry(NamedTuple):
+    path: str
+    mode: str
+    blob: str
+    stage: int
+
+
+class TrackedFiles:
+    """The index of one checkout, in git's (path, stage) order."""
+
+    def __init__(self, entries: list[Entry]) -> None:
+        self.entries = entries
+        self._by_path = {entry.path: entry for entry in entries}
+
+    def __len__(self) -> int:
+        return len(self._by_path)
+
+    def __contains__(self, path: object) -> bool:
+        return path in self._by_path
+
+    def get(self, path: str) -> Entry | None:
+        """The path's entry; for an unmerged path, its highest stage."""
+        return self._by_path.get(path)
+
+    def paths(self, pattern: str | None = None, *, gitlinks: bool = True) -> list[str]:
+        """Tracked paths, each once, optionally filtered by a `git ls-files`-style glob.
+
+        As in a git pathspec, `*` matches across `/`: `crates/*.rs` is every
+        `.rs` file anywhere under crates/. `gitlinks=False` leaves out
+        submodules, which name a commit rather than a file in this tree.
+        """
+        return [
+            path
+            for path, entry in self._by_path.items()
+            if (gitlinks or entry.mode != GITLINK_MODE)
+            and (pattern is None or fnmatch.fnmatchcase(path, pattern))
+        ]
+
+    def unmerged(self) -> list[str]:
+        """Paths with an index entry at stage 1/2/3 -- a conflict never resolved."""
+        return sorted({entry.path for entry in self.entries if entry.stage != 0})
+
+
+def listing(repo_root: Path) -> bytes:
+    proc = subprocess.run(
+        ["git", "ls-files", "-s", "-z"],
+        cwd=repo_root,
+        capture_output=True,
+        check=False,
+    )
+    if proc.returncode != 0:
+        raise SystemExit(f"git ls-files failed: {proc.stderr.decode('utf-8', 'replace').strip()}")
+    return proc.stdout
+
+
+def parse(data: bytes) -> TrackedFiles:
+    entries: list[Entry] = []
+    for record in data.decode("utf-8", "surrogateescape").split("\0"):
+        if not record:
+            continue
+        meta, _, path = record.partition("\t")
+        mode, blob, stage = meta.split(" ")
+        entries.append(Entry(path, mode, blob, int(stage)))
+    return TrackedFiles(entries)
+
+
+def write_snapshot(repo_root: Path, target: Path) -> None:
+    """Record `repo_root`'s listing for the steps of one run (see SNAPSHOT_ENV)."""
+    target.write_bytes(str(repo_root.resolve()).encode("utf-8", "surrogateescape") + b"\0\0" + listing(repo_root))
+
+
+@functools.lru_cache(maxsize=None)
+def _handed_down(snapshot: str, repo_root: Path) -> TrackedFiles | None:
+    try:
+        data = Path(snapshot).read_bytes()
+    except OSError:
+        return None
+    root, sep, body = data.partition(b"\0\0")
+    # WHY the root is checked: a test building a scratch repository inside a
+    # run that handed a snapshot down must see its own index, not the run's.
+    if not sep or root != str(repo_root).encode("utf-8", "surrogateescape"):
+        return None
+    return parse(body)
+
+
+def load(repo_root: Path = REPO_ROOT) -> TrackedFiles:
+    """The handed-down snapshot when there is one for `repo_root`, otherwise a fresh listing."""
+    repo_root = repo_root.resolve()
+    snapshot = os.environ.get(SNAPSHOT_ENV)
+    handed = _handed_down(snapshot, repo_root) if snapshot else None
+    return handed if handed is not None else parse(listing(repo_root))
@@ -0,0 +1,309 @@
+#!/usr/bin/env python3
+"""The workspace's crate graph from `cargo metadata`, cached for the gates.
+
+`cargo metadata --format-version 1` is several megabytes of JSON (every
+registry package the lockfile names), and affected-crates.py asked for all of
+it on every pre-push only to keep the workspace members and the edges between
+them. That answer depends on nothing but the manifests, the lockfile and the
+toolchain that reads them, so it is computed once per distinct set of those
+inputs and kept on disk (gate_cache.py) under their hash:
+
+  key          sha256 over every tracked or untracked-but-not-ignored
+               `Cargo.toml`, `Cargo.lock` and `rust-toolchain.toml` (path and
+               bytes), so an edited manifest, a new member directory matched
+               by a `members` glob, or a toolchain bump each miss the cache
+  packages     the workspace members' package entries exactly as cargo
+               reports them -- the same objects `cargo metadata --no-deps`
+               prints, so a consumer of that shape can take them unchanged
+  deps         member -> the members it depends on in the resolve graph
+  dependents   member -> every member that depends on it, transitively: the
+               closure "what must be re-tested when this crate changes" is
+               precomputed, so a query is a set union
+  local_dirs   the directories of local packages that are not members, which
+               own their files even when nested inside a member
+
+WHY the resolve graph rather than the declared `dependencies` of each
+package: the resolve drops optional dependencies no enabled feature pulls in,
+which is the answer affected-crates.py has always given; the declared list
+would widen it.
+
+Usage:
+    python3 scripts/workspace_graph.py --build [--output PATH]
+"""
+
+from __future__ import annotations
+
+import argparse
+import functools
+import hashlib
+import json
+import subprocess
+import sys
+from pathlib import Path
+from typing import Any, NamedTuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import gate_cache  # noqa: E402
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+STORE_NAME = "workspace-graph"
+STORE_FILE = "graph.json"
+# Bumped whenever the stored shape changes, so an old store reads as a miss.
+FORMAT_VERSION = 2
+INPUT_PATHSPECS = ("Cargo.lock", "rust-toolchain.toml", ":(glob)**/Cargo.toml")
+
+
+class PathTrie:
+    """Directory path components -> the value of the deepest entered prefix."""
+
+    _VALUE = ""  # no path component is empty, so this key never names a child
+
+    def __init__(self) -> None:
+        self._root: dict[str, Any] = {}
+
+    def insert(self, parts: tuple[str, ...] | None, value: str | None) -> None:
+        if parts is None:
+            return
+        node = self._root
+        for part in parts:
+            node = node.setdefault(part, {})
+        node[self._VALUE] = value
+
+    def longest(self, parts: tuple[str, ...]) -> str | None:
+        node = self._root
+        found = node.get(self._VALUE)
+        for part in parts:
+            node = node.get(part)
+            if node is None:
+                break
+            found = node.get(self._VALUE, found)
+        return found
+
+
+class WorkspaceGraph(NamedTuple):
+    key: str
+    workspace_root: Path
+    packages: tuple[dict[str, Any], ...]
+    deps: dict[str, tuple[str, ...]]
+    dependents: dict[str, tuple[str, ...]]
+    local_dirs: tuple[str, ...] = ()
+
+    @property
+    def names(self) -> dict[str, str]:
+        return {pkg["id"]: pkg["name"] for pkg in self.packages}
+
+    def path_trie(self) -> PathTrie:
+        """Package directories by path component, relative to the workspace root.
+
+        Local packages outside the workspace (an excluded crate, a path
+        dependency nested in a member) are entered too, owning nothing: a file
+        under one belongs to that package, not to the member around it.
+        """
+        trie = PathTrie()
+        for manifest_dir in self.local_dirs:
+            trie.insert(self._parts(Path(manifest_dir)), None)
+        for pkg in self.packages:
+            trie.insert(self._parts(Path(pkg["manifest_path"]).parent), pkg["id"])
+        return trie
+
+    def owners(self, paths: list[str]) -> dict[str, str]:
+        """path -> id of the member owning it, for the paths some member owns.
+
+        Ownership is the longest enclosing package directory, as cargo packages
+        files: crates/poiesis/core/src/lib.rs is poiesis-core's, not poiesis's.
+        A relative path is taken from the workspace root as given, without a
+        filesystem call per path; an absolute one is resolved first.
+        """
+        trie = self.path_trie()
+        found: dict[str, str] = {}
+        for path in paths:
+            fpath = Path(path)
+            if fpath.is_absolute():
+                fpath = fpath.resolve()
+            parts = self._parts(fpath)
+            if parts is None:
+                continue
+            owner = trie.longest(parts)
+            if owner is not None:
+                found[path] = owner
+        return found
+
+    def _parts(self, path: Path) -> tuple[str, ...] | None:
+        if path.is_absolute():
+            try:
+                path = path.relative_to(self.workspace_root)
+            except ValueError:
+                return None
+        parts: list[str] = []
+        for part in path.parts:
+            if part == "..":
+                if not parts:
+                    return None
+                parts.pop()
+            elif part != ".":
+                parts.append(part)
+        return tuple(parts)
+
+    def metadata(self) -> dict[str, Any]:
+        """The members in `cargo metadata --format-version 1 --no-deps` shape."""
+        return {
+            "packages": list(self.packages),
+            "workspace_members": [pkg["id"] for pkg in self.packages],
+            "workspace_root": str(self.workspace_root),
+            "resolve": None,
+            "version": 1,
+        }
+
+    def dumps(self) -> bytes:
+        return json.dumps(
+            {
+                "format": FORMAT_VERSION,
+                "key": self.key,
+                "workspace_root": str(self.workspace_root),
+                "packages": self.packages,
+                "deps": self.deps,
+                "dependents": self.dependents,
+                "local_dirs": self.local_dirs,
+            },
+            sort_keys=True,
+        ).encode()
+
+
+def inputs_key(repo_root: Path) -> str | None:
+    """Hash of every file `cargo metadata` reads to describe the workspace.
+
+    None outside a git checkout, where there is no file list to hash; the
+    caller then computes without caching.
+    """
+    proc = subprocess.run(
+        ["git", "ls-files", "-z", "--cached", "--others", "--exclude-standard", "--", *INPUT_PATHSPECS],
+        cwd=repo_root,
+        capture_output=True,
+        check=False,
+    )
+    if proc.returncode != 0:
+        return None
+    digest = hashlib.sha256(f"{FORMAT_VERSION}\0".encode())
+    for rel in sorted(set(proc.stdout.decode("utf-8", "surrogateescape").split("\0")) - {""}):
+        try:
+            data = (repo_root / rel).read_bytes()
+        except OSError:
+            continue  # deleted from the worktree but still in the index: cargo will not see it either
+        digest.update(rel.encode("utf-8", "surrogateescape") + b"\0")
+        digest.update(hashlib.sha256(data).digest())
+    return digest.hexdigest()
+
+
+def cargo_metadata(repo_root: Path) -> dict[str, Any]:
+    result = subprocess.run(
+        ["cargo", "metadata", "--format-version", "1"],
+        cwd=repo_root,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(result.stdout)
+
+
+def from_metadata(meta: dict[str, Any], key: str) -> WorkspaceGraph:
+    """Reduce full `cargo metadata` output to the members and their edges."""
+    member_ids = set(meta["workspace_members"])
+    packages = tuple(
+        sorted((pkg for pkg in meta["packages"] if pkg["id"] in member_ids), key=lambda pkg: pkg["id"])
+    )
+    deps: dict[str, set[str]] = {pkg["id"]: set() for pkg in packages}
+    rev_deps: dict[str, set[str]] = {pkg["id"]: set() for pkg in packages}
+    for node in meta["resolve"]["nodes"]:
+        if node["id"] not in deps:
+            continue
+        for dep in node["deps"]:
+            if dep["pkg"] in rev_deps:
+                deps[node["id"]].add(dep["pkg"])
+                rev_deps[dep["pkg"]].add(node["id"])
+
+    dependents: dict[str, tuple[str, ...]] = {}
+    for pkg_id in rev_deps:
+        # WHY a walk per member rather than one topological pass: dev-dependency
+        # edges make the member graph cyclic (a crate's tests may use a crate
+        # that depends on it), and at workspace size the walks cost nothing.
+        seen: set[str] = set()
+        queue = [pkg_id]
+        while queue:
+            for rdep_id in rev_deps[queue.pop()]:
+                if rdep_id not in seen:
+                    seen.add(rdep_id)
+                    queue.append(rdep_id)
+        seen.discard(pkg_id)
+        dependents[pkg_id] = tuple(sorted(seen))
+
+    return WorkspaceGraph(
+        key=key,
+        workspace_root=Path(meta["workspace_root"]),
+        packages=packages,
+        deps={pkg_id: tuple(sorted(ids)) for pkg_id, ids in deps.items()},
+        dependents=dependents,
+        local_dirs=tuple(
+            sorted(
+                str(Path(pkg["manifest_path"]).parent)
+                for pkg in meta["packages"]
+                if pkg.get("source") is None and pkg["id"] not in member_ids
+            )
+        ),
+    )
+
+
+def _load_store(store: Path | None, key: str) -> WorkspaceGraph | None:
+    if store is None:
+        return None
+    try:
+        payload = json.loads(store.read_bytes())
+    except (OSError, ValueError):
+        return None
+    if not isinstance(payload, dict) or payload.get("format") != FORMAT_VERSION or payload.get("key") != key:
+        return None
+    return WorkspaceGraph(
+        key=key,
+        workspace_root=Path(payload["workspace_root"]),
+        packages=tuple(payload["packages"]),
+        deps={pkg_id: tuple(ids) for pkg_id, ids in payload["deps"].items()},
+        dependents={pkg_id: tuple(ids) for pkg_id, ids in payload["dependents"].items()},
+        local_dirs=tuple(payload["local_dirs"]),
+    )
+
+
+@functools.lru_cache(maxsize=None)
+def load(repo_root: Path = REPO_ROOT) -> WorkspaceGraph:
+    """The graph for the manifests now on disk, running cargo only on a cache miss."""
+    key = inputs_key(repo_root)
+    store_dir = gate_cache.cache_dir(repo_root, STORE_NAME) if key is not None else None
+    store = store_dir / STORE_FILE if store_dir is not None else None
+    graph = _load_store(store, key)
+    if graph is not None:
+        return graph
+    graph = from_metadata(cargo_metadata(repo_root), key or "")
+    if store is not None:
+        try:
+            gate_cache.write_atomic(store, graph.dumps())
+        except OSError:
+            pass  # an unwritable cache costs the next run time, never this one its answer
+    return graph
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--build", action="store_true", help="build (or refresh) the cached graph")
+    parser.add_argument("--output", type=Path, help="also write the serialized graph here")
+    args = parser.parse_args()
+    if not args.build:
+        parser.error("nothing to do; pass --build")
+    graph = load(REPO_ROOT)
+    if args.output is not None:
+        gate_cache.write_atomic(args.output, graph.dumps())
+    edges = sum(len(ids) for ids in graph.deps.values())
+    print(f"workspace-graph: {len(graph.packages)} members, {edges} member edges (key {graph.key[:12]})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())